@@ -0,0 +1,67 @@
+# benchmarks/bench_almacen.py - Guardar una nota: CSV completo frente al almacén mapeado
+"""Compara lo que cuesta guardar una sola nota cambiada reescribiendo matriculas.csv
+(con su instantánea) y escribiéndola en su registro del almacén mapeado, además de
+cargar las matrículas desde el archivo mapeado.
+
+Uso: python benchmarks/bench_almacen.py [cantidad]
+"""
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.comun import generar_matriculas, cronometrar
+from src.cambios import RegistroCambios
+from src.persistencia import PersistenciaCSV
+
+
+def guardar_una_nota(persistencia: PersistenciaCSV, matriculas):
+    """Cambia la nota de la matrícula del medio y guarda solo ese cambio"""
+    matricula = matriculas[len(matriculas) // 2]
+    matricula.nota = 5.0 if matricula.nota != 5.0 else 4.0
+    cambios = RegistroCambios()
+    cambios.registrar_nota('matriculas', matricula)
+    persistencia.guardar_cambios([], [], [], matriculas, cambios)
+
+
+def cronometrar_una_nota(nombre: str, persistencia: PersistenciaCSV, matriculas, repeticiones: int = 5):
+    """Imprime el mejor tiempo de guardar una nota cambiada, en milisegundos"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        guardar_una_nota(persistencia, matriculas)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    print(f"{nombre:<34} {mejor * 1e3:>8.2f} ms")
+
+
+def medir(cantidad: int):
+    """Imprime los tiempos de guardar una nota y cargar con cada formato"""
+    print(f"Generando {cantidad:,} matrículas...")
+    # Sin recolector: con millones de objetos vivos, sus pasadas caerían al azar en cualquier medición
+    gc.disable()
+    matriculas = generar_matriculas(cantidad)
+    directorio = tempfile.mkdtemp()
+    try:
+        csv = PersistenciaCSV(directorio)
+        mapeada = PersistenciaCSV(directorio, matriculas_mmap=True)
+        cronometrar("Guardar todo (CSV + instantánea)", lambda: csv.guardar_matriculas(matriculas))
+        cronometrar("Guardar todo (almacén)", lambda: mapeada.guardar_matriculas(matriculas))
+        
+        cronometrar_una_nota("Una nota (reescribe CSV)", csv, matriculas)
+        cronometrar_una_nota("Una nota (en su registro)", mapeada, matriculas)
+        
+        cronometrar("Cargar (instantánea)", PersistenciaCSV(directorio).cargar_matriculas)
+        cargadas = cronometrar("Cargar (almacén)", lambda: PersistenciaCSV(directorio, matriculas_mmap=True).cargar_matriculas())
+        assert cargadas == matriculas
+        mapeada.almacen.cerrar()
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
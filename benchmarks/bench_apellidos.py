@@ -0,0 +1,75 @@
+# benchmarks/bench_apellidos.py - Búsquedas por apellido: ordenar en cada llamada frente al índice
+"""Compara la búsqueda binaria anterior (ordena todos los estudiantes en cada llamada)
+con el índice ordenado que mantiene ConsultasAcademicas.
+
+Uso: python benchmarks/bench_apellidos.py [cantidad_estudiantes] [consultas]
+"""
+import os
+import random
+import sys
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.comun import cronometrar_consultas
+from src.consultas import ConsultasAcademicas
+from src.modelos import Estudiante
+
+
+def generar_estudiantes(cantidad: int):
+    """Genera estudiantes con apellidos repetidos"""
+    return [
+        Estudiante(f"E{i}", f"{10000000 + i}", f"Nombre{i % 500}", f"Apellido{i % (cantidad // 4 or 1)}",
+                   f"e{i}@correo.com", "2000-01-01")
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def busqueda_anterior(estudiantes, apellido_buscar: str):
+    """Implementación anterior: sorted() completo y búsqueda binaria manual"""
+    ordenados = sorted(estudiantes, key=lambda e: e.apellidos.lower())
+    izq, der = 0, len(ordenados) - 1
+    while izq <= der:
+        medio = (izq + der) // 2
+        apellido_medio = ordenados[medio].apellidos.lower()
+        if apellido_medio == apellido_buscar.lower():
+            return ordenados[medio]
+        elif apellido_medio < apellido_buscar.lower():
+            izq = medio + 1
+        else:
+            der = medio - 1
+    return None
+
+
+def medir(cantidad: int, consultas: int):
+    """Imprime el costo por consulta de cada tipo de búsqueda"""
+    print(f"{cantidad:,} estudiantes, {consultas} consultas")
+    estudiantes = generar_estudiantes(cantidad)
+    apellidos = [f"apellido{random.randrange(cantidad // 4 or 1)}" for _ in range(consultas)]
+    
+    inicio = time.perf_counter()
+    consultas_academicas = ConsultasAcademicas(estudiantes, [], [], [])
+    print(f"{'Construcción de índices':<38} {time.perf_counter() - inicio:>12.2f} s")
+    
+    cronometrar_consultas("Anterior: sorted() + binaria", lambda a: busqueda_anterior(estudiantes, a), apellidos[:max(1, consultas // 100)])
+    cronometrar_consultas("Índice: coincidencia exacta", consultas_academicas.buscar_binario_estudiante, apellidos)
+    cronometrar_consultas("Índice: todos los duplicados", consultas_academicas.buscar_estudiantes_por_apellido, apellidos)
+    cronometrar_consultas("Lineal: todos los duplicados", lambda a: [e for e in estudiantes if e.apellidos.lower() == a],
+                          apellidos[:max(1, consultas // 100)])
+    cronometrar_consultas("Índice: prefijo", lambda a: consultas_academicas.buscar_estudiantes_por_prefijo_apellido(a[:-1]), apellidos)
+    cronometrar_consultas("Índice: rango", lambda a: consultas_academicas.buscar_estudiantes_por_rango_apellido(a, a + "5"), apellidos)
+    
+    # Solo el mantenimiento del índice (sin la lista de estudiantes ni la bitácora)
+    indice = consultas_academicas._estudiantes_por_apellido
+    nuevo = Estudiante("X1", "99999999", "Nueva", "Apellido123", "nueva@correo.com", "2000-01-01")
+    inicio = time.perf_counter()
+    for _ in range(consultas):
+        indice.agregar(nuevo)
+        indice.quitar(nuevo)
+    print(f"{'Índice: insertar + quitar':<38} {(time.perf_counter() - inicio) / consultas * 1e6:>12,.1f} µs/operación")
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,59 @@
+# benchmarks/bench_arranque.py - Tiempo hasta el primer menú con carga inmediata y perezosa
+"""Mide lo que hace main antes de mostrar el primer menú (cargar el repositorio y
+reproducir la bitácora vacía) y, aparte, listar los cursos, para varios volúmenes
+de matrículas. Con carga perezosa el primer menú no depende del volumen.
+
+Uso: python benchmarks/bench_arranque.py [matriculas_1,matriculas_2,...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.comun import generar_matriculas
+from src.bitacora import BitacoraOperaciones
+from src.consultas import ConsultasAcademicas
+from src.modelos import Curso
+from src.persistencia import PersistenciaCSV
+
+
+def arrancar(directorio: str, perezosa: bool):
+    """Arranque como el de main; retorna (segundos hasta el menú, segundos en listar cursos)"""
+    inicio = time.perf_counter()
+    persistencia = PersistenciaCSV(directorio, perezosa=perezosa)
+    consultas = persistencia.cargar_repositorio(ConsultasAcademicas)
+    bitacora = BitacoraOperaciones(directorio)
+    bitacora.reproducir(consultas)
+    menu = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    codigos = [curso.codigo for curso in consultas.cursos]
+    listar = time.perf_counter() - inicio
+    assert len(codigos) == 200
+    bitacora.cerrar()
+    return menu, listar
+
+
+def medir(volumenes):
+    """Imprime el tiempo hasta el primer menú para cada volumen de matrículas"""
+    print(f"{'Matrículas':>12} {'Inmediata':>12} {'Perezosa':>12} {'Listar cursos':>15}")
+    for cantidad in volumenes:
+        directorio = tempfile.mkdtemp()
+        try:
+            persistencia = PersistenciaCSV(directorio)
+            persistencia.guardar_cursos([Curso(f"C{i}", f"Curso {i}", 3, "Docente") for i in range(200)])
+            persistencia.guardar_matriculas(generar_matriculas(cantidad))
+
+            inmediata, _ = arrancar(directorio, perezosa=False)
+            perezosa, listar = arrancar(directorio, perezosa=True)
+            print(f"{cantidad:>12,} {inmediata * 1e3:>10.1f} ms {perezosa * 1e3:>10.2f} ms {listar * 1e3:>12.2f} ms")
+        finally:
+            shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir([int(v) for v in sys.argv[1].split(',')] if len(sys.argv) > 1 else [10_000, 100_000, 500_000])
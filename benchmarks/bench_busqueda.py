@@ -0,0 +1,82 @@
+# benchmarks/bench_busqueda.py - Búsqueda mientras se escribe: recorrido lineal frente al índice
+"""Compara buscar texto parcial recorriendo todos los estudiantes con el índice de
+prefijos y trigramas de ConsultasAcademicas.buscar_estudiantes.
+
+Uso: python benchmarks/bench_busqueda.py [cantidad_estudiantes] [consultas]
+"""
+import os
+import random
+import sys
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.comun import cronometrar_consultas
+from src.busqueda import normalizar
+from src.consultas import ConsultasAcademicas
+from src.modelos import Estudiante
+
+NOMBRES = ["Juan", "María", "Ana", "Luis", "Carlos", "Sofía", "Andrés", "Lucía", "Jorge", "Valentina"]
+APELLIDOS = ["Pérez", "González", "López", "Núñez", "Rodríguez", "Martínez", "Gómez", "Díaz", "Herrera", "Ramírez"]
+
+
+def generar_estudiantes(cantidad: int):
+    """Genera estudiantes con nombres y apellidos combinados y sufijos para variar el vocabulario"""
+    return [
+        Estudiante(f"E{i}", f"{10000000 + i}", random.choice(NOMBRES),
+                   f"{random.choice(APELLIDOS)} {random.choice(APELLIDOS)}{i % 1000}",
+                   f"e{i}@correo.com", "2000-01-01")
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def busqueda_lineal(estudiantes, texto: str, limite: int = 20):
+    """Recorre todos los estudiantes buscando cada palabra como subcadena"""
+    palabras = normalizar(texto).split()
+    encontrados = []
+    for estudiante in estudiantes:
+        campos = normalizar(f"{estudiante.nombres} {estudiante.apellidos} {estudiante.documento} {estudiante.correo}")
+        if all(palabra in campos for palabra in palabras):
+            encontrados.append(estudiante)
+            if len(encontrados) == limite:
+                break
+    return encontrados
+
+
+def medir(cantidad: int, consultas: int):
+    """Imprime el costo por consulta de cada tipo de búsqueda"""
+    print(f"{cantidad:,} estudiantes, {consultas} consultas")
+    estudiantes = generar_estudiantes(cantidad)
+    
+    consultas_academicas = ConsultasAcademicas(estudiantes, [], [], [])
+    inicio = time.perf_counter()
+    consultas_academicas.buscar_estudiantes("")  # La primera búsqueda arma el índice
+    print(f"{'Construcción del índice':<38} {time.perf_counter() - inicio:>12.2f} s")
+    
+    prefijos = [random.choice(APELLIDOS)[:3] for _ in range(consultas)]
+    documentos = [str(10000000 + random.randrange(1, cantidad + 1))[:6] for _ in range(consultas)]
+    subcadenas = [f"{random.choice(NOMBRES)[:3]} {random.choice(APELLIDOS)[2:5]}" for _ in range(consultas)]
+    exactos = [f"e{random.randrange(1, cantidad + 1)}" for _ in range(consultas)]
+    
+    cronometrar_consultas("Lineal: subcadenas", lambda t: busqueda_lineal(estudiantes, t), subcadenas[:max(1, consultas // 100)], 'ms')
+    cronometrar_consultas("Lineal: correo sin coincidencia", lambda t: busqueda_lineal(estudiantes, t + "zz"),
+                          exactos[:max(1, consultas // 100)], 'ms')
+    cronometrar_consultas("Índice: prefijo de apellido", consultas_academicas.buscar_estudiantes, prefijos, 'ms')
+    cronometrar_consultas("Índice: prefijo de documento", consultas_academicas.buscar_estudiantes, documentos, 'ms')
+    cronometrar_consultas("Índice: nombre + subcadena apellido", consultas_academicas.buscar_estudiantes, subcadenas, 'ms')
+    cronometrar_consultas("Índice: término exacto", consultas_academicas.buscar_estudiantes, exactos, 'ms')
+    
+    # Solo el mantenimiento del índice (sin la lista de estudiantes ni la bitácora)
+    indice = consultas_academicas._busqueda
+    nuevo = Estudiante("X1", "99999999", "Nueva", "Apellidonuevo", "nueva@correo.com", "2000-01-01")
+    inicio = time.perf_counter()
+    for _ in range(consultas):
+        indice.agregar(nuevo)
+        indice.quitar(nuevo)
+    print(f"{'Índice: insertar + quitar':<38} {(time.perf_counter() - inicio) / consultas * 1e6:>12,.1f} µs/operación")
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,73 @@
+# benchmarks/bench_carga.py - Velocidad de carga de matrículas desde CSV
+"""Compara filas por segundo del cargador con csv.DictReader (el anterior) y del
+cargador posicional con csv.reader, normal y en modo confiable.
+
+Uso: python benchmarks/bench_carga.py [cantidad]
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.comun import generar_matriculas
+from src.modelos import Matricula
+from src.persistencia import PersistenciaCSV
+
+
+def cargar_con_dictreader(base_path: str):
+    """Cargador anterior: un dict por fila y strip() de cada campo"""
+    matriculas = []
+    with open(os.path.join(base_path, "matriculas.csv"), 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            nota = None
+            if row.get('nota') and row['nota'].strip():
+                try:
+                    nota = float(row['nota'])
+                except ValueError:
+                    nota = None
+            inscripcion_id = row.get('inscripcion_id', '').strip()
+            if not inscripcion_id:
+                inscripcion_id = f"temp_{row['id'].strip()}"
+            matriculas.append(Matricula(
+                id=row['id'].strip(),
+                inscripcion_id=inscripcion_id,
+                estudiante_id=row['estudiante_id'].strip(),
+                curso_codigo=row['curso_codigo'].strip(),
+                fecha_matricula=row['fecha_matricula'].strip(),
+                nota=nota
+            ))
+    return matriculas
+
+
+def cronometrar_carga(nombre: str, cargar, cantidad: int):
+    """Ejecuta una carga e imprime el tiempo y las filas por segundo"""
+    inicio = time.perf_counter()
+    cargadas = cargar()
+    segundos = time.perf_counter() - inicio
+    assert len(cargadas) == cantidad
+    print(f"{nombre:<32} {segundos:6.2f} s  {cantidad / segundos:>12,.0f} filas/s")
+
+
+def medir(cantidad: int):
+    """Imprime la velocidad de cada cargador sobre el mismo archivo"""
+    print(f"Generando {cantidad:,} matrículas...")
+    directorio = tempfile.mkdtemp()
+    try:
+        PersistenciaCSV(directorio).guardar_matriculas(generar_matriculas(cantidad))
+        
+        cronometrar_carga("csv.DictReader (anterior)", lambda: cargar_con_dictreader(directorio), cantidad)
+        # Sin instantáneas: se mide la lectura del CSV, no la de matriculas.bin
+        cronometrar_carga("csv.reader posicional", PersistenciaCSV(directorio, instantaneas=False).cargar_matriculas, cantidad)
+        cronometrar_carga("csv.reader en modo confiable",
+                          PersistenciaCSV(directorio, confiar=True, instantaneas=False).cargar_matriculas, cantidad)
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,59 @@
+# benchmarks/bench_eliminacion.py - Eliminación de estudiantes en cascada
+"""Compara eliminar estudiantes fila por fila (eliminar_inscripcion, eliminar_matricula y
+eliminar_estudiante, como hacía la interfaz) con eliminar_estudiantes_en_cascada.
+
+Uso: python benchmarks/bench_eliminacion.py [estudiantes] [a_eliminar]
+"""
+import os
+import random
+import sys
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.consultas import ConsultasAcademicas
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+
+
+def generar_datos(estudiantes: int, por_estudiante: int = 4):
+    """Cada estudiante con por_estudiante inscripciones, todas matriculadas"""
+    lista_estudiantes = [Estudiante(f"E{i}", f"{10000000 + i}", "Nombre", f"Apellido{i}", f"e{i}@correo.com", "2000-01-01")
+                         for i in range(1, estudiantes + 1)]
+    cursos = [Curso(f"C{i}", f"Curso {i}", 3, "Docente") for i in range(1, 201)]
+    inscripciones = [Inscripcion(f"I{n}", f"E{i}", f"C{(n % 200) + 1}", "2024-02-01")
+                     for i in range(1, estudiantes + 1)
+                     for n in range((i - 1) * por_estudiante + 1, i * por_estudiante + 1)]
+    matriculas = [Matricula.from_inscripcion(inscripcion, f"M{n}") for n, inscripcion in enumerate(inscripciones, 1)]
+    return lista_estudiantes, cursos, inscripciones, matriculas
+
+
+def eliminar_fila_por_fila(consultas: ConsultasAcademicas, estudiantes):
+    """Forma anterior: cada fila relacionada sale de su lista con list.remove"""
+    for estudiante in estudiantes:
+        for inscripcion in consultas.obtener_inscripciones_de_estudiante(estudiante.id):
+            consultas.eliminar_inscripcion(inscripcion)
+        for matricula in consultas.obtener_matriculas_de_estudiante(estudiante.id):
+            consultas.eliminar_matricula(matricula)
+        consultas.eliminar_estudiante(estudiante)
+
+
+def medir(estudiantes: int, cantidad: int):
+    """Imprime el tiempo de cada forma de eliminar"""
+    print(f"{estudiantes:,} estudiantes (4 inscripciones y 4 matrículas c/u), {cantidad:,} a eliminar")
+    seleccion = sorted(random.sample(range(estudiantes), cantidad))
+
+    for nombre, eliminar in (("Fila por fila", eliminar_fila_por_fila),
+                             ("En cascada (un lote)", lambda c, e: c.eliminar_estudiantes_en_cascada(e)),
+                             ("En cascada (uno a uno)", lambda c, e: [c.eliminar_estudiantes_en_cascada([x]) for x in e])):
+        consultas = ConsultasAcademicas(*generar_datos(estudiantes))
+        seleccionados = [consultas.estudiantes[i] for i in seleccion]
+        inicio = time.perf_counter()
+        eliminar(consultas, seleccionados)
+        duracion = time.perf_counter() - inicio
+        print(f"{nombre:<24} {duracion:>8.3f} s  ({len(consultas.matriculas):,} matrículas quedan)")
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,42 @@
+# benchmarks/bench_guardado.py - Latencia de guardado de matrículas
+"""Mide cuánto tarda guardar_matriculas con N matrículas (1.000.000 por defecto).
+
+Uso: python benchmarks/bench_guardado.py [cantidad]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.comun import generar_matriculas
+from src.persistencia import PersistenciaCSV
+
+
+def medir(cantidad: int):
+    """Imprime la latencia de guardado síncrono y en segundo plano"""
+    print(f"Generando {cantidad:,} matrículas...")
+    matriculas = generar_matriculas(cantidad)
+    directorio = tempfile.mkdtemp()
+    try:
+        persistencia = PersistenciaCSV(directorio)
+        inicio = time.perf_counter()
+        persistencia.guardar_matriculas(matriculas)
+        print(f"Síncrono (temporal + fsync + rename): {time.perf_counter() - inicio:.2f} s")
+        
+        persistencia = PersistenciaCSV(directorio, segundo_plano=True)
+        inicio = time.perf_counter()
+        persistencia.guardar_matriculas(matriculas)
+        bloqueo = time.perf_counter() - inicio
+        persistencia.esperar_escrituras()
+        total = time.perf_counter() - inicio
+        print(f"Segundo plano: la interfaz queda bloqueada {bloqueo:.2f} s (copia de filas), total {total:.2f} s")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
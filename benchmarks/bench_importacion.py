@@ -0,0 +1,86 @@
+# benchmarks/bench_importacion.py - Importación masiva de estudiantes desde CSV
+"""Compara agregar estudiantes validando duplicados con any() sobre la lista (como
+crear_estudiante antes de los índices) con importar_estudiantes_csv, en uno y varios procesos.
+
+Uso: python benchmarks/bench_importacion.py [existentes] [a_importar] [procesos]
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.consultas import ConsultasAcademicas
+from src.importacion import importar_estudiantes_csv, leer_filas_estudiantes
+from src.modelos import Estudiante
+from src.validaciones import validar_estudiante_completo
+
+
+def generar_existentes(cantidad: int):
+    """Estudiantes ya registrados"""
+    return [
+        Estudiante(f"E{i}", f"{10000000 + i}", f"Nombre{i}", f"Apellido{i}", f"e{i}@correo.com", "2000-01-01")
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def escribir_archivo(archivo: str, existentes: int, cantidad: int):
+    """CSV de admisiones: la mayoría nuevos, 1 de cada 50 con documento ya registrado"""
+    with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['documento', 'nombres', 'apellidos', 'correo', 'fecha_nacimiento'])
+        for i in range(cantidad):
+            documento = 10000001 + (i % existentes) if i % 50 == 0 else 50000000 + i
+            writer.writerow([documento, f"Nuevo{i}", f"Admitido{i}", f"n{i}@correo.com", "2005-06-15"])
+
+
+def importar_con_any(estudiantes, archivo: str) -> int:
+    """Forma anterior: validar y buscar duplicados con any() por cada campo y fila"""
+    aceptados = 0
+    for _, datos in leer_filas_estudiantes(archivo):
+        if validar_estudiante_completo(datos):
+            continue
+        if any(e.documento == datos['documento'] for e in estudiantes):
+            continue
+        if any(e.correo.lower() == datos['correo'].lower() for e in estudiantes):
+            continue
+        estudiantes.append(Estudiante(f"E{len(estudiantes) + 1}", **datos))
+        aceptados += 1
+    return aceptados
+
+
+def medir(existentes: int, cantidad: int, procesos: int):
+    """Imprime filas por segundo de cada forma de importar"""
+    print(f"{existentes:,} estudiantes registrados, {cantidad:,} filas a importar")
+    directorio = tempfile.mkdtemp()
+    try:
+        archivo = os.path.join(directorio, "admisiones.csv")
+        escribir_archivo(archivo, existentes, cantidad)
+        
+        # La forma anterior es cuadrática: se mide con una muestra
+        muestra = os.path.join(directorio, "muestra.csv")
+        escribir_archivo(muestra, existentes, max(1, cantidad // 100))
+        inicio = time.perf_counter()
+        filas = importar_con_any(generar_existentes(existentes), muestra)
+        duracion = time.perf_counter() - inicio
+        print(f"{'any() por fila (muestra 1%)':<34} {cantidad // 100 / duracion:>12,.0f} filas/s ({filas} aceptadas)")
+        
+        for n in sorted({1, procesos}):
+            consultas = ConsultasAcademicas(generar_existentes(existentes), [], [], [])
+            inicio = time.perf_counter()
+            resultado = importar_estudiantes_csv(consultas, archivo, procesos=n)
+            duracion = time.perf_counter() - inicio
+            print(f"{f'Importador, {n} proceso(s)':<34} {resultado.total / duracion:>12,.0f} filas/s "
+                  f"({len(resultado.aceptados)} aceptadas, {duracion:.2f} s)")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 20_000,
+          int(sys.argv[3]) if len(sys.argv) > 3 else 4)
@@ -0,0 +1,71 @@
+# benchmarks/bench_inscripciones.py - Inscripción masiva frente a una por una
+"""Compara inscribir solicitud por solicitud (puede_inscribirse_curso + agregar_inscripcion
++ generar ID) con inscribir_en_lote.
+
+Uso: python benchmarks/bench_inscripciones.py [estudiantes] [solicitudes]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.bitacora import BitacoraOperaciones
+from src.consultas import ConsultasAcademicas
+from src.modelos import Estudiante, Curso, Inscripcion
+from src.operaciones_lote import inscribir_en_lote
+
+
+def generar_datos(estudiantes: int, cursos: int = 200):
+    """Estudiantes y cursos sin inscripciones"""
+    return (
+        [Estudiante(f"E{i}", f"{10000000 + i}", f"Nombre{i}", f"Apellido{i}", f"e{i}@correo.com", "2000-01-01")
+         for i in range(1, estudiantes + 1)],
+        [Curso(f"C{i}", f"Curso {i}", 1 + i % 5, "Docente") for i in range(1, cursos + 1)],
+    )
+
+
+def generar_solicitudes(estudiantes: int, cantidad: int, cursos: int = 200):
+    """Pares (estudiante_id, curso_codigo) al azar; algunos se repiten o pasan del límite"""
+    return [(f"E{random.randint(1, estudiantes)}", f"C{random.randint(1, cursos)}") for _ in range(cantidad)]
+
+
+def inscribir_una_por_una(consultas: ConsultasAcademicas, solicitudes) -> int:
+    """Como crear_inscripcion: verificar, generar el ID y agregar cada solicitud"""
+    aceptadas = 0
+    for estudiante_id, curso_codigo in solicitudes:
+        puede, _ = consultas.puede_inscribirse_curso(estudiante_id, curso_codigo)
+        if puede:
+            consultas.agregar_inscripcion(Inscripcion(consultas.ids.siguiente('inscripcion'), estudiante_id,
+                                                      curso_codigo, "2024-02-01"))
+            aceptadas += 1
+    return aceptadas
+
+
+def medir(estudiantes: int, cantidad: int):
+    """Imprime el tiempo de cada forma de inscribir, con bitácora activa"""
+    print(f"{estudiantes:,} estudiantes, {cantidad:,} solicitudes")
+    solicitudes = generar_solicitudes(estudiantes, cantidad)
+    
+    for nombre, inscribir in (("Una por una", inscribir_una_por_una),
+                              ("inscribir_en_lote", lambda c, s: len(inscribir_en_lote(c, s).aceptadas))):
+        directorio = tempfile.mkdtemp()
+        try:
+            consultas = ConsultasAcademicas(*generar_datos(estudiantes), [], [])
+            consultas.bitacora = BitacoraOperaciones(directorio)
+            inicio = time.perf_counter()
+            aceptadas = inscribir(consultas, solicitudes)
+            duracion = time.perf_counter() - inicio
+            consultas.bitacora.cerrar()
+            print(f"{nombre:<20} {duracion:>8.2f} s  ({aceptadas:,} aceptadas, {cantidad / duracion:>10,.0f} solicitudes/s)")
+        finally:
+            shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
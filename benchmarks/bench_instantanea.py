@@ -0,0 +1,41 @@
+# benchmarks/bench_instantanea.py - Carga desde CSV frente a la instantánea binaria
+"""Compara el tiempo de cargar las matrículas desde el CSV (normal y en modo
+confiable) con el de la instantánea binaria, y lo que cuesta escribirla al guardar.
+
+Uso: python benchmarks/bench_instantanea.py [cantidad]
+"""
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.comun import generar_matriculas, cronometrar
+from src.persistencia import PersistenciaCSV
+
+
+def medir(cantidad: int):
+    """Imprime los tiempos de guardado y carga con y sin instantánea"""
+    print(f"Generando {cantidad:,} matrículas...")
+    # Sin recolector: con millones de objetos vivos, sus pasadas caerían al azar en cualquier medición
+    gc.disable()
+    matriculas = generar_matriculas(cantidad)
+    directorio = tempfile.mkdtemp()
+    try:
+        cronometrar("Guardar solo CSV", lambda: PersistenciaCSV(directorio, instantaneas=False).guardar_matriculas(matriculas))
+        cronometrar("Guardar CSV + instantánea", lambda: PersistenciaCSV(directorio).guardar_matriculas(matriculas))
+        
+        csv_normal = cronometrar("Cargar CSV", PersistenciaCSV(directorio, instantaneas=False).cargar_matriculas)
+        cronometrar("Cargar CSV (confiar)", PersistenciaCSV(directorio, confiar=True, instantaneas=False).cargar_matriculas)
+        binaria = cronometrar("Cargar instantánea", PersistenciaCSV(directorio).cargar_matriculas)
+        assert binaria == csv_normal
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
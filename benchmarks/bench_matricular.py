@@ -0,0 +1,77 @@
+# benchmarks/bench_matricular.py - Matricular inscripciones pendientes: una por una frente al lote
+"""Compara convertir las inscripciones pendientes una a una (como crear_matricula:
+recalcular las pendientes, generar el ID y agregar) con matricular_pendientes.
+
+Uso: python benchmarks/bench_matricular.py [inscripciones] [matriculadas_%]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.bitacora import BitacoraOperaciones
+from src.consultas import ConsultasAcademicas
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+from src.operaciones_lote import matricular_pendientes
+
+
+def generar_datos(inscripciones: int, matriculadas: float):
+    """Inscripciones repartidas en 200 cursos, con una fracción ya matriculada"""
+    estudiantes = [Estudiante(f"E{i}", f"{10000000 + i}", "Nombre", f"Apellido{i}", f"e{i}@correo.com", "2000-01-01")
+                   for i in range(1, inscripciones // 4 + 2)]
+    cursos = [Curso(f"C{i}", f"Curso {i}", 3, "Docente") for i in range(1, 201)]
+    lista = [Inscripcion(f"I{i}", f"E{i // 4 + 1}", f"C{i % 200 + 1}", f"2024-{i % 12 + 1:02d}-01")
+             for i in range(1, inscripciones + 1)]
+    ya_matriculadas = int(inscripciones * matriculadas)
+    matriculas = [Matricula.from_inscripcion(inscripcion, f"M{i}") for i, inscripcion in enumerate(lista[:ya_matriculadas], 1)]
+    return estudiantes, cursos, lista, matriculas
+
+
+def matricular_una_por_una(consultas: ConsultasAcademicas, limite: int) -> int:
+    """Como crear_matricula repetido: cada conversión vuelve a calcular las pendientes"""
+    creadas = 0
+    while creadas < limite:
+        pendientes = consultas.obtener_inscripciones_sin_matricular()
+        if not pendientes:
+            break
+        inscripcion, _, _ = pendientes[0]
+        consultas.agregar_matricula(Matricula.from_inscripcion(inscripcion, consultas.ids.siguiente('matricula')))
+        creadas += 1
+    return creadas
+
+
+def medir(inscripciones: int, matriculadas: float):
+    """Imprime el tiempo de cada forma de matricular"""
+    print(f"{inscripciones:,} inscripciones, {matriculadas:.0%} ya matriculadas")
+    directorio = tempfile.mkdtemp()
+    try:
+        # Una por una: solo una muestra, cada conversión recorre todas las inscripciones
+        consultas = ConsultasAcademicas(*generar_datos(inscripciones, matriculadas))
+        muestra = 100
+        inicio = time.perf_counter()
+        creadas = matricular_una_por_una(consultas, muestra)
+        por_matricula = (time.perf_counter() - inicio) / max(1, creadas)
+        pendientes = inscripciones - int(inscripciones * matriculadas)
+        print(f"{'Una por una (estimado)':<30} {por_matricula * pendientes:>10.2f} s  ({por_matricula * 1e3:.2f} ms/matrícula)")
+        
+        consultas = ConsultasAcademicas(*generar_datos(inscripciones, matriculadas))
+        consultas.bitacora = BitacoraOperaciones(directorio)
+        inicio = time.perf_counter()
+        creadas = matricular_pendientes(consultas)
+        print(f"{'matricular_pendientes':<30} {time.perf_counter() - inicio:>10.2f} s  ({len(creadas):,} matrículas)")
+        
+        inicio = time.perf_counter()
+        consultas.obtener_inscripciones_sin_matricular()
+        print(f"{'Anti-join sin pendientes':<30} {time.perf_counter() - inicio:>10.2f} s")
+        consultas.bitacora.cerrar()
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+          float(sys.argv[2]) / 100 if len(sys.argv) > 2 else 0.5)
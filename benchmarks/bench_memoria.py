@@ -0,0 +1,57 @@
+# benchmarks/bench_memoria.py - Memoria por fila de los modelos
+"""Compara los bytes por fila de cada modelo: dataclass con __dict__ (antes) frente a
+la versión actual con __slots__ y cadenas repetidas compartidas (sys.intern).
+
+Uso: python benchmarks/bench_memoria.py [cantidad]
+"""
+import os
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+
+
+def sin_optimizar(modelo, slots: bool = False):
+    """Copia del modelo como dataclass sin validación ni cadenas compartidas"""
+    return make_dataclass(modelo.__name__, [(campo.name, campo.type) for campo in fields(modelo)], slots=slots)
+
+
+# Valores como los que entrega el lector de CSV: cadenas nuevas en cada fila
+GENERADORES = {
+    Estudiante: lambda i: (f"E{i}", f"{10000000 + i}", f"Nombre{i % 500}", f"Apellido{i % 800}",
+                           f"e{i}@correo.com", f"{1990 + i % 15}-0{1 + i % 9}-1{i % 10}"),
+    Curso: lambda i: (f"C{i}", f"Curso {i}", 1 + i % 5, f"Docente {i % 300}"),
+    Inscripcion: lambda i: (f"I{i}", f"E{i % 50000}", f"C{i % 200}", f"2025-0{1 + i % 2}-0{1 + i % 9}"),
+    Matricula: lambda i: (f"M{i}", f"I{i}", f"E{i % 50000}", f"C{i % 200}",
+                          f"2025-0{1 + i % 2}-0{1 + i % 9}", (i % 51) / 10),
+}
+
+
+def bytes_por_fila(modelo, generar, cantidad: int) -> float:
+    """Memoria retenida por `cantidad` instancias, dividida entre las filas"""
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    filas = [modelo(*generar(i)) for i in range(cantidad)]
+    final, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del filas
+    return (final - inicio) / cantidad
+
+
+def medir(cantidad: int):
+    """Imprime bytes por fila antes, solo con __slots__ y con __slots__ + sys.intern"""
+    print(f"{cantidad:,} filas por modelo")
+    print(f"{'Modelo':<12} {'antes':>8} {'slots':>8} {'después':>8} {'ahorro':>7}")
+    for modelo, generar in GENERADORES.items():
+        antes = bytes_por_fila(sin_optimizar(modelo), generar, cantidad)
+        solo_slots = bytes_por_fila(sin_optimizar(modelo, slots=True), generar, cantidad)
+        despues = bytes_por_fila(modelo, generar, cantidad)
+        print(f"{modelo.__name__:<12} {antes:>8.0f} {solo_slots:>8.0f} {despues:>8.0f} {1 - despues / antes:>7.0%}")
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,87 @@
+# benchmarks/bench_notas.py - Carga de notas: una por una frente a la planilla CSV
+"""Compara asignar notas una a una (como asignar_nota: listar las matrículas sin nota
+y ubicar la elegida) con cargar_notas_csv sobre una planilla completa.
+
+Uso: python benchmarks/bench_notas.py [matriculas]
+"""
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Añadir el directorio padre al path para correr el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.consultas import ConsultasAcademicas
+from src.importacion import cargar_notas_csv
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+
+
+def generar_datos(cantidad: int):
+    """Matrículas sin nota repartidas en 50 cursos, con sus estudiantes e inscripciones"""
+    estudiantes = [Estudiante(f"E{i}", f"{10000000 + i}", "Nombre", f"Apellido{i}", f"e{i}@correo.com", "2000-01-01")
+                   for i in range(1, cantidad // 5 + 2)]
+    cursos = [Curso(f"C{i}", f"Curso {i}", 3, "Docente") for i in range(1, 51)]
+    inscripciones = [Inscripcion(f"I{i}", f"E{i // 5 + 1}", f"C{i % 50 + 1}", "2024-02-01")
+                     for i in range(1, cantidad + 1)]
+    matriculas = [Matricula.from_inscripcion(inscripcion, f"M{i}") for i, inscripcion in enumerate(inscripciones, 1)]
+    return estudiantes, cursos, inscripciones, matriculas
+
+
+def escribir_planilla(archivo: str, estudiantes, matriculas):
+    """Planilla con la mitad de las filas por matricula_id y la otra por documento y curso"""
+    documentos = {e.id: e.documento for e in estudiantes}
+    with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['matricula_id', 'documento', 'curso_codigo', 'nota'])
+        for i, matricula in enumerate(matriculas):
+            nota = round(random.uniform(0, 5), 1)
+            if i % 2:
+                writer.writerow([matricula.id, '', '', nota])
+            else:
+                writer.writerow(['', documentos[matricula.estudiante_id], matricula.curso_codigo, nota])
+
+
+def asignar_una_por_una(consultas: ConsultasAcademicas, cantidad: int) -> int:
+    """Como asignar_nota repetido: cada nota vuelve a listar las matrículas sin nota"""
+    for _ in range(cantidad):
+        sin_nota = [m for m in consultas.matriculas if m.nota is None]
+        for matricula in sin_nota:
+            consultas.buscar_estudiante_por_id(matricula.estudiante_id)
+            consultas.buscar_curso_por_codigo(matricula.curso_codigo)
+        consultas.asignar_nota(sin_nota[0], 4.0)
+    return cantidad
+
+
+def medir(cantidad: int):
+    """Imprime el tiempo de cada forma de cargar notas"""
+    print(f"{cantidad:,} matrículas")
+    directorio = tempfile.mkdtemp()
+    try:
+        datos = generar_datos(cantidad)
+        consultas = ConsultasAcademicas(*datos)
+        consultas.obtener_top_promedios_por_curso("C1")  # Clasificación armada, como en una sesión real
+        muestra = 20
+        inicio = time.perf_counter()
+        asignar_una_por_una(consultas, muestra)
+        por_nota = (time.perf_counter() - inicio) / muestra
+        print(f"{'Una por una (estimado)':<26} {por_nota * cantidad:>10.2f} s  ({por_nota * 1e3:.1f} ms/nota)")
+        
+        datos = generar_datos(cantidad)
+        archivo = os.path.join(directorio, "planilla.csv")
+        escribir_planilla(archivo, datos[0], datos[3])
+        consultas = ConsultasAcademicas(*datos)
+        consultas.obtener_top_promedios_por_curso("C1")
+        inicio = time.perf_counter()
+        resultado = cargar_notas_csv(consultas, archivo)
+        print(f"{'cargar_notas_csv':<26} {time.perf_counter() - inicio:>10.2f} s  "
+              f"({len(resultado.asignadas):,} asignadas, {len(resultado.errores)} con error)")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,41 @@
+# benchmarks/comun.py - Datos sintéticos y cronómetros compartidos por los benchmarks
+"""Funciones que usan varios benchmarks; cada script se corre por separado.
+
+Uso: python benchmarks/bench_x.py [argumentos] o python -m benchmarks.bench_x [argumentos]
+"""
+import time
+
+from src.modelos import Matricula
+
+# Escala y decimales de cada unidad de cronometrar_consultas
+UNIDADES = {'µs': (1e6, 1), 'ms': (1e3, 3)}
+
+
+def generar_matriculas(cantidad: int):
+    """Genera matrículas sintéticas"""
+    return [
+        Matricula(f"M{i}", f"I{i}", f"E{i % 50000}", f"C{i % 200}", "2025-02-01",
+                  (i % 51) / 10 if i % 3 else None)
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def cronometrar(nombre: str, funcion, repeticiones: int = 3):
+    """Ejecuta funcion varias veces, imprime el mejor tiempo y retorna el último resultado"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    print(f"{nombre:<34} {mejor:>8.2f} s")
+    return resultado
+
+
+def cronometrar_consultas(nombre: str, funcion, argumentos, unidad: str = 'µs'):
+    """Ejecuta la función para cada argumento e imprime el tiempo por consulta"""
+    escala, decimales = UNIDADES[unidad]
+    inicio = time.perf_counter()
+    for argumento in argumentos:
+        funcion(argumento)
+    por_consulta = (time.perf_counter() - inicio) / len(argumentos)
+    print(f"{nombre:<38} {por_consulta * escala:>12,.{decimales}f} {unidad}/consulta")
@@ -0,0 +1,320 @@
+# src/almacen_matriculas.py - Matrículas en registros de ancho fijo mapeados en memoria
+# Formato del almacén (dos archivos en el directorio de datos):
+#
+# - matriculas.dat: encabezado de 8 bytes (marca, versión y tamaño de registro) y un
+#   registro de 32 bytes por matrícula: la nota como float64 (NaN = sin nota) y los
+#   códigos uint32 de id, inscripcion_id, estudiante_id, curso_codigo y fecha_matricula.
+#   El registro i empieza en 8 + 32 * i, así que cambiar una nota es escribir 8 bytes
+#   en su lugar, sin tocar el resto del archivo.
+# - matriculas.dic: diccionario de cadenas, una por línea; el código de una cadena es
+#   su número de línea. Solo crece: un código nunca cambia de cadena, así que un
+#   matriculas.dat viejo sigue siendo válido con el diccionario nuevo.
+#
+# Las cadenas nuevas se sincronizan con disco antes que los registros que las usan, y
+# una línea o registro incompleto al final (escritura interrumpida) se descarta al abrir.
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from itertools import filterfalse
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.modelos import Matricula
+from src.instantanea import armar_objetos
+
+MARCA = b'MSMF'
+VERSION = 1
+ENCABEZADO = struct.Struct('<4sHH')  # marca, versión y tamaño de registro
+REGISTRO = struct.Struct('<d5I4x')  # nota y códigos; el relleno deja la nota alineada a 8 bytes
+NOTA = struct.Struct('<d')
+SIN_NOTA = math.nan
+
+# Campos guardados como código del diccionario, en el orden del registro
+CAMPOS = ['id', 'inscripcion_id', 'estudiante_id', 'curso_codigo', 'fecha_matricula']
+# Posición de cada columna dentro del registro, contada en elementos de su tipo ('d' o 'I')
+COLUMNA_NOTA = 0
+COLUMNAS_CODIGOS = {campo: 2 + posicion for posicion, campo in enumerate(CAMPOS)}
+
+_id_de_fila = itemgetter(0)
+
+
+def _columna(registros: memoryview, tipo: str, inicio: int) -> array:
+    """Copia a un array la columna que empieza en el elemento inicio de cada registro"""
+    with registros.cast(tipo) as elementos, elementos[inicio::REGISTRO.size // array(tipo).itemsize] as vista:
+        valores = array(tipo, vista.tobytes())
+    if sys.byteorder != 'little':
+        valores.byteswap()
+    return valores
+
+
+def _llenar_columna(registros: memoryview, tipo: str, inicio: int, valores: array):
+    """Escribe valores en la columna que empieza en el elemento inicio de cada registro"""
+    if sys.byteorder != 'little':
+        valores.byteswap()
+    with registros.cast(tipo) as elementos:
+        elementos[inicio::REGISTRO.size // valores.itemsize] = valores
+
+
+class AlmacenMatriculas:
+    """Guarda las matrículas en registros de ancho fijo y las lee del archivo mapeado.
+    
+    - escribir / anexar: reescriben el archivo (temporal + rename) o agregan registros al final
+    - actualizar_notas: escribe cada nota en su registro, en el lugar: O(1) por nota
+    - cargar lee columna por columna del archivo mapeado; iter_matriculas lo recorre
+      registro a registro
+    
+    El almacén solo se escribe al guardar (PersistenciaCSV.guardar_cambios): asignar
+    una nota cambia la matrícula en memoria y la nota llega a su registro en el
+    siguiente guardado. Las consultas trabajan sobre las listas en memoria.
+    
+    Las filas que recibe son las de PersistenciaCSV._filas: (id, inscripcion_id,
+    estudiante_id, curso_codigo, fecha_matricula, nota).
+    """
+    
+    def __init__(self, base_path: str, archivo_registros: str = "matriculas.dat",
+                 archivo_diccionario: str = "matriculas.dic"):
+        self.archivo_registros = os.path.join(base_path, archivo_registros)
+        self.archivo_diccionario = os.path.join(base_path, archivo_diccionario)
+        self._abierto = False
+        self._cadenas: List[str] = []  # código -> cadena
+        self._codigos: Optional[Dict[str, int]] = None  # cadena -> código (se arma al escribir)
+        self._cantidad = 0
+        self._posiciones: Optional[Dict[str, int]] = None  # id de matrícula -> registro
+        self._archivo = None
+        self._mapa = None
+    
+    def existe(self) -> bool:
+        """Indica si el almacén ya tiene su archivo de registros"""
+        return os.path.exists(self.archivo_registros)
+    
+    def __len__(self) -> int:
+        """Número de matrículas guardadas"""
+        self._abrir()
+        return self._cantidad
+    
+    @staticmethod
+    def _recortar(archivo: str, largo: int):
+        """Descarta lo que haya en el archivo después de largo bytes"""
+        with open(archivo, 'r+b') as f:
+            f.truncate(largo)
+    
+    def _abrir(self):
+        """Lee el diccionario y cuenta los registros la primera vez que se usa el almacén"""
+        if self._abierto:
+            return
+        
+        cadenas = []
+        if os.path.exists(self.archivo_diccionario):
+            with open(self.archivo_diccionario, 'rb') as f:
+                contenido = f.read()
+            completo = contenido.rfind(b'\n') + 1
+            if completo < len(contenido):
+                self._recortar(self.archivo_diccionario, completo)
+            cadenas = contenido[:completo].decode('utf-8').split('\n')[:-1]
+        
+        cantidad = 0
+        if self.existe():
+            with open(self.archivo_registros, 'rb') as f:
+                datos = f.read(ENCABEZADO.size)
+                tamano = os.fstat(f.fileno()).st_size
+            if len(datos) != ENCABEZADO.size or ENCABEZADO.unpack(datos) != (MARCA, VERSION, REGISTRO.size):
+                raise ValueError(f"{self.archivo_registros} no es un almacén de matrículas de esta versión")
+            cantidad = (tamano - ENCABEZADO.size) // REGISTRO.size
+            if ENCABEZADO.size + cantidad * REGISTRO.size < tamano:
+                self._recortar(self.archivo_registros, ENCABEZADO.size + cantidad * REGISTRO.size)
+        
+        self._cadenas = cadenas
+        self._cantidad = cantidad
+        self._abierto = True
+    
+    def _mapear(self):
+        """Mapa de lectura y escritura sobre los registros; None si no hay ninguno"""
+        if self._mapa is None and self._cantidad:
+            self._archivo = open(self.archivo_registros, 'r+b')
+            self._mapa = mmap.mmap(self._archivo.fileno(), ENCABEZADO.size + self._cantidad * REGISTRO.size)
+        return self._mapa
+    
+    def cerrar(self):
+        """Libera el mapa del archivo (se vuelve a mapear al usarlo)"""
+        if self._mapa is not None:
+            self._mapa.close()
+            self._archivo.close()
+            self._mapa = self._archivo = None
+    
+    def eliminar(self):
+        """Cierra el almacén y borra sus dos archivos"""
+        self.cerrar()
+        for archivo in (self.archivo_registros, self.archivo_diccionario):
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        self._abierto = False
+        self._cadenas, self._codigos, self._posiciones, self._cantidad = [], None, None, 0
+    
+    def _leer_columnas(self, *columnas: Tuple[str, int]) -> List[array]:
+        """Copia del archivo mapeado las columnas pedidas como (tipo, inicio)"""
+        self._abrir()
+        mapa = self._mapear()
+        if mapa is None:
+            return [array(tipo) for tipo, _ in columnas]
+        with memoryview(mapa) as vista, vista[ENCABEZADO.size:] as registros:
+            return [_columna(registros, tipo, inicio) for tipo, inicio in columnas]
+    
+    def _ids(self, codigos: Iterable[int]) -> List[str]:
+        """Cadenas de una columna de códigos"""
+        try:
+            return list(map(self._cadenas.__getitem__, codigos))
+        except IndexError:
+            raise ValueError(f"{self.archivo_registros} usa códigos que no están en {self.archivo_diccionario}")
+    
+    def _codificar(self, filas: List[tuple]) -> bytearray:
+        """Registros de las filas; las cadenas nuevas quedan en el diccionario (y en disco) antes de retornar"""
+        self._abrir()
+        if self._codigos is None:
+            self._codigos = dict(zip(self._cadenas, range(len(self._cadenas))))
+        codigos, cadenas = self._codigos, self._cadenas
+        
+        columnas = list(zip(*filas)) or [()] * (len(CAMPOS) + 1)
+        traductores = []
+        inicio = len(cadenas)
+        try:
+            for columna in columnas[:-1]:
+                unicas = dict.fromkeys(columna)
+                nuevas = list(filterfalse(codigos.__contains__, unicas))
+                codigos.update(zip(nuevas, range(len(cadenas), len(cadenas) + len(nuevas))))
+                cadenas.extend(nuevas)
+                if len(unicas) < len(columna):
+                    # Columna con repetidos (curso, fecha...): se traduce con un diccionario pequeño
+                    traductores.append(dict(zip(unicas, map(codigos.__getitem__, unicas))).__getitem__)
+                else:
+                    traductores.append(codigos.__getitem__)
+            
+            nuevas = cadenas[inicio:]
+            if nuevas:
+                texto = '\n'.join(nuevas) + '\n'
+                if texto.count('\n') != len(nuevas):
+                    raise ValueError("No se puede guardar una cadena con saltos de línea")
+                with open(self.archivo_diccionario, 'ab') as f:
+                    largo = f.tell()
+                    try:
+                        f.write(texto.encode('utf-8'))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    except BaseException:
+                        f.truncate(largo)
+                        raise
+        except BaseException:
+            # Sin las cadenas en disco, ningún registro puede usar sus códigos
+            for cadena in cadenas[inicio:]:
+                del codigos[cadena]
+            del cadenas[inicio:]
+            raise
+        
+        registros = bytearray(len(filas) * REGISTRO.size)
+        with memoryview(registros) as vista:
+            _llenar_columna(vista, 'd', COLUMNA_NOTA,
+                            array('d', [SIN_NOTA if nota is None else nota for nota in columnas[-1]]))
+            for campo, columna, traducir in zip(CAMPOS, columnas, traductores):
+                _llenar_columna(vista, 'I', COLUMNAS_CODIGOS[campo], array('I', map(traducir, columna)))
+        return registros
+    
+    def escribir(self, filas: List[tuple]):
+        """Reescribe todos los registros (temporal, fsync y rename)"""
+        registros = self._codificar(filas)
+        self.cerrar()
+        directorio = os.path.dirname(self.archivo_registros) or '.'
+        descriptor, temporal = tempfile.mkstemp(
+            dir=directorio, prefix=f".{os.path.basename(self.archivo_registros)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(ENCABEZADO.pack(MARCA, VERSION, REGISTRO.size))
+                f.write(registros)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, self.archivo_registros)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        self._cantidad = len(filas)
+        self._posiciones = dict(zip(map(_id_de_fila, filas), range(len(filas))))
+    
+    def anexar(self, filas: List[tuple]):
+        """Agrega registros al final; si el almacén no existe, lo escribe"""
+        if not self.existe():
+            self.escribir(filas)
+            return
+        
+        registros = self._codificar(filas)
+        self.cerrar()
+        with open(self.archivo_registros, 'ab') as f:
+            f.write(registros)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._posiciones is not None:
+            self._posiciones.update(zip(map(_id_de_fila, filas), range(self._cantidad, self._cantidad + len(filas))))
+        self._cantidad += len(filas)
+    
+    def _indice(self) -> Dict[str, int]:
+        """Registro de cada id de matrícula (se arma leyendo la columna de ids la primera vez)"""
+        if self._posiciones is None:
+            ids, = self._leer_columnas(('I', COLUMNAS_CODIGOS['id']))
+            self._posiciones = dict(zip(self._ids(ids), range(len(ids))))
+        return self._posiciones
+    
+    def actualizar_notas(self, notas: Iterable[Tuple[str, Optional[float]]]):
+        """Escribe cada nota (id de matrícula, nota) en su registro, sin reescribir el archivo.
+        
+        Se sincronizan con disco solo las páginas con alguna nota escrita. Si algún id
+        no está en el almacén no se escribe ninguna nota y se lanza KeyError.
+        """
+        self._abrir()
+        posiciones = self._indice()
+        lugares = []
+        for matricula_id, nota in notas:
+            posicion = posiciones.get(matricula_id)
+            if posicion is None:
+                raise KeyError(f"La matrícula {matricula_id} no está en {self.archivo_registros}")
+            lugares.append((ENCABEZADO.size + posicion * REGISTRO.size, SIN_NOTA if nota is None else nota))
+        
+        if not lugares:
+            return
+        mapa = self._mapear()
+        paginas = set()
+        for desplazamiento, nota in lugares:
+            NOTA.pack_into(mapa, desplazamiento, nota)
+            paginas.add(desplazamiento // mmap.ALLOCATIONGRANULARITY)
+        
+        # flush exige un inicio alineado a la granularidad del mapa: se sincronizan
+        # tramos de páginas consecutivas, recortados al largo del mapa
+        paginas = sorted(paginas)
+        inicio = anterior = paginas[0]
+        for pagina in paginas[1:] + [None]:
+            if pagina != anterior + 1:
+                desde = inicio * mmap.ALLOCATIONGRANULARITY
+                mapa.flush(desde, min((anterior + 1) * mmap.ALLOCATIONGRANULARITY, len(mapa)) - desde)
+                inicio = pagina
+            anterior = pagina
+    
+    def cargar(self) -> List[Matricula]:
+        """Arma todas las matrículas desde los registros"""
+        notas, *codigos = self._leer_columnas(('d', COLUMNA_NOTA),
+                                              *(('I', COLUMNAS_CODIGOS[campo]) for campo in CAMPOS))
+        columnas = [self._ids(columna) for columna in codigos]
+        columnas.append([None if nota != nota else nota for nota in notas])  # NaN != NaN
+        self._posiciones = dict(zip(columnas[0], range(len(notas))))
+        return armar_objetos(Matricula, CAMPOS + ['nota'], columnas, len(notas))
+    
+    def iter_matriculas(self) -> Iterator[Matricula]:
+        """Recorre las matrículas una a una sin cargarlas todas en memoria"""
+        self._abrir()
+        mapa = self._mapear()
+        if mapa is None:
+            return
+        cadenas = self._cadenas
+        with memoryview(mapa) as vista, vista[ENCABEZADO.size:] as registros:
+            for nota, *codigos in REGISTRO.iter_unpack(registros):
+                yield Matricula(*(cadenas[codigo] for codigo in codigos), None if nota != nota else nota)
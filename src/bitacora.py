@@ -0,0 +1,280 @@
+# src/bitacora.py - Bitácora de operaciones (solo agregar) para recuperación ante fallos
+import json
+import os
+import time
+from dataclasses import asdict, fields
+from typing import Optional
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+
+# Modelo y campo clave de cada tabla
+MODELOS = {
+    'estudiantes': (Estudiante, 'id'),
+    'cursos': (Curso, 'codigo'),
+    'inscripciones': (Inscripcion, 'id'),
+    'matriculas': (Matricula, 'id'),
+}
+
+class BitacoraOperaciones:
+    """Registra cada operación en un archivo JSON Lines antes de guardar los CSV.
+    
+    Las líneas se escriben al momento y se sincronizan con disco (fsync) por lotes;
+    lo que quede pendiente se sincroniza antes de esperar al usuario (sincronizar,
+    ver main.leer_opcion).
+    Al iniciar, las operaciones pendientes se reaplican sobre los datos cargados;
+    al compactar, los datos se guardan y la bitácora se vacía.
+    
+    Para guardados en segundo plano la compactación es en dos pasos: el segmento
+    actual se aparta (iniciar_compactacion) y solo se borra cuando los datos ya
+    están en disco (finalizar_compactacion).
+    """
+    
+    def __init__(self, base_path: str = "datos", nombre_archivo: str = "bitacora.jsonl",
+                 lote_fsync: int = 20, intervalo_fsync: float = 1.0, limite_compactacion: int = 500):
+        self.archivo = os.path.join(base_path, nombre_archivo)
+        self.archivo_anterior = self.archivo + ".anterior"
+        self.lote_fsync = lote_fsync
+        self.intervalo_fsync = intervalo_fsync
+        self.limite_compactacion = limite_compactacion
+        self._pendientes_fsync = 0
+        self._ultimo_fsync = time.monotonic()
+        self._operaciones = self._contar_operaciones()
+        self._f = open(self.archivo, 'a', encoding='utf-8')
+    
+    def _contar_operaciones(self) -> int:
+        """Cuenta las operaciones ya presentes en la bitácora"""
+        if not os.path.exists(self.archivo):
+            return 0
+        with open(self.archivo, 'r', encoding='utf-8') as f:
+            return sum(1 for linea in f if linea.strip())
+    
+    @property
+    def operaciones(self) -> int:
+        """Número de operaciones registradas desde la última compactación"""
+        return self._operaciones
+    
+    def registrar(self, operacion: str, tabla: str, elemento):
+        """Agrega una operación ('alta', 'edicion', 'baja' o 'nota') a la bitácora (lotes: registrar_altas)"""
+        _, campo_clave = MODELOS[tabla]
+        registro = {'op': operacion, 'tabla': tabla, 'clave': getattr(elemento, campo_clave)}
+        if operacion in ('alta', 'edicion'):
+            registro['datos'] = asdict(elemento)
+        elif operacion == 'nota':
+            registro['nota'] = elemento.nota
+        
+        self._f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._f.flush()
+        self._operaciones += 1
+        self._pendientes_fsync += 1
+        
+        if (self._pendientes_fsync >= self.lote_fsync or
+                time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync):
+            self.sincronizar()
+    
+    def registrar_altas(self, tabla: str, elementos: list):
+        """Registra un lote de altas como una sola línea, sincronizada con disco al momento.
+        
+        Al reproducir, una línea incompleta se ignora entera: el lote se recupera
+        completo o no se recupera, como una transacción.
+        """
+        modelo, campo_clave = MODELOS[tabla]
+        # Los modelos son planos: leer los campos directo es mucho más rápido que asdict
+        campos = [campo.name for campo in fields(modelo)]
+        registro = {
+            'op': 'altas', 'tabla': tabla,
+            'claves': [getattr(e, campo_clave) for e in elementos],
+            'datos': [{campo: getattr(e, campo) for campo in campos} for e in elementos],
+        }
+        self._f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._f.flush()
+        self._operaciones += len(elementos)
+        self._pendientes_fsync += 1
+        self.sincronizar()
+    
+    def registrar_notas(self, matriculas: list):
+        """Registra un lote de notas asignadas como una sola línea (ver registrar_altas)"""
+        registro = {
+            'op': 'notas', 'tabla': 'matriculas',
+            'claves': [m.id for m in matriculas],
+            'notas': [m.nota for m in matriculas],
+        }
+        self._f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._f.flush()
+        self._operaciones += len(matriculas)
+        self._pendientes_fsync += 1
+        self.sincronizar()
+    
+    def registrar_bajas_en_cascada(self, estudiantes: list):
+        """Registra la eliminación en cascada de varios estudiantes como una sola línea"""
+        registro = {'op': 'bajas', 'tabla': 'estudiantes', 'claves': [e.id for e in estudiantes]}
+        self._f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._f.flush()
+        self._operaciones += len(estudiantes)
+        self._pendientes_fsync += 1
+        self.sincronizar()
+    
+    def sincronizar(self):
+        """Fuerza la escritura a disco de las operaciones pendientes"""
+        if self._pendientes_fsync:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self._pendientes_fsync = 0
+        self._ultimo_fsync = time.monotonic()
+    
+    def requiere_compactacion(self) -> bool:
+        """Indica si la bitácora creció lo suficiente para compactarla"""
+        return self._operaciones >= self.limite_compactacion
+    
+    def iniciar_compactacion(self):
+        """Aparta el segmento actual; las operaciones siguientes van a un segmento nuevo"""
+        self.sincronizar()
+        self._f.close()
+        
+        if os.path.exists(self.archivo_anterior):
+            # Quedó un segmento de un guardado que no terminó: conservar ambos en orden
+            with open(self.archivo_anterior, 'a', encoding='utf-8') as destino:
+                with open(self.archivo, 'r', encoding='utf-8') as origen:
+                    destino.write(origen.read())
+                destino.flush()
+                os.fsync(destino.fileno())
+            os.remove(self.archivo)
+        else:
+            os.replace(self.archivo, self.archivo_anterior)
+        
+        self._f = open(self.archivo, 'w', encoding='utf-8')
+        self._operaciones = 0
+        self._pendientes_fsync = 0
+    
+    def finalizar_compactacion(self):
+        """Borra el segmento apartado (llamar cuando los datos ya estén en disco)"""
+        if os.path.exists(self.archivo_anterior):
+            os.remove(self.archivo_anterior)
+    
+    def cerrar(self):
+        """Sincroniza y cierra el archivo de la bitácora"""
+        self.sincronizar()
+        self._f.close()
+    
+    def reproducir(self, consultas) -> int:
+        """Reaplica las operaciones de la bitácora sobre ConsultasAcademicas; retorna cuántas aplicó.
+        
+        Es idempotente: reaplicar operaciones que ya estaban guardadas no cambia los datos.
+        """
+        # Las claves se indexan al encontrar el primer registro: con la bitácora
+        # vacía no se toca ninguna colección (pueden ser de carga perezosa)
+        por_clave = None
+        
+        aplicadas = 0
+        for archivo in (self.archivo_anterior, self.archivo):
+            if not os.path.exists(archivo):
+                continue
+            with open(archivo, 'r', encoding='utf-8') as f:
+                for numero, linea in enumerate(f, 1):
+                    if not linea.strip():
+                        continue
+                    try:
+                        registro = json.loads(linea)
+                    except json.JSONDecodeError:
+                        # Una línea incompleta solo puede ser la última (escritura interrumpida)
+                        print(f"⚠️  Bitácora: línea {numero} incompleta, se ignora")
+                        break
+                    
+                    if por_clave is None:
+                        por_clave = self._indexar_colecciones(consultas)
+                    if registro['op'] == 'bajas':
+                        aplicada = self._aplicar_bajas_en_cascada(consultas, registro, por_clave)
+                    else:
+                        aplicada = self._aplicar(consultas, registro, por_clave[registro['tabla']])
+                    if aplicada:
+                        aplicadas += 1
+        
+        return aplicadas
+    
+    @staticmethod
+    def _indexar_colecciones(consultas) -> dict:
+        """Diccionarios tabla -> {clave: elemento} de las colecciones actuales"""
+        colecciones = {
+            'estudiantes': consultas.estudiantes,
+            'cursos': consultas.cursos,
+            'inscripciones': consultas.inscripciones,
+            'matriculas': consultas.matriculas,
+        }
+        return {
+            tabla: {getattr(e, MODELOS[tabla][1]): e for e in lista}
+            for tabla, lista in colecciones.items()
+        }
+    
+    @staticmethod
+    def _aplicar_bajas_en_cascada(consultas, registro: dict, por_clave: dict) -> bool:
+        """Reaplica una eliminación en cascada; las filas borradas salen de todas las tablas"""
+        estudiantes = [por_clave['estudiantes'].pop(clave) for clave in registro['claves']
+                       if clave in por_clave['estudiantes']]
+        if not estudiantes:
+            return False
+        inscripciones, matriculas = consultas.eliminar_estudiantes_en_cascada(estudiantes)
+        for inscripcion in inscripciones:
+            por_clave['inscripciones'].pop(inscripcion.id, None)
+        for matricula in matriculas:
+            por_clave['matriculas'].pop(matricula.id, None)
+        return True
+    
+    def _aplicar(self, consultas, registro: dict, existentes: dict) -> bool:
+        """Aplica una operación; retorna False si no tuvo efecto"""
+        tabla = registro['tabla']
+        operacion = registro['op']
+        modelo, _ = MODELOS[tabla]
+        
+        if operacion == 'altas':
+            pendientes = [(clave, datos) for clave, datos in zip(registro['claves'], registro['datos'])
+                          if clave not in existentes]
+            if not pendientes:
+                return False
+            nuevos = [modelo(**datos) for _, datos in pendientes]
+            getattr(consultas, f"agregar_{tabla}")(nuevos)  # p. ej. agregar_inscripciones
+            existentes.update((clave, elemento) for (clave, _), elemento in zip(pendientes, nuevos))
+            return True
+        
+        if operacion == 'notas':
+            notas = [(existentes[clave], nota) for clave, nota in zip(registro['claves'], registro['notas'])
+                     if clave in existentes]
+            consultas.asignar_notas(notas)
+            return bool(notas)
+        
+        clave = registro['clave']
+        actual: Optional[object] = existentes.get(clave)
+        
+        if operacion == 'alta':
+            if actual is not None:
+                return False
+            elemento = modelo(**registro['datos'])
+            getattr(consultas, self._metodo('agregar', tabla))(elemento)
+            existentes[clave] = elemento
+        elif operacion == 'edicion':
+            if actual is None:
+                return False
+            if tabla == 'matriculas':
+                consultas.asignar_nota(actual, registro['datos']['nota'])
+            else:
+                getattr(consultas, self._metodo('actualizar', tabla))(actual, **registro['datos'])
+        elif operacion == 'baja':
+            if actual is None:
+                return False
+            getattr(consultas, self._metodo('eliminar', tabla))(actual)
+            del existentes[clave]
+        elif operacion == 'nota':
+            if actual is None:
+                return False
+            consultas.asignar_nota(actual, registro['nota'])
+        else:
+            return False
+        return True
+    
+    @staticmethod
+    def _metodo(prefijo: str, tabla: str) -> str:
+        """Nombre del método de ConsultasAcademicas para la tabla (p. ej. agregar_curso)"""
+        singular = {
+            'estudiantes': 'estudiante',
+            'cursos': 'curso',
+            'inscripciones': 'inscripcion',
+            'matriculas': 'matricula',
+        }[tabla]
+        return f"{prefijo}_{singular}"
@@ -0,0 +1,182 @@
+# src/busqueda.py - Búsqueda rápida de estudiantes por prefijos y trigramas
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Set, Tuple
+from src.modelos import Estudiante
+
+# Puntaje de cada tipo de coincidencia de una palabra buscada con un término del estudiante
+EXACTA = 3
+PREFIJO = 2
+CONTIENE = 1
+
+_SEPARADORES = re.compile(r"[^0-9a-z]+")
+_MAXIMO_CARACTER = '\U0010ffff'
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin tildes ni diéresis (la ñ queda como n: "nunez" encuentra a "Núñez")"""
+    texto = texto.lower()
+    if texto.isascii():
+        return texto
+    # NFD separa cada letra de su tilde; al pasar a ASCII se descartan las tildes
+    return unicodedata.normalize('NFD', texto).encode('ascii', 'ignore').decode('ascii')
+
+
+def terminos_de(estudiante: Estudiante) -> Set[str]:
+    """Términos buscables: palabras de nombres y apellidos, documento y partes del correo.
+    
+    El texto buscado se separa igual, así que "ana.gomez@correo" coincide por partes.
+    """
+    texto = normalizar(f"{estudiante.nombres} {estudiante.apellidos} {estudiante.documento} {estudiante.correo}")
+    terminos = set(_SEPARADORES.split(texto))
+    terminos.discard('')
+    return terminos
+
+
+def trigramas(termino: str) -> Set[str]:
+    """Trigramas (subcadenas de 3 caracteres) de un término.
+    
+    Los términos solo numéricos (documentos) se buscan por prefijo y no llevan trigramas:
+    son casi todos distintos y duplicarían el tamaño del índice.
+    """
+    if termino.isdigit():
+        return set()
+    return {termino[i:i + 3] for i in range(len(termino) - 2)}
+
+
+class IndiceBusqueda:
+    """Índice de búsqueda tipo "mientras se escribe" sobre los estudiantes.
+    
+    Cada término (palabra de nombres/apellidos, documento, correo) apunta a los
+    estudiantes que lo contienen. El vocabulario se guarda ordenado para buscar por
+    prefijo con bisect, y cada trigrama apunta a los términos que lo contienen para
+    encontrar subcadenas ("mez" -> "gomez") sin recorrer todo el vocabulario.
+    """
+    
+    def __init__(self, estudiantes: Iterable[Estudiante] = ()):
+        self._estudiantes: Dict[int, Estudiante] = {}  # id(estudiante) -> estudiante
+        self._terminos: Dict[int, Set[str]] = {}  # id(estudiante) -> términos indexados
+        self._orden: Dict[int, Tuple[str, str, str]] = {}  # id(estudiante) -> clave de desempate
+        self._por_termino: Dict[str, Set[int]] = {}
+        self._por_trigrama: Dict[str, Set[str]] = {}
+        self._vocabulario: List[str] = []  # términos distintos, ordenados
+        
+        # Carga inicial: el vocabulario se ordena una sola vez al final
+        for estudiante in estudiantes:
+            self._indexar(estudiante, nuevo_termino=self._vocabulario.append)
+        self._vocabulario.sort()
+    
+    def __len__(self) -> int:
+        """Número de estudiantes indexados"""
+        return len(self._estudiantes)
+    
+    def _indexar(self, estudiante: Estudiante, nuevo_termino):
+        """Registra los términos del estudiante; nuevo_termino recibe los que no existían"""
+        clave = id(estudiante)
+        terminos = terminos_de(estudiante)
+        self._estudiantes[clave] = estudiante
+        self._terminos[clave] = terminos
+        self._orden[clave] = (estudiante.apellidos.lower(), estudiante.nombres.lower(), estudiante.id)
+        for termino in terminos:
+            estudiantes = self._por_termino.get(termino)
+            if estudiantes is None:
+                estudiantes = self._por_termino[termino] = set()
+                nuevo_termino(termino)
+                for trigrama in trigramas(termino):
+                    self._por_trigrama.setdefault(trigrama, set()).add(termino)
+            estudiantes.add(clave)
+    
+    def agregar(self, estudiante: Estudiante):
+        """Agrega un estudiante al índice"""
+        self._indexar(estudiante, nuevo_termino=lambda termino: insort(self._vocabulario, termino))
+    
+    def quitar(self, estudiante: Estudiante):
+        """Quita un estudiante del índice (con los términos con que se indexó)"""
+        clave = id(estudiante)
+        terminos = self._terminos.pop(clave, None)
+        if terminos is None:
+            return
+        del self._estudiantes[clave]
+        del self._orden[clave]
+        for termino in terminos:
+            estudiantes = self._por_termino[termino]
+            estudiantes.discard(clave)
+            if estudiantes:
+                continue
+            # Nadie más usa el término: sale del vocabulario y de sus trigramas
+            del self._por_termino[termino]
+            del self._vocabulario[bisect_left(self._vocabulario, termino)]
+            for trigrama in trigramas(termino):
+                con_trigrama = self._por_trigrama[trigrama]
+                con_trigrama.discard(termino)
+                if not con_trigrama:
+                    del self._por_trigrama[trigrama]
+    
+    def actualizar(self, estudiante: Estudiante):
+        """Reindexa un estudiante cuyos datos cambiaron"""
+        self.quitar(estudiante)
+        self.agregar(estudiante)
+    
+    def _puntajes_palabra(self, palabra: str) -> Dict[int, int]:
+        """Mejor puntaje de cada estudiante para una palabra buscada"""
+        puntajes_termino: Dict[str, int] = {}
+        
+        # Prefijo (incluye la coincidencia exacta): tramo contiguo del vocabulario ordenado
+        inicio = bisect_left(self._vocabulario, palabra)
+        fin = bisect_left(self._vocabulario, palabra + _MAXIMO_CARACTER)
+        for termino in self._vocabulario[inicio:fin]:
+            puntajes_termino[termino] = EXACTA if termino == palabra else PREFIJO
+        
+        # Subcadena: términos que tienen todos los trigramas de la palabra
+        if len(palabra) >= 3:
+            candidatos = None
+            for trigrama in sorted(trigramas(palabra), key=lambda t: len(self._por_trigrama.get(t, ()))):
+                con_trigrama = self._por_trigrama.get(trigrama)
+                if not con_trigrama:
+                    candidatos = set()
+                    break
+                candidatos = set(con_trigrama) if candidatos is None else candidatos & con_trigrama
+            for termino in candidatos or ():
+                if termino not in puntajes_termino and palabra in termino:
+                    puntajes_termino[termino] = CONTIENE
+        
+        puntajes: Dict[int, int] = {}
+        for termino, puntaje in puntajes_termino.items():
+            for clave in self._por_termino[termino]:
+                if puntajes.get(clave, 0) < puntaje:
+                    puntajes[clave] = puntaje
+        return puntajes
+    
+    def buscar(self, texto: str, limite: int = 20) -> List[Estudiante]:
+        """Estudiantes que coinciden con todas las palabras del texto, de mejor a peor coincidencia.
+        
+        Cada palabra puede coincidir exacta, por prefijo o como subcadena (3+ letras)
+        con cualquier término del estudiante; a igual puntaje se ordena por apellidos y nombres.
+        """
+        palabras = [palabra for palabra in _SEPARADORES.split(normalizar(texto)) if palabra]
+        if not palabras:
+            return []
+        
+        total: Dict[int, int] = {}
+        for i, palabra in enumerate(palabras):
+            puntajes = self._puntajes_palabra(palabra)
+            if i == 0:
+                total = puntajes
+            else:
+                total = {clave: total[clave] + puntaje for clave, puntaje in puntajes.items() if clave in total}
+            if not total:
+                return []
+        
+        # Se agrupa por puntaje y solo se ordenan los grupos necesarios para llenar el límite
+        por_puntaje: Dict[int, List[int]] = {}
+        for clave, puntaje in total.items():
+            por_puntaje.setdefault(puntaje, []).append(clave)
+        
+        claves: List[int] = []
+        for puntaje in sorted(por_puntaje, reverse=True):
+            claves.extend(heapq.nsmallest(limite - len(claves), por_puntaje[puntaje], key=self._orden.__getitem__))
+            if len(claves) >= limite:
+                break
+        return [self._estudiantes[clave] for clave in claves]
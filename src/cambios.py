@@ -0,0 +1,66 @@
+# src/cambios.py - Registro de cambios pendientes de guardar
+from typing import Dict, List, Set
+
+TABLAS = ('estudiantes', 'cursos', 'inscripciones', 'matriculas')
+
+
+class RegistroCambios:
+    """Lleva el registro de qué tablas cambiaron desde el último guardado.
+    
+    Si una tabla solo recibió registros nuevos se guardan como filas agregadas
+    al final del archivo; cualquier edición o eliminación obliga a reescribirla.
+    Los cambios de nota se llevan aparte: un motor que puede escribir una nota en
+    su lugar (ver AlmacenMatriculas) no necesita reescribir la tabla por ellos.
+    """
+    
+    def __init__(self):
+        self._reescribir: Set[str] = set()
+        self._agregados: Dict[str, List] = {tabla: [] for tabla in TABLAS}
+        self._notas: Dict[str, Dict[int, object]] = {tabla: {} for tabla in TABLAS}  # id(elemento) -> elemento
+    
+    def registrar_alta(self, tabla: str, elemento):
+        """Registra un elemento nuevo en la tabla"""
+        if tabla not in self._reescribir:
+            self._agregados[tabla].append(elemento)
+    
+    def registrar_nota(self, tabla: str, elemento):
+        """Registra un cambio de nota de un elemento de la tabla"""
+        if tabla not in self._reescribir:
+            self._notas[tabla][id(elemento)] = elemento
+    
+    def registrar_modificacion(self, tabla: str):
+        """Registra una edición o eliminación en la tabla"""
+        self._reescribir.add(tabla)
+        self._agregados[tabla].clear()
+        self._notas[tabla].clear()
+    
+    def marcar_todo(self):
+        """Marca todas las tablas para reescritura completa"""
+        for tabla in TABLAS:
+            self.registrar_modificacion(tabla)
+    
+    def requiere_reescritura(self, tabla: str) -> bool:
+        """Indica si la tabla debe reescribirse completa"""
+        return tabla in self._reescribir
+    
+    def agregados_pendientes(self, tabla: str) -> List:
+        """Retorna los elementos nuevos pendientes de agregar a la tabla"""
+        return list(self._agregados[tabla])
+    
+    def notas_pendientes(self, tabla: str) -> List:
+        """Retorna los elementos con notas cambiadas pendientes de guardar"""
+        return list(self._notas[tabla].values())
+    
+    def esta_modificada(self, tabla: str) -> bool:
+        """Indica si la tabla tiene cambios sin guardar"""
+        return tabla in self._reescribir or bool(self._agregados[tabla]) or bool(self._notas[tabla])
+    
+    def hay_cambios(self) -> bool:
+        """Indica si alguna tabla tiene cambios sin guardar"""
+        return any(self.esta_modificada(tabla) for tabla in TABLAS)
+    
+    def limpiar(self, tabla: str):
+        """Marca la tabla como guardada"""
+        self._reescribir.discard(tabla)
+        self._agregados[tabla].clear()
+        self._notas[tabla].clear()
@@ -1,96 +1,143 @@
-# src/consultas.py - Versión actualizada con inscripciones
-from typing import List, Tuple, Optional
+# src/consultas.py - Consultas y reportes sobre el repositorio académico
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+from src.posiciones import top_k_por_curso
+from src.repositorio import RepositorioAcademico
 
 class ConsultasAcademicas:
-    """Clase para realizar consultas y reportes del sistema"""
-    
-    def __init__(self, estudiantes: List[Estudiante], cursos: List[Curso], 
-                 inscripciones: List[Inscripcion], matriculas: List[Matricula]):
-        self.estudiantes = estudiantes
-        self.cursos = cursos
-        self.inscripciones = inscripciones
-        self.matriculas = matriculas
-    
-    def buscar_estudiante_por_documento(self, documento: str) -> Optional[Estudiante]:
-        """Busca estudiante por número de documento"""
-        for estudiante in self.estudiantes:
-            if estudiante.documento == documento:
-                return estudiante
-        return None
-    
-    def buscar_estudiante_por_correo(self, correo: str) -> Optional[Estudiante]:
-        """Busca estudiante por correo electrónico"""
-        for estudiante in self.estudiantes:
-            if estudiante.correo.lower() == correo.lower():
-                return estudiante
-        return None
+    """Clase para realizar consultas y reportes del sistema.
+    
+    Las colecciones, los índices y las operaciones de alta, edición y baja son
+    de un RepositorioAcademico (self.repositorio); aquí solo se leen. Todo lo que
+    no es una consulta (agregar_*, eliminar_*, asignar_nota, cambios, ids,
+    bitacora...) se delega en el repositorio, así que una ConsultasAcademicas se
+    usa igual que el repositorio al que consulta. Las notas deben asignarse con
+    asignar_nota para que la tabla de columnas de los reportes de notas se
+    mantenga al día.
+    """
+    
+    def __init__(self, estudiantes: List[Estudiante] = None, cursos: List[Curso] = None,
+                 inscripciones: List[Inscripcion] = None, matriculas: List[Matricula] = None,
+                 indexar: bool = True, repositorio: Optional[RepositorioAcademico] = None):
+        """Consulta el repositorio dado o uno nuevo con las colecciones dadas"""
+        if repositorio is None:
+            repositorio = RepositorioAcademico(estudiantes, cursos, inscripciones, matriculas, indexar)
+        self.repositorio = repositorio
+    
+    def __getattr__(self, nombre: str):
+        """Delega en el repositorio lo que no es una consulta"""
+        if nombre == 'repositorio':  # aún sin asignar (p. ej. al copiar el objeto)
+            raise AttributeError(nombre)
+        return getattr(self.repositorio, nombre)
+    
+    @property
+    def bitacora(self):
+        """Bitácora de operaciones del repositorio"""
+        return self.repositorio.bitacora
+    
+    @bitacora.setter
+    def bitacora(self, bitacora):
+        self.repositorio.bitacora = bitacora
     
     def listar_estudiantes_ordenados_por_apellido(self) -> List[Estudiante]:
         """Retorna lista de estudiantes ordenados por apellido"""
-        return sorted(self.estudiantes, key=lambda e: e.apellidos.lower())
+        return list(self.repositorio.indice_apellidos())
+    
+    def buscar_estudiantes(self, texto: str, limite: int = 20) -> List[Estudiante]:
+        """Búsqueda mientras se escribe por nombres, apellidos, documento o correo, ordenada por relevancia"""
+        return self.repositorio.indice_busqueda().buscar(texto, limite)
+    
+    def buscar_estudiantes_por_apellido(self, apellido: str) -> List[Estudiante]:
+        """Todos los estudiantes con ese apellido exacto, en O(log n)"""
+        return self.repositorio.indice_apellidos().iguales(apellido.lower())
+    
+    def buscar_estudiantes_por_prefijo_apellido(self, prefijo: str) -> List[Estudiante]:
+        """Estudiantes cuyo apellido empieza por prefijo, en O(log n)"""
+        return self.repositorio.indice_apellidos().con_prefijo(prefijo.lower())
+    
+    def buscar_estudiantes_por_rango_apellido(self, desde: str, hasta: str) -> List[Estudiante]:
+        """Estudiantes con apellido entre desde y hasta (ambos incluidos), en O(log n)"""
+        return self.repositorio.indice_apellidos().en_rango(desde.lower(), hasta.lower())
     
     def obtener_top_promedios_por_curso(self, codigo_curso: str, top: int = 3) -> List[Tuple[Estudiante, float]]:
         """Obtiene los mejores promedios de un curso específico"""
-        matriculas_curso = [m for m in self.matriculas 
-                           if m.curso_codigo == codigo_curso and m.nota is not None]
-        
-        # Crear lista de estudiante-nota
-        estudiantes_notas = []
-        for matricula in matriculas_curso:
-            estudiante = self.buscar_estudiante_por_id(matricula.estudiante_id)
-            if estudiante:
-                estudiantes_notas.append((estudiante, matricula.nota))
-        
-        # Ordenar por nota descendente y tomar el top
-        estudiantes_notas.sort(key=lambda x: x[1], reverse=True)
-        return estudiantes_notas[:top]
+        estudiantes = self.repositorio.estudiantes_por_id()
+        
+        # La clasificación ya está ordenada: solo se leen las primeras posiciones
+        mejores = self.repositorio.posiciones().top(codigo_curso, top, self._con_estudiante(estudiantes))
+        return [(estudiantes[m.estudiante_id], m.nota) for m in mejores]
+    
+    def top_k_por_todos_los_cursos(self, k: int = 3) -> Dict[str, List[Tuple[Estudiante, float]]]:
+        """Los k mejores promedios de cada curso, en una sola pasada por las matrículas"""
+        estudiantes = self.repositorio.estudiantes_por_id()
+        mejores = top_k_por_curso(self.repositorio.matriculas, k, self._con_estudiante(estudiantes))
+        return {curso: [(estudiantes[m.estudiante_id], m.nota) for m in matriculas]
+                for curso, matriculas in mejores.items()}
+    
+    @staticmethod
+    def _con_estudiante(estudiantes: Dict[str, Estudiante]):
+        """Filtro que indica si el estudiante de la matrícula existe (los reportes omiten las huérfanas)"""
+        def tiene_estudiante(matricula: Matricula) -> bool:
+            return matricula.estudiante_id in estudiantes
+        return tiene_estudiante
+    
+    def obtener_estadisticas_por_curso(self, nota_aprobatoria: float = 3.0) -> List[Tuple[Curso, Dict]]:
+        """Estadísticas de notas de cada curso (ver TablaMatriculas.estadisticas_por_curso), en una pasada"""
+        estadisticas = self.repositorio.tabla_matriculas().estadisticas_por_curso(nota_aprobatoria)
+        return [(curso, estadisticas[curso.codigo]) for curso in self.repositorio.cursos if curso.codigo in estadisticas]
     
     def obtener_reprobados(self, nota_minima: float = 3.0) -> List[Tuple[Estudiante, Curso, float]]:
         """Obtiene estudiantes reprobados (nota < nota_minima)"""
-        reprobados = []
-        
-        for matricula in self.matriculas:
+        tabla = self.repositorio.tabla_matriculas()
+        filas = tabla.filas_con_nota_menor(nota_minima)
+        return list(self.iterar_reprobados(map(tabla.matricula, filas), nota_minima))
+    
+    def iterar_reprobados(self, matriculas: Iterable[Matricula],
+                          nota_minima: float = 3.0) -> Iterator[Tuple[Estudiante, Curso, float]]:
+        """Recorre cualquier fuente de matrículas (lista o iterador) y entrega los reprobados.
+        
+        Con PersistenciaCSV.iter_matriculas() el reporte usa memoria constante: los
+        estudiantes y cursos se buscan en diccionarios armados solo con sus listas, sin
+        los índices del repositorio, que en uno perezoso cargarían todas las matrículas.
+        """
+        repositorio = self.repositorio
+        # Gana la primera aparición de cada id, como en los índices del repositorio
+        estudiantes: Dict[str, Estudiante] = {}
+        for estudiante in repositorio.estudiantes:
+            estudiantes.setdefault(estudiante.id, estudiante)
+        cursos: Dict[str, Curso] = {}
+        for curso in repositorio.cursos:
+            cursos.setdefault(curso.codigo, curso)
+        
+        for matricula in matriculas:
             if matricula.nota is not None and matricula.nota < nota_minima:
-                estudiante = self.buscar_estudiante_por_id(matricula.estudiante_id)
-                curso = self.buscar_curso_por_codigo(matricula.curso_codigo)
+                estudiante = estudiantes.get(matricula.estudiante_id)
+                curso = cursos.get(matricula.curso_codigo)
                 
                 if estudiante and curso:
-                    reprobados.append((estudiante, curso, matricula.nota))
-        
-        return reprobados
-    
-    def obtener_creditos_inscritos_por_estudiante(self, estudiante_id: str) -> int:
-        """Calcula total de créditos inscritos por un estudiante (basado en inscripciones)"""
-        creditos_total = 0
-        
-        inscripciones_estudiante = [i for i in self.inscripciones if i.estudiante_id == estudiante_id]
-        
-        for inscripcion in inscripciones_estudiante:
-            curso = self.buscar_curso_por_codigo(inscripcion.curso_codigo)
-            if curso:
-                creditos_total += curso.creditos
-        
-        return creditos_total
+                    yield estudiante, curso, matricula.nota
     
     def obtener_creditos_disponibles_estudiante(self, estudiante_id: str, limite_creditos: int = 20) -> int:
         """Calcula créditos disponibles para un estudiante"""
-        creditos_inscritos = self.obtener_creditos_inscritos_por_estudiante(estudiante_id)
+        creditos_inscritos = self.repositorio.obtener_creditos_inscritos_por_estudiante(estudiante_id)
         return limite_creditos - creditos_inscritos
     
     def puede_inscribirse_curso(self, estudiante_id: str, curso_codigo: str, limite_creditos: int = 20) -> tuple[bool, str]:
         """Verifica si un estudiante puede inscribirse a un curso"""
+        repositorio = self.repositorio
+        
         # Verificar si ya está inscrito
-        for inscripcion in self.inscripciones:
-            if inscripcion.estudiante_id == estudiante_id and inscripcion.curso_codigo == curso_codigo:
+        for inscripcion in repositorio.obtener_inscripciones_de_estudiante(estudiante_id):
+            if inscripcion.curso_codigo == curso_codigo:
                 return False, "El estudiante ya está inscrito en este curso"
         
         # Verificar límite de créditos
-        curso = self.buscar_curso_por_codigo(curso_codigo)
+        curso = repositorio.buscar_curso_por_codigo(curso_codigo)
         if not curso:
             return False, "Curso no encontrado"
         
-        creditos_actuales = self.obtener_creditos_inscritos_por_estudiante(estudiante_id)
+        creditos_actuales = repositorio.obtener_creditos_inscritos_por_estudiante(estudiante_id)
         if creditos_actuales + curso.creditos > limite_creditos:
             return False, f"Excede el límite de créditos. Disponibles: {limite_creditos - creditos_actuales}, Necesarios: {curso.creditos}"
         
@@ -98,43 +145,13 @@ class ConsultasAcademicas:
     
     def tiene_estudiantes_inscritos(self, curso_codigo: str) -> bool:
         """Verifica si un curso tiene estudiantes inscritos o matriculados"""
-        # Verificar inscripciones
-        for inscripcion in self.inscripciones:
-            if inscripcion.curso_codigo == curso_codigo:
-                return True
-        
-        # Verificar matrículas
-        for matricula in self.matriculas:
-            if matricula.curso_codigo == curso_codigo:
-                return True
-        
-        return False
-    
-    def buscar_estudiante_por_id(self, estudiante_id: str) -> Optional[Estudiante]:
-        """Busca estudiante por ID"""
-        for estudiante in self.estudiantes:
-            if estudiante.id == estudiante_id:
-                return estudiante
-        return None
-    
-    def buscar_curso_por_codigo(self, codigo: str) -> Optional[Curso]:
-        """Busca curso por código"""
-        for curso in self.cursos:
-            if curso.codigo == codigo:
-                return curso
-        return None
-    
-    def buscar_inscripcion_por_id(self, inscripcion_id: str) -> Optional[Inscripcion]:
-        """Busca inscripción por ID"""
-        for inscripcion in self.inscripciones:
-            if inscripcion.id == inscripcion_id:
-                return inscripcion
-        return None
+        return (curso_codigo in self.repositorio.inscripciones_por_curso() or
+                curso_codigo in self.repositorio.matriculas_por_curso())
     
     def obtener_dominios_correo_unicos(self) -> List[str]:
         """Obtiene lista de dominios de correo únicos"""
         dominios = set()
-        for estudiante in self.estudiantes:
+        for estudiante in self.repositorio.estudiantes:
             if '@' in estudiante.correo:
                 dominio = estudiante.correo.split('@')[1]
                 dominios.add(dominio)
@@ -142,50 +159,81 @@ class ConsultasAcademicas:
         return sorted(list(dominios))
     
     def buscar_binario_estudiante(self, apellido_buscar: str) -> Optional[Estudiante]:
-        """Implementa búsqueda binaria por apellido (requiere lista ordenada)"""
-        estudiantes_ordenados = self.listar_estudiantes_ordenados_por_apellido()
-        
-        izq, der = 0, len(estudiantes_ordenados) - 1
-        
-        while izq <= der:
-            medio = (izq + der) // 2
-            apellido_medio = estudiantes_ordenados[medio].apellidos.lower()
-            apellido_buscar_lower = apellido_buscar.lower()
-            
-            if apellido_medio == apellido_buscar_lower:
-                return estudiantes_ordenados[medio]
-            elif apellido_medio < apellido_buscar_lower:
-                izq = medio + 1
-            else:
-                der = medio - 1
-        
-        return None
-    
-    def obtener_inscripciones_sin_matricular(self) -> List[Tuple[Inscripcion, Estudiante, Curso]]:
-        """Obtiene inscripciones que aún no se han convertido en matrículas"""
-        inscripciones_ids = {m.inscripcion_id for m in self.matriculas}
+        """Búsqueda binaria por apellido sobre el índice ordenado (sin reordenar en cada llamada)"""
+        return self.repositorio.indice_apellidos().primero(apellido_buscar.lower())
+    
+    @staticmethod
+    def _leer_fecha(texto: str) -> Optional[date]:
+        """Convierte una fecha YYYY-MM-DD (con o sin ceros a la izquierda) en date; None si no es válida"""
+        try:
+            return datetime.strptime(texto.strip(), '%Y-%m-%d').date()
+        except ValueError:
+            return None
+    
+    @classmethod
+    def _leer_limite(cls, texto: Optional[str], nombre: str) -> Optional[date]:
+        """Convierte el límite de un filtro de fechas; lanza ValueError si no es una fecha válida"""
+        if texto is None:
+            return None
+        fecha = cls._leer_fecha(texto)
+        if fecha is None:
+            raise ValueError(f"Fecha '{nombre}' inválida: {texto} (formato YYYY-MM-DD)")
+        return fecha
+    
+    def obtener_inscripciones_sin_matricular(self, curso_codigo: Optional[str] = None,
+                                             desde: Optional[str] = None,
+                                             hasta: Optional[str] = None) -> List[Tuple[Inscripcion, Estudiante, Curso]]:
+        """Obtiene inscripciones que aún no se han convertido en matrículas.
+        
+        Es un anti-join en una pasada: cada inscripción se descarta si su id está en el
+        índice de matrículas por inscripción. Opcionalmente se filtra por curso (usando
+        el índice por curso) y por fecha de inscripción entre desde y hasta (YYYY-MM-DD, incluidas).
+        Las fechas se comparan como fechas, no como texto: "2025-9-2" va antes que "2025-10-01".
+        Con un filtro de fecha se omiten las inscripciones cuya fecha no se puede leer.
+        """
+        repositorio = self.repositorio
+        desde = self._leer_limite(desde, 'desde')
+        hasta = self._leer_limite(hasta, 'hasta')
+        fechas: Dict[str, Optional[date]] = {}  # las inscripciones comparten pocas fechas distintas
+        if curso_codigo is None:
+            inscripciones = repositorio.inscripciones
+        else:
+            inscripciones = repositorio.inscripciones_por_curso().get(curso_codigo, [])
+        
+        matriculadas = repositorio.matriculas_por_inscripcion()
+        estudiantes = repositorio.estudiantes_por_id()
+        cursos = repositorio.cursos_por_codigo()
         inscripciones_pendientes = []
         
-        for inscripcion in self.inscripciones:
-            if inscripcion.id not in inscripciones_ids:
-                estudiante = self.buscar_estudiante_por_id(inscripcion.estudiante_id)
-                curso = self.buscar_curso_por_codigo(inscripcion.curso_codigo)
-                
-                if estudiante and curso:
-                    inscripciones_pendientes.append((inscripcion, estudiante, curso))
+        for inscripcion in inscripciones:
+            if inscripcion.id in matriculadas:
+                continue
+            if desde is not None or hasta is not None:
+                texto = inscripcion.fecha_inscripcion
+                if texto not in fechas:
+                    fechas[texto] = self._leer_fecha(texto)
+                fecha = fechas[texto]
+                if fecha is None or (desde is not None and fecha < desde) or (hasta is not None and fecha > hasta):
+                    continue
+            estudiante = estudiantes.get(inscripcion.estudiante_id)
+            curso = cursos.get(inscripcion.curso_codigo)
+            
+            if estudiante and curso:
+                inscripciones_pendientes.append((inscripcion, estudiante, curso))
         
         return inscripciones_pendientes
     
     def obtener_matriculas_con_inscripcion(self) -> List[Tuple[Matricula, Inscripcion, Estudiante, Curso]]:
         """Obtiene matrículas con información completa de inscripción, estudiante y curso"""
+        repositorio = self.repositorio
         matriculas_completas = []
         
-        for matricula in self.matriculas:
-            inscripcion = self.buscar_inscripcion_por_id(matricula.inscripcion_id)
-            estudiante = self.buscar_estudiante_por_id(matricula.estudiante_id)
-            curso = self.buscar_curso_por_codigo(matricula.curso_codigo)
+        for matricula in repositorio.matriculas:
+            inscripcion = repositorio.buscar_inscripcion_por_id(matricula.inscripcion_id)
+            estudiante = repositorio.buscar_estudiante_por_id(matricula.estudiante_id)
+            curso = repositorio.buscar_curso_por_codigo(matricula.curso_codigo)
             
             if inscripcion and estudiante and curso:
                 matriculas_completas.append((matricula, inscripcion, estudiante, curso))
         
-        return matriculas_completas
\ No newline at end of file
+        return matriculas_completas
@@ -0,0 +1,84 @@
+# src/identificadores.py - Generación de IDs autoincrementales con contadores en memoria
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Prefijo de los IDs de cada tipo de entidad (E1, C1, I1, M1...)
+PREFIJOS = {
+    'estudiante': 'E',
+    'curso': 'C',
+    'inscripcion': 'I',
+    'matricula': 'M',
+}
+
+
+def numero_de_id(tipo: str, identificador: str) -> Optional[int]:
+    """Parte numérica de un ID con el prefijo del tipo, o None si no sigue el formato"""
+    prefijo = PREFIJOS[tipo]
+    if identificador.startswith(prefijo) and identificador[len(prefijo):].isdigit():
+        return int(identificador[len(prefijo):])
+    return None
+
+
+class GeneradorIds:
+    """Entrega IDs consecutivos por tipo de entidad sin recorrer las listas.
+    
+    Cada tipo guarda el mayor número emitido u observado (la marca de agua); el
+    siguiente ID es ese número más uno. Las marcas solo crecen, así que un ID
+    eliminado no se vuelve a emitir, y se guardan junto a los datos para que eso
+    siga valiendo entre sesiones. Es seguro usarlo desde varios hilos.
+    """
+    
+    def __init__(self, marcas: Optional[Dict[str, int]] = None):
+        self._lock = threading.Lock()
+        self._marcas: Dict[str, int] = {tipo: 0 for tipo in PREFIJOS}
+        # Indica si se emitieron u observaron IDs nuevos desde el último guardado
+        self.modificado = False
+        if marcas:
+            self.sembrar(marcas)
+    
+    def marcas(self) -> Dict[str, int]:
+        """Copia de las marcas actuales {tipo: último número}"""
+        with self._lock:
+            return dict(self._marcas)
+    
+    def sembrar(self, marcas: Dict[str, int]):
+        """Sube las marcas a los valores dados (p. ej. los guardados en disco); nunca las baja"""
+        with self._lock:
+            for tipo, ultimo in marcas.items():
+                if tipo in self._marcas and ultimo > self._marcas[tipo]:
+                    self._marcas[tipo] = ultimo
+    
+    def observar(self, tipo: str, identificador: str):
+        """Registra un ID ya existente para que no se vuelva a emitir"""
+        numero = numero_de_id(tipo, identificador)
+        if numero is not None and numero > self._marcas[tipo]:
+            with self._lock:
+                if numero > self._marcas[tipo]:
+                    self._marcas[tipo] = numero
+                    self.modificado = True
+    
+    def observar_todos(self, tipo: str, identificadores: Iterable[str]):
+        """Registra de una vez los IDs de una colección cargada (sin marcar cambios por guardar)"""
+        numeros = (numero_de_id(tipo, identificador) for identificador in identificadores)
+        mayor = max((numero for numero in numeros if numero is not None), default=0)
+        self.sembrar({tipo: mayor})
+    
+    def siguiente(self, tipo: str) -> str:
+        """Emite el siguiente ID del tipo, en O(1)"""
+        return self.reservar(tipo, 1)[0]
+    
+    def reservar(self, tipo: str, cantidad: int) -> List[str]:
+        """Reserva cantidad IDs consecutivos del tipo (para importaciones por lotes)"""
+        if tipo not in PREFIJOS:
+            raise ValueError(f"Tipo de entidad desconocido: {tipo}")
+        if cantidad < 0:
+            raise ValueError("La cantidad a reservar no puede ser negativa")
+        
+        with self._lock:
+            primero = self._marcas[tipo] + 1
+            self._marcas[tipo] += cantidad
+            if cantidad:
+                self.modificado = True
+        
+        prefijo = PREFIJOS[tipo]
+        return [f"{prefijo}{numero}" for numero in range(primero, primero + cantidad)]
@@ -0,0 +1,213 @@
+# src/importacion.py - Importación masiva desde CSV: estudiantes nuevos y planillas de notas
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.modelos import Estudiante, Matricula
+from src.validaciones import validar_estudiante_completo, validar_nota
+
+# Columnas que debe traer el archivo a importar (el id lo asigna el sistema)
+COLUMNAS = ['documento', 'nombres', 'apellidos', 'correo', 'fecha_nacimiento']
+
+# Columnas de una planilla de notas: por id de matrícula o por documento y curso
+COLUMNAS_NOTAS = ['matricula_id', 'documento', 'curso_codigo', 'nota']
+
+# Con menos filas que esto por proceso, repartir la validación cuesta más de lo que ahorra
+FILAS_MINIMAS_POR_PROCESO = 2000
+
+
+def _leer_filas(archivo: str, columnas: List[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Recorre un CSV entregando (número de fila, datos sin espacios sobrantes).
+    
+    El número de fila es el del archivo (el encabezado es la fila 1). Las columnas
+    se ubican por el encabezado; las que falten se leen vacías.
+    """
+    with open(archivo, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        encabezado = next(reader, None)
+        if not encabezado:
+            return
+        
+        posiciones = {columna.strip().lower(): i for i, columna in enumerate(encabezado)}
+        indices = [(columna, posiciones.get(columna)) for columna in columnas]
+        
+        for numero, row in enumerate(reader, 2):
+            if not any(valor.strip() for valor in row):
+                continue
+            yield numero, {
+                columna: row[i].strip() if i is not None and i < len(row) else ''
+                for columna, i in indices
+            }
+
+
+@dataclass
+class ResultadoImportacion:
+    """Resultado de una importación: estudiantes aceptados y errores por fila"""
+    aceptados: List[Estudiante] = field(default_factory=list)
+    errores: List[Tuple[int, Dict[str, str], List[str]]] = field(default_factory=list)  # (fila, datos, mensajes)
+    archivo_aceptados: str = ""
+    archivo_errores: str = ""
+    
+    @property
+    def total(self) -> int:
+        """Filas leídas del archivo"""
+        return len(self.aceptados) + len(self.errores)
+
+
+def leer_filas_estudiantes(archivo: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Recorre el CSV de estudiantes a importar; las columnas que falten no pasan la validación"""
+    return _leer_filas(archivo, COLUMNAS)
+
+
+def validar_filas(filas: List[Dict[str, str]], procesos: int = 0) -> List[List[str]]:
+    """Valida cada fila con validar_estudiante_completo, en paralelo si procesos > 1"""
+    procesos = min(procesos, len(filas) // FILAS_MINIMAS_POR_PROCESO)
+    if procesos <= 1:
+        return [validar_estudiante_completo(fila) for fila in filas]
+    
+    # Trozos grandes: cada envío a otro proceso serializa las filas
+    tamano_trozo = max(1, len(filas) // (procesos * 4))
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        return list(ejecutor.map(validar_estudiante_completo, filas, chunksize=tamano_trozo))
+
+
+def _escribir_errores(archivo: str, columnas: List[str], errores: List[Tuple[int, Dict[str, str], List[str]]]):
+    """Escribe el reporte de errores: fila, datos leídos y mensajes"""
+    with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['fila'] + columnas + ['errores'])
+        writer.writerows(
+            [numero] + [datos[columna] for columna in columnas] + ['; '.join(mensajes)]
+            for numero, datos, mensajes in errores
+        )
+
+
+def escribir_reportes(resultado: ResultadoImportacion, directorio: str, nombre_base: str):
+    """Escribe <nombre_base>_aceptados.csv y <nombre_base>_errores.csv en directorio"""
+    resultado.archivo_aceptados = os.path.join(directorio, f"{nombre_base}_aceptados.csv")
+    with open(resultado.archivo_aceptados, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id'] + COLUMNAS)
+        writer.writerows(
+            (e.id, e.documento, e.nombres, e.apellidos, e.correo, e.fecha_nacimiento)
+            for e in resultado.aceptados
+        )
+    
+    resultado.archivo_errores = os.path.join(directorio, f"{nombre_base}_errores.csv")
+    _escribir_errores(resultado.archivo_errores, COLUMNAS, resultado.errores)
+
+
+def importar_estudiantes_csv(consultas, archivo: str, procesos: int = 0,
+                             directorio_reportes: str = None) -> ResultadoImportacion:
+    """Importa estudiantes nuevos desde un CSV y los agrega a ConsultasAcademicas.
+    
+    Cada fila se valida con validar_estudiante_completo (en procesos aparte si
+    procesos > 1) y se rechaza si su documento o correo ya existe, en el sistema
+    o en una fila anterior del mismo archivo. Los duplicados se detectan con los
+    índices hash de ConsultasAcademicas y conjuntos del lote, en una sola pasada.
+    
+    Los aceptados reciben IDs reservados en bloque y se agregan como un lote
+    (ConsultasAcademicas.agregar_estudiantes). Junto al archivo (o en
+    directorio_reportes) quedan el CSV de aceptados y el reporte de errores por fila.
+    """
+    numeros, filas = [], []
+    for numero, datos in leer_filas_estudiantes(archivo):
+        numeros.append(numero)
+        filas.append(datos)
+    
+    errores_validacion = validar_filas(filas, procesos)
+    
+    resultado = ResultadoImportacion()
+    documentos_lote, correos_lote = set(), set()
+    validas = []
+    for numero, datos, errores in zip(numeros, filas, errores_validacion):
+        documento = datos['documento']
+        correo = datos['correo'].lower()
+        if documento and (documento in documentos_lote or consultas.buscar_estudiante_por_documento(documento)):
+            errores.append(f"Ya existe un estudiante con documento {documento}")
+        if correo and (correo in correos_lote or consultas.buscar_estudiante_por_correo(correo)):
+            errores.append(f"Ya existe un estudiante con correo {datos['correo']}")
+        
+        if errores:
+            resultado.errores.append((numero, datos, errores))
+            continue
+        documentos_lote.add(documento)
+        correos_lote.add(correo)
+        validas.append(datos)
+    
+    ids = consultas.reservar_ids('estudiante', len(validas))
+    resultado.aceptados = [Estudiante(id=nuevo_id, **datos) for nuevo_id, datos in zip(ids, validas)]
+    consultas.agregar_estudiantes(resultado.aceptados)
+    
+    directorio = directorio_reportes or os.path.dirname(os.path.abspath(archivo))
+    nombre_base = os.path.splitext(os.path.basename(archivo))[0]
+    escribir_reportes(resultado, directorio, nombre_base)
+    return resultado
+
+
+@dataclass
+class ResultadoNotas:
+    """Resultado de una carga de notas: notas asignadas y filas no aplicadas"""
+    asignadas: List[Tuple[Matricula, float]] = field(default_factory=list)
+    errores: List[Tuple[int, Dict[str, str], List[str]]] = field(default_factory=list)  # (fila, datos, mensajes)
+    archivo_errores: str = ""
+
+
+def _resolver_matricula(consultas, datos: Dict[str, str]) -> Tuple[Optional[Matricula], str]:
+    """Matrícula de la fila por matricula_id o por (documento, curso_codigo); si no, el motivo"""
+    if datos['matricula_id']:
+        matricula = consultas.buscar_matricula_por_id(datos['matricula_id'])
+        return matricula, "" if matricula else f"No existe la matrícula {datos['matricula_id']}"
+    
+    if not datos['documento'] or not datos['curso_codigo']:
+        return None, "Falta matricula_id o documento y curso_codigo"
+    estudiante = consultas.buscar_estudiante_por_documento(datos['documento'])
+    if estudiante is None:
+        return None, f"No existe estudiante con documento {datos['documento']}"
+    for matricula in consultas.obtener_matriculas_de_estudiante(estudiante.id):
+        if matricula.curso_codigo == datos['curso_codigo']:
+            return matricula, ""
+    return None, f"El estudiante no está matriculado en {datos['curso_codigo']}"
+
+
+def cargar_notas_csv(consultas, archivo: str, directorio_reportes: str = None) -> ResultadoNotas:
+    """Carga una planilla de notas (CSV) y las asigna todas en una pasada.
+    
+    Cada fila identifica la matrícula por matricula_id o por documento y curso_codigo,
+    resueltos con los índices hash de ConsultasAcademicas. La nota se valida con
+    validar_nota; las filas con errores, o que repiten una matrícula ya cargada en el
+    archivo, no se aplican y quedan en <archivo>_errores.csv. Las demás se asignan
+    juntas con asignar_notas.
+    """
+    resultado = ResultadoNotas()
+    filas_por_matricula: Dict[int, int] = {}  # id(matricula) -> fila que la calificó
+    
+    for numero, datos in _leer_filas(archivo, COLUMNAS_NOTAS):
+        errores = []
+        try:
+            nota = float(datos['nota'])
+            if not validar_nota(nota):
+                errores.append("La nota debe estar entre 0.0 y 5.0")
+        except ValueError:
+            errores.append("La nota debe ser un número válido")
+        
+        matricula, motivo = _resolver_matricula(consultas, datos)
+        if motivo:
+            errores.append(motivo)
+        elif id(matricula) in filas_por_matricula:
+            errores.append(f"La matrícula {matricula.id} ya se calificó en la fila {filas_por_matricula[id(matricula)]}")
+        
+        if errores:
+            resultado.errores.append((numero, datos, errores))
+            continue
+        filas_por_matricula[id(matricula)] = numero
+        resultado.asignadas.append((matricula, nota))
+    
+    consultas.asignar_notas(resultado.asignadas)
+    
+    directorio = directorio_reportes or os.path.dirname(os.path.abspath(archivo))
+    nombre_base = os.path.splitext(os.path.basename(archivo))[0]
+    resultado.archivo_errores = os.path.join(directorio, f"{nombre_base}_errores.csv")
+    _escribir_errores(resultado.archivo_errores, COLUMNAS_NOTAS, resultado.errores)
+    return resultado
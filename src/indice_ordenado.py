@@ -0,0 +1,101 @@
+# src/indice_ordenado.py - Índice ordenado por una clave de texto, mantenido con bisect
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Cota superior para búsquedas: mayor que cualquier orden de llegada / carácter posible
+_MAXIMO_ORDEN = float('inf')
+_MAXIMO_CARACTER = '\U0010ffff'
+
+
+class IndiceOrdenado:
+    """Mantiene elementos ordenados por clave(elemento) para búsquedas en O(log n).
+    
+    Las claves se guardan como (clave, orden de llegada) en una lista paralela a la de
+    elementos: los duplicados quedan en el orden en que se agregaron, igual que con
+    un sorted() estable. Insertar y quitar cuestan O(log n) más el corrimiento de la lista.
+    """
+    
+    def __init__(self, clave: Callable[[object], str], elementos: Iterable[object] = ()):
+        self._clave = clave
+        self.reconstruir(elementos)
+    
+    def reconstruir(self, elementos: Iterable[object]):
+        """Rearma el índice ordenando todos los elementos una sola vez"""
+        pares = sorted(((self._clave(e), orden), e) for orden, e in enumerate(elementos))
+        self._claves: List[Tuple[str, float]] = [clave for clave, _ in pares]
+        self._elementos: List[object] = [e for _, e in pares]
+        self._clave_de: Dict[int, Tuple[str, float]] = {id(e): clave for clave, e in pares}
+        self._siguiente = len(self._claves)
+    
+    def __len__(self) -> int:
+        """Número de elementos indexados"""
+        return len(self._elementos)
+    
+    def __iter__(self) -> Iterator:
+        """Recorre los elementos en orden de clave"""
+        return iter(self._elementos)
+    
+    def _insertar(self, elemento: object, orden: int):
+        """Inserta el elemento en su posición según la clave actual"""
+        clave = (self._clave(elemento), orden)
+        posicion = bisect_left(self._claves, clave)
+        self._claves.insert(posicion, clave)
+        self._elementos.insert(posicion, elemento)
+        self._clave_de[id(elemento)] = clave
+    
+    def agregar(self, elemento: object):
+        """Agrega un elemento (queda después de los que tienen la misma clave)"""
+        self._insertar(elemento, self._siguiente)
+        self._siguiente += 1
+    
+    def agregar_varios(self, elementos: Iterable[object]):
+        """Agrega un lote de elementos: los ordena y los intercala una vez, en O(n + k log k)"""
+        nuevos = []
+        for elemento in elementos:
+            nuevos.append(((self._clave(elemento), self._siguiente), elemento))
+            self._siguiente += 1
+        nuevos.sort()
+        
+        pares = list(heapq.merge(zip(self._claves, self._elementos), nuevos))
+        self._claves = [clave for clave, _ in pares]
+        self._elementos = [e for _, e in pares]
+        self._clave_de.update((id(e), clave) for clave, e in nuevos)
+    
+    def quitar(self, elemento: object) -> Optional[Tuple[str, float]]:
+        """Quita un elemento; retorna la clave con la que estaba indexado"""
+        clave = self._clave_de.pop(id(elemento), None)
+        if clave is None:
+            return None
+        posicion = bisect_left(self._claves, clave)
+        del self._claves[posicion]
+        del self._elementos[posicion]
+        return clave
+    
+    def actualizar(self, elemento: object):
+        """Reubica un elemento cuya clave cambió, conservando su orden de llegada"""
+        clave = self.quitar(elemento)
+        if clave is not None:
+            self._insertar(elemento, clave[1])
+    
+    def primero(self, valor: str) -> Optional[object]:
+        """Primer elemento cuya clave es exactamente valor"""
+        posicion = bisect_left(self._claves, (valor,))
+        if posicion < len(self._claves) and self._claves[posicion][0] == valor:
+            return self._elementos[posicion]
+        return None
+    
+    def iguales(self, valor: str) -> List[object]:
+        """Todos los elementos cuya clave es exactamente valor"""
+        inicio = bisect_left(self._claves, (valor,))
+        return self._elementos[inicio:bisect_right(self._claves, (valor, _MAXIMO_ORDEN))]
+    
+    def con_prefijo(self, prefijo: str) -> List[object]:
+        """Elementos cuya clave empieza por prefijo"""
+        inicio = bisect_left(self._claves, (prefijo,))
+        return self._elementos[inicio:bisect_left(self._claves, (prefijo + _MAXIMO_CARACTER,))]
+    
+    def en_rango(self, desde: str, hasta: str) -> List[object]:
+        """Elementos con desde <= clave <= hasta"""
+        inicio = bisect_left(self._claves, (desde,))
+        return self._elementos[inicio:bisect_right(self._claves, (hasta, _MAXIMO_ORDEN))]
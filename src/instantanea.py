@@ -0,0 +1,174 @@
+# src/instantanea.py - Instantánea binaria de una tabla para arrancar sin leer CSV
+# Formato de las instantáneas (<tabla>.bin, junto al CSV de la tabla):
+#
+# - Encabezado de tamaño fijo: marca, versión, orden de bytes y la firma del CSV
+#   (tamaño, mtime en ns e inodo) del que la instantánea es copia.
+# - Uno o más segmentos marshal precedidos por su largo, cada uno con sus filas
+#   en columnas. Cada columna
+#   es una tabla de valores distintos más un arreglo de índices uint32, así que las
+#   cadenas repetidas (curso_codigo, fechas, estudiante_id) se leen una vez. Las
+#   columnas sin repetidos (los id) se guardan tal cual, sin índices.
+#
+# La instantánea solo se usa si la firma guardada coincide con la del CSV: si el
+# CSV cambió por otro camino, o la escritura se interrumpió entre el CSV y la
+# instantánea, se vuelve a leer el CSV. Los objetos se arman sin __post_init__:
+# sus datos ya se validaron al crearlos y marshal conserva el intern de las cadenas.
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import deque
+from itertools import repeat
+from typing import List, Optional, Tuple
+
+MARCA = b'MSIB'
+VERSION = 1
+ENCABEZADO = struct.Struct('<4sBBqqQ')  # marca, versión, little endian y firma del CSV
+LARGO = struct.Struct('<Q')  # bytes del segmento que sigue
+
+Firma = Tuple[int, int, int]
+
+
+def firma_de(archivo: str) -> Optional[Firma]:
+    """Tamaño, mtime (ns) e inodo de un archivo; None si no existe.
+    
+    Reescribir el CSV (temporal + rename) cambia el inodo aunque coincidan tamaño y hora.
+    """
+    try:
+        estado = os.stat(archivo)
+    except FileNotFoundError:
+        return None
+    return estado.st_size, estado.st_mtime_ns, estado.st_ino
+
+
+def _encabezado(firma: Firma) -> bytes:
+    """Encabezado de una instantánea copia del CSV con esa firma"""
+    return ENCABEZADO.pack(MARCA, VERSION, sys.byteorder == 'little', *firma)
+
+
+def _leer_encabezado(f) -> Optional[Tuple[bool, Firma]]:
+    """(little endian, firma del CSV) o None si el archivo no es una instantánea de esta versión"""
+    datos = f.read(ENCABEZADO.size)
+    if len(datos) != ENCABEZADO.size:
+        return None
+    marca, version, little, *firma = ENCABEZADO.unpack(datos)
+    if marca != MARCA or version != VERSION:
+        return None
+    return bool(little), tuple(firma)
+
+
+def _segmento(filas: List[tuple]) -> bytes:
+    """Codifica filas como (cantidad, [(valores distintos, índices uint32 o None), ...]) por columna, con su largo"""
+    columnas = []
+    for columna in zip(*filas):
+        valores = list(dict.fromkeys(columna))
+        if len(valores) == len(columna):
+            columnas.append((valores, None))
+            continue
+        posicion = {valor: i for i, valor in enumerate(valores)}
+        columnas.append((valores, array('I', map(posicion.__getitem__, columna)).tobytes()))
+    datos = marshal.dumps((len(filas), columnas))
+    return LARGO.pack(len(datos)) + datos
+
+
+def vigente(archivo: str, firma_csv: Optional[Firma]) -> bool:
+    """Indica si la instantánea existe y corresponde al CSV con esa firma"""
+    if firma_csv is None:
+        return False
+    try:
+        with open(archivo, 'rb') as f:
+            encabezado = _leer_encabezado(f)
+    except FileNotFoundError:
+        return False
+    return encabezado is not None and encabezado[1] == firma_csv
+
+
+def escribir(archivo: str, filas: List[tuple], firma_csv: Firma):
+    """Escribe la instantánea completa de una tabla (temporal, fsync y rename)"""
+    directorio = os.path.dirname(archivo) or '.'
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, prefix=f".{os.path.basename(archivo)}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(_encabezado(firma_csv))
+            f.write(_segmento(filas))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, archivo)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def anexar(archivo: str, filas: List[tuple], firma_csv: Firma):
+    """Agrega un segmento con filas nuevas y vuelve a firmar con el CSV ya anexado.
+    
+    El encabezado se reescribe solo después de sincronizar el segmento: si algo
+    falla antes, la firma vieja ya no coincide con el CSV y la instantánea se ignora.
+    """
+    with open(archivo, 'r+b') as f:
+        f.seek(0, os.SEEK_END)
+        f.write(_segmento(filas))
+        f.flush()
+        os.fsync(f.fileno())
+        f.seek(0)
+        f.write(_encabezado(firma_csv))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def leer(archivo: str, firma_csv: Optional[Firma], clase, campos: List[str]) -> Optional[list]:
+    """Lee la instantánea y arma los objetos de clase; None si falta, está dañada o no es del CSV actual"""
+    if firma_csv is None:
+        return None
+    try:
+        with open(archivo, 'rb') as f:
+            encabezado = _leer_encabezado(f)
+            if encabezado is None or encabezado[1] != firma_csv:
+                return None
+            misma_plataforma = encabezado[0] == (sys.byteorder == 'little')
+            # marshal.loads sobre el contenido completo es mucho más rápido que marshal.load(f)
+            contenido = memoryview(f.read())
+        
+        columnas = [[] for _ in campos]
+        cantidad = 0
+        posicion = 0
+        while posicion < len(contenido):
+            largo, = LARGO.unpack_from(contenido, posicion)
+            posicion += LARGO.size
+            if posicion + largo > len(contenido):
+                raise EOFError("segmento incompleto")
+            filas, segmento = marshal.loads(contenido[posicion:posicion + largo])
+            posicion += largo
+            cantidad += filas
+            for columna, (valores, crudos) in zip(columnas, segmento):
+                if crudos is None:
+                    columna.extend(valores)
+                    continue
+                indices = array('I')
+                indices.frombytes(crudos)
+                if not misma_plataforma:
+                    indices.byteswap()
+                columna.extend(map(valores.__getitem__, indices))
+    except (FileNotFoundError, EOFError, ValueError, TypeError, struct.error) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Instantánea {os.path.basename(archivo)} dañada, se leerá el CSV: {e}")
+        return None
+    
+    if any(len(columna) != cantidad for columna in columnas):
+        return None
+    return armar_objetos(clase, campos, columnas, cantidad)
+
+
+def armar_objetos(clase, campos: List[str], columnas: List[list], cantidad: int) -> list:
+    """Arma cantidad objetos de clase (con __slots__) a partir de sus columnas de valores.
+    
+    Los objetos se crean sin __init__ ni __post_init__: cada columna se asigna con
+    el descriptor del slot. Solo para datos que ya se validaron al guardarlos.
+    """
+    objetos = list(map(clase.__new__, repeat(clase, cantidad)))
+    for campo, columna in zip(campos, columnas):
+        deque(map(getattr(clase, campo).__set__, objetos, columna), maxlen=0)
+    return objetos
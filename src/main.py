@@ -1,41 +1,143 @@
 # src/main.py - Versión actualizada con todas las funcionalidades
-from src.persistencia import PersistenciaCSV
+import os
+from src.persistencia import PersistenciaCSV, PersistenciaSQLite
+from src.bitacora import BitacoraOperaciones
+from src.consultas import ConsultasAcademicas
 from src.ui import InterfazUsuario
 
+def crear_persistencia(motor: str = None):
+    """Selecciona el motor de persistencia: 'csv' (por defecto) o 'sqlite'.
+    
+    Si no se indica, se toma de la variable de entorno MINISIGA_PERSISTENCIA.
+    Con MINISIGA_SEGUNDO_PLANO=1 los CSV se escriben en un hilo aparte.
+    Con MINISIGA_CONFIAR_CSV=1 los CSV se cargan sin limpiar espacios (archivos propios).
+    Por defecto cada tabla (CSV o SQLite) se lee la primera vez que se usa; con
+    MINISIGA_CARGA_PEREZOSA=0 se leen todas al iniciar. Con MINISIGA_MATRICULAS_MMAP=1
+    las matrículas se guardan en registros de ancho fijo (datos/matriculas.dat) y cada
+    nota se escribe en su lugar.
+    """
+    if motor is None:
+        motor = os.environ.get("MINISIGA_PERSISTENCIA", "csv")
+    motor = motor.strip().lower()
+    
+    perezosa = os.environ.get("MINISIGA_CARGA_PEREZOSA", "1").strip() != "0"
+    if motor == "sqlite":
+        persistencia = PersistenciaSQLite(perezosa=perezosa)
+        if persistencia.esta_vacia():
+            # Primera ejecución con SQLite: importar los CSV existentes
+            persistencia.importar_desde(PersistenciaCSV(persistencia.base_path))
+        return persistencia
+    
+    if motor != "csv":
+        print(f"⚠️  Motor de persistencia desconocido '{motor}', se usará CSV")
+    segundo_plano = os.environ.get("MINISIGA_SEGUNDO_PLANO", "0").strip() == "1"
+    confiar = os.environ.get("MINISIGA_CONFIAR_CSV", "0").strip() == "1"
+    matriculas_mmap = os.environ.get("MINISIGA_MATRICULAS_MMAP", "0").strip() == "1"
+    return PersistenciaCSV(segundo_plano=segundo_plano, confiar=confiar, perezosa=perezosa,
+                           matriculas_mmap=matriculas_mmap)
+
+def leer_opcion(bitacora: BitacoraOperaciones) -> str:
+    """Pide una opción del menú; antes sincroniza con disco las operaciones pendientes.
+    
+    La bitácora sincroniza por lotes al registrar: sin esto, las últimas
+    operaciones quedarían sin fsync mientras el programa espera al usuario.
+    """
+    bitacora.sincronizar()
+    return input("Seleccione una opción: ").strip()
+
+def guardar_datos(persistencia, ui: InterfazUsuario, esperar: bool = False):
+    """Guarda únicamente las tablas modificadas durante la sesión y vacía la bitácora.
+    
+    Con escritura en segundo plano el menú no espera a que termine: el segmento
+    apartado de la bitácora se borra cuando la escritura termina bien, y un error
+    se informa en el siguiente guardado, que vuelve a escribir esas tablas. Con
+    esperar=True (al salir) se espera la escritura y se informa su resultado.
+    """
+    consultas = ui.consultas
+    bitacora = consultas.bitacora
+    # Un guardado anterior en segundo plano pudo fallar: sus tablas vuelven a quedar pendientes
+    error = persistencia.confirmar_guardado(consultas)
+    if error is not None:
+        print(f"❌ El guardado anterior falló ({error}); se intentará de nuevo.")
+    
+    tablas = None
+    if not consultas.cambios.hay_cambios():
+        # Solo los contadores de IDs, si cambiaron
+        persistencia.guardar_repositorio(consultas)
+        print("No hay cambios pendientes por guardar.")
+    else:
+        print("Guardando datos...")
+        if bitacora is not None:
+            # Las operaciones nuevas van a otro segmento mientras se escribe este
+            bitacora.iniciar_compactacion()
+        
+        try:
+            tablas = persistencia.guardar_repositorio(consultas)
+        except Exception as e:
+            # El segmento apartado se conserva: la bitácora sigue cubriendo los cambios no guardados
+            consultas.cambios.marcar_todo()
+            consultas.ids.modificado = True
+            print(f"❌ No se pudieron guardar los datos: {e}")
+            print("Los cambios siguen pendientes; se intentará guardarlos de nuevo.")
+            return
+        
+        # El segmento apartado se borra solo cuando los datos ya están en disco
+        if bitacora is not None:
+            persistencia.al_terminar_escrituras(bitacora.finalizar_compactacion)
+    
+    if esperar:
+        error = persistencia.confirmar_guardado(consultas)
+        if error is not None:
+            print(f"❌ No se pudieron guardar los datos: {error}")
+            return
+    if tablas is not None:
+        if persistencia.segundo_plano and not esperar:
+            print(f"Guardando en segundo plano: {', '.join(tablas)}")
+        else:
+            print(f"¡Datos guardados exitosamente! ({', '.join(tablas)})")
+
 def main():
     """Función principal del sistema MiniSIGA"""
     
     print("Iniciando MiniSIGA...")
     
     # Inicializar persistencia
-    persistencia = PersistenciaCSV()
+    persistencia = crear_persistencia()
     
-    # Cargar datos desde archivos CSV
+    # Cargar datos desde el motor de persistencia (con los contadores de IDs guardados)
     print("Cargando datos...")
-    estudiantes = persistencia.cargar_estudiantes()
-    cursos = persistencia.cargar_cursos()
-    inscripciones = persistencia.cargar_inscripciones()
-    matriculas = persistencia.cargar_matriculas()
+    consultas = persistencia.cargar_repositorio(ConsultasAcademicas)
     
-    print(f"Datos cargados: {len(estudiantes)} estudiantes, {len(cursos)} cursos, {len(inscripciones)} inscripciones, {len(matriculas)} matrículas")
+    if persistencia.perezosa:
+        # Contar los registros obligaría a leer todas las tablas
+        print("Datos listos: cada tabla se leerá la primera vez que se use")
+    else:
+        print(f"Datos cargados: {len(consultas.estudiantes)} estudiantes, {len(consultas.cursos)} cursos, {len(consultas.inscripciones)} inscripciones, {len(consultas.matriculas)} matrículas")
     
     # Inicializar interfaz de usuario
-    ui = InterfazUsuario(estudiantes, cursos, inscripciones, matriculas)
+    ui = InterfazUsuario(consultas)
+    
+    # Recuperar operaciones de una sesión anterior que no alcanzó a guardar
+    bitacora = BitacoraOperaciones(persistencia.base_path)
+    recuperadas = bitacora.reproducir(ui.consultas)
+    if recuperadas:
+        print(f"♻️  Se recuperaron {recuperadas} operaciones no guardadas de la sesión anterior")
+    ui.consultas.bitacora = bitacora
     
     # Loop principal del programa
     while True:
         try:
+            # Compactación periódica: pasar la bitácora a los archivos de datos
+            if bitacora.requiere_compactacion():
+                guardar_datos(persistencia, ui)
+            
             ui.mostrar_menu_principal()
-            opcion = input("Seleccione una opción: ").strip()
+            opcion = leer_opcion(bitacora)
             
             if opcion == "0":
                 # Guardar datos antes de salir
-                print("Guardando datos...")
-                persistencia.guardar_estudiantes(estudiantes)
-                persistencia.guardar_cursos(cursos)
-                persistencia.guardar_inscripciones(inscripciones)
-                persistencia.guardar_matriculas(matriculas)
-                print("¡Datos guardados exitosamente!")
+                guardar_datos(persistencia, ui, esperar=True)
+                bitacora.cerrar()
                 print("¡Gracias por usar MiniSIGA!")
                 break
             
@@ -43,7 +145,7 @@ def main():
                 # Menú de estudiantes
                 while True:
                     ui.mostrar_menu_estudiantes()
-                    sub_opcion = input("Seleccione una opción: ").strip()
+                    sub_opcion = leer_opcion(bitacora)
                     
                     if sub_opcion == "0":
                         break
@@ -55,6 +157,8 @@ def main():
                         ui.eliminar_estudiante()
                     elif sub_opcion == "4":
                         ui.listar_estudiantes()
+                    elif sub_opcion == "5":
+                        ui.importar_estudiantes()
                     else:
                         print("❌ Opción no válida")
             
@@ -62,7 +166,7 @@ def main():
                 # Menú de cursos
                 while True:
                     ui.mostrar_menu_cursos()
-                    sub_opcion = input("Seleccione una opción: ").strip()
+                    sub_opcion = leer_opcion(bitacora)
                     
                     if sub_opcion == "0":
                         break
@@ -81,7 +185,7 @@ def main():
                 # Menú de inscripciones
                 while True:
                     ui.mostrar_menu_inscripciones()
-                    sub_opcion = input("Seleccione una opción: ").strip()
+                    sub_opcion = leer_opcion(bitacora)
                     
                     if sub_opcion == "0":
                         break
@@ -102,7 +206,7 @@ def main():
                 # Menú de matrículas
                 while True:
                     ui.mostrar_menu_matriculas()
-                    sub_opcion = input("Seleccione una opción: ").strip()
+                    sub_opcion = leer_opcion(bitacora)
                     
                     if sub_opcion == "0":
                         break
@@ -114,6 +218,10 @@ def main():
                         ui.eliminar_matricula()
                     elif sub_opcion == "4":
                         ui.listar_matriculas()
+                    elif sub_opcion == "5":
+                        ui.matricular_todas_pendientes()
+                    elif sub_opcion == "6":
+                        ui.cargar_notas()
                     else:
                         print("❌ Opción no válida")
             
@@ -121,7 +229,7 @@ def main():
                 # Menú de consultas y reportes
                 while True:
                     ui.mostrar_menu_consultas()
-                    sub_opcion = input("Seleccione una opción: ").strip()
+                    sub_opcion = leer_opcion(bitacora)
                     
                     if sub_opcion == "0":
                         break
@@ -141,13 +249,20 @@ def main():
                         ui.ejecutar_consulta_dominios_correo()
                     elif sub_opcion == "8":
                         ui.ejecutar_busqueda_binaria_apellido()
+                    elif sub_opcion == "9":
+                        ui.ejecutar_consulta_estadisticas_cursos()
+                    elif sub_opcion == "10":
+                        ui.ejecutar_consulta_top_todos_los_cursos()
+                    elif sub_opcion == "11":
+                        ui.ejecutar_busqueda_estudiantes()
                     else:
                         print("❌ Opción no válida")
             
             elif opcion == "6":
                 # Exportar a JSON
                 try:
-                    archivo = persistencia.exportar_json(estudiantes, cursos, inscripciones, matriculas)
+                    archivo = persistencia.exportar_json(consultas.estudiantes, consultas.cursos,
+                                                         consultas.inscripciones, consultas.matriculas)
                     print(f"✅ Datos exportados exitosamente a: {archivo}")
                 except Exception as e:
                     print(f"❌ Error al exportar: {e}")
@@ -158,12 +273,8 @@ def main():
         except KeyboardInterrupt:
             print("\n\nInterrumpido por el usuario.")
             # Guardar datos antes de salir
-            print("Guardando datos...")
-            persistencia.guardar_estudiantes(estudiantes)
-            persistencia.guardar_cursos(cursos)
-            persistencia.guardar_inscripciones(inscripciones)
-            persistencia.guardar_matriculas(matriculas)
-            print("¡Datos guardados exitosamente!")
+            guardar_datos(persistencia, ui, esperar=True)
+            bitacora.cerrar()
             break
         except Exception as e:
             print(f"❌ Error inesperado: {e}")
@@ -1,8 +1,12 @@
 # src/modelos.py - Versión actualizada con modelo de Inscripción
+import sys
 from dataclasses import dataclass
 from typing import  Optional
 
-@dataclass
+# Los modelos usan __slots__ (sin __dict__ por instancia) y comparten en memoria las
+# cadenas que se repiten entre filas (estudiante_id, curso_codigo, fechas) con sys.intern.
+
+@dataclass(slots=True)
 class Estudiante:
     """Modelo para representar un estudiante"""
     id: str
@@ -20,7 +24,7 @@ class Estudiante:
     def nombre_completo(self) -> str:
         return f"{self.nombres} {self.apellidos}"
 
-@dataclass
+@dataclass(slots=True)
 class Curso:
     """Modelo para representar un curso"""
     codigo: str
@@ -34,7 +38,7 @@ class Curso:
         if self.creditos <= 0:
             raise ValueError("Los créditos deben ser un número positivo")
 
-@dataclass
+@dataclass(slots=True)
 class Inscripcion:
     """Modelo para representar una inscripción (estudiante se inscribe a un curso)"""
     id: str
@@ -45,8 +49,11 @@ class Inscripcion:
     def __post_init__(self):
         if not self.id or not self.estudiante_id or not self.curso_codigo:
             raise ValueError("ID, estudiante_id y curso_codigo son obligatorios")
+        self.estudiante_id = sys.intern(self.estudiante_id)
+        self.curso_codigo = sys.intern(self.curso_codigo)
+        self.fecha_inscripcion = sys.intern(self.fecha_inscripcion)
 
-@dataclass
+@dataclass(slots=True)
 class Matricula:
     """Modelo para representar una matrícula (inscripción + nota asignada)"""
     id: str
@@ -59,6 +66,9 @@ class Matricula:
     def __post_init__(self):
         if not self.id or not self.inscripcion_id or not self.estudiante_id or not self.curso_codigo:
             raise ValueError("ID, inscripcion_id, estudiante_id y curso_codigo son obligatorios")
+        self.estudiante_id = sys.intern(self.estudiante_id)
+        self.curso_codigo = sys.intern(self.curso_codigo)
+        self.fecha_matricula = sys.intern(self.fecha_matricula)
     
     @classmethod
     def from_inscripcion(cls, inscripcion: Inscripcion, matricula_id: str = None):
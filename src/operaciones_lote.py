@@ -0,0 +1,92 @@
+# src/operaciones_lote.py - Operaciones masivas sobre inscripciones y matrículas
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.modelos import Inscripcion, Matricula
+
+
+@dataclass
+class ResultadoInscripciones:
+    """Resultado de una inscripción por lotes: inscripciones creadas y solicitudes rechazadas"""
+    aceptadas: List[Inscripcion] = field(default_factory=list)
+    rechazos: List[Tuple[str, str, str]] = field(default_factory=list)  # (estudiante_id, curso_codigo, motivo)
+
+
+def inscribir_en_lote(consultas, solicitudes: Iterable[Tuple[str, str]], limite_creditos: int = 20,
+                      fecha: str = None) -> ResultadoInscripciones:
+    """Inscribe un lote de pares (estudiante_id, curso_codigo) con las reglas de puede_inscribirse_curso.
+    
+    Las solicitudes se evalúan en orden contra los índices de ConsultasAcademicas y
+    contra las ya aceptadas del mismo lote: estudiante y curso deben existir, el
+    estudiante no puede estar ya inscrito en el curso y el total de créditos no
+    puede pasar del límite. Cada solicitud cuesta O(1).
+    
+    Las aceptadas reciben IDs reservados en bloque y se agregan juntas con
+    agregar_inscripciones (una sola operación en la bitácora).
+    """
+    fecha = fecha or datetime.now().strftime('%Y-%m-%d')
+    resultado = ResultadoInscripciones()
+    
+    # Créditos y cursos de cada estudiante, copiados la primera vez que aparece en el lote
+    creditos: Dict[str, int] = {}
+    cursos_inscritos: Dict[str, Set[str]] = {}
+    aceptadas: List[Tuple[str, str]] = []
+    
+    for estudiante_id, curso_codigo in solicitudes:
+        if consultas.buscar_estudiante_por_id(estudiante_id) is None:
+            resultado.rechazos.append((estudiante_id, curso_codigo, "Estudiante no encontrado"))
+            continue
+        curso = consultas.buscar_curso_por_codigo(curso_codigo)
+        if curso is None:
+            resultado.rechazos.append((estudiante_id, curso_codigo, "Curso no encontrado"))
+            continue
+        
+        inscritos = cursos_inscritos.get(estudiante_id)
+        if inscritos is None:
+            inscritos = cursos_inscritos[estudiante_id] = {
+                inscripcion.curso_codigo
+                for inscripcion in consultas.obtener_inscripciones_de_estudiante(estudiante_id)
+            }
+            creditos[estudiante_id] = consultas.obtener_creditos_inscritos_por_estudiante(estudiante_id)
+        
+        if curso_codigo in inscritos:
+            resultado.rechazos.append((estudiante_id, curso_codigo, "El estudiante ya está inscrito en este curso"))
+            continue
+        if creditos[estudiante_id] + curso.creditos > limite_creditos:
+            resultado.rechazos.append((
+                estudiante_id, curso_codigo,
+                f"Excede el límite de créditos. Disponibles: {limite_creditos - creditos[estudiante_id]}, "
+                f"Necesarios: {curso.creditos}"
+            ))
+            continue
+        
+        inscritos.add(curso_codigo)
+        creditos[estudiante_id] += curso.creditos
+        aceptadas.append((estudiante_id, curso_codigo))
+    
+    ids = consultas.reservar_ids('inscripcion', len(aceptadas))
+    resultado.aceptadas = [
+        Inscripcion(nuevo_id, estudiante_id, curso_codigo, fecha)
+        for nuevo_id, (estudiante_id, curso_codigo) in zip(ids, aceptadas)
+    ]
+    consultas.agregar_inscripciones(resultado.aceptadas)
+    return resultado
+
+
+def matricular_pendientes(consultas, curso_codigo: Optional[str] = None, desde: Optional[str] = None,
+                          hasta: Optional[str] = None) -> List[Matricula]:
+    """Convierte en matrícula todas las inscripciones pendientes y retorna las matrículas creadas.
+    
+    Las pendientes salen de un solo anti-join (obtener_inscripciones_sin_matricular),
+    con los mismos filtros opcionales por curso y rango de fechas de inscripción.
+    Los IDs se reservan en bloque y las matrículas se agregan juntas con
+    agregar_matriculas (una sola operación en la bitácora).
+    """
+    pendientes = consultas.obtener_inscripciones_sin_matricular(curso_codigo, desde, hasta)
+    ids = consultas.reservar_ids('matricula', len(pendientes))
+    matriculas = [
+        Matricula.from_inscripcion(inscripcion, nuevo_id)
+        for nuevo_id, (inscripcion, _, _) in zip(ids, pendientes)
+    ]
+    consultas.agregar_matriculas(matriculas)
+    return matriculas
@@ -1,255 +1,912 @@
 # src/persistencia.py - Versión actualizada con manejo de inscripciones
 import csv
+import gc
 import json
 import os
-from typing import List
+import sqlite3
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, starmap
+from operator import attrgetter, itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+from src.cambios import RegistroCambios
+from src.repositorio import RepositorioAcademico
+from src.almacen_matriculas import AlmacenMatriculas
+from src import instantanea
+
+class ColeccionPerezosa(list):
+    """Lista que lee su tabla la primera vez que se usa.
+    
+    Es una list de verdad, compartida como cualquier otra colección: cada método
+    de lectura o escritura carga primero los datos (una sola vez) y luego delega
+    en list. Mientras nadie la toque, el archivo no se lee.
+    """
+    
+    def __init__(self, cargar):
+        super().__init__()
+        self._cargar = cargar
+    
+    @property
+    def cargada(self) -> bool:
+        """Indica si la tabla ya se leyó"""
+        return self._cargar is None
+    
+    def _asegurar_carga(self):
+        """Lee la tabla si todavía no se leyó"""
+        if self._cargar is not None:
+            cargar, self._cargar = self._cargar, None
+            list.extend(self, cargar())
+
+
+def _con_carga(nombre: str):
+    """Envuelve el método nombre de list para que cargue la colección antes de usarla"""
+    metodo = getattr(list, nombre)
+    
+    def envoltura(self, *args, **kwargs):
+        self._asegurar_carga()
+        return metodo(self, *args, **kwargs)
+    
+    envoltura.__name__ = nombre
+    envoltura.__doc__ = metodo.__doc__
+    return envoltura
+
+
+for _nombre in ('__len__', '__iter__', '__reversed__', '__contains__', '__getitem__', '__setitem__',
+                '__delitem__', '__eq__', '__ne__', '__lt__', '__le__', '__gt__', '__ge__', '__add__',
+                '__iadd__', '__mul__', '__imul__', '__repr__', 'append', 'extend', 'insert', 'remove',
+                'pop', 'index', 'count', 'copy', 'clear', 'reverse', 'sort'):
+    setattr(ColeccionPerezosa, _nombre, _con_carga(_nombre))
+
 
 class PersistenciaCSV:
-    """Maneja la persistencia de datos en archivos CSV"""
+    """Maneja la persistencia de datos en archivos CSV.
+    
+    Con confiar=True se asume que los archivos fueron escritos por la propia
+    aplicación (ya validados): la carga omite la limpieza de espacios de cada
+    campo y arma los objetos sin __post_init__, por bloques de filas, como la
+    instantánea (ver instantanea.armar_objetos).
+    Con perezosa=True, cargar_repositorio no lee ningún archivo: cada tabla se
+    lee la primera vez que se usa (ver ColeccionPerezosa) y los índices se arman
+    en la primera consulta. Con instantaneas=True (por defecto) cada CSV guardado
+    lleva al lado una instantánea binaria que se prefiere al cargar mientras
+    corresponda al CSV (ver src/instantanea.py).
+    
+    Con matriculas_mmap=True las matrículas se guardan en un AlmacenMatriculas
+    (registros de ancho fijo, ver src/almacen_matriculas.py) en vez de
+    matriculas.csv: al guardar, las notas cambiadas se escriben en su registro sin
+    reescribir la tabla. La primera vez el almacén se llena desde matriculas.csv, que desde
+    entonces deja de actualizarse; si después se carga sin matriculas_mmap (o se
+    importa a SQLite), las matrículas del almacén vuelven a matriculas.csv y el
+    almacén se borra.
+    """
     
-    def __init__(self, base_path: str = "datos"):
+    # Archivo y columnas de cada tabla
+    ARCHIVOS = {
+        'estudiantes': ('estudiantes.csv', ['id', 'documento', 'nombres', 'apellidos', 'correo', 'fecha_nacimiento']),
+        'cursos': ('cursos.csv', ['codigo', 'nombre', 'creditos', 'docente']),
+        'inscripciones': ('inscripciones.csv', ['id', 'estudiante_id', 'curso_codigo', 'fecha_inscripcion']),
+        'matriculas': ('matriculas.csv', ['id', 'inscripcion_id', 'estudiante_id', 'curso_codigo', 'fecha_matricula', 'nota']),
+    }
+    # Marcas de los contadores de IDs (ver src/identificadores.py)
+    ARCHIVO_CONTADORES = 'contadores.json'
+    # Modelo de cada tabla, para armar los objetos desde la instantánea
+    MODELOS = {'estudiantes': Estudiante, 'cursos': Curso, 'inscripciones': Inscripcion, 'matriculas': Matricula}
+    # Campos que __post_init__ comparte con sys.intern; el modo confiable los comparte igual
+    CAMPOS_COMPARTIDOS = {'estudiante_id', 'curso_codigo', 'fecha_inscripcion', 'fecha_matricula'}
+    # Filas por bloque al armar objetos en modo confiable (acota la memoria de los iter_*)
+    FILAS_POR_BLOQUE = 10_000
+    
+    def __init__(self, base_path: str = "datos", segundo_plano: bool = False, confiar: bool = False,
+                 perezosa: bool = False, instantaneas: bool = True, matriculas_mmap: bool = False):
         self.base_path = base_path
+        self.confiar = confiar
+        self.perezosa = perezosa
+        self.instantaneas = instantaneas
+        self.almacen = AlmacenMatriculas(base_path) if matriculas_mmap else None
         self.crear_directorio()
+        
+        # Escritura en segundo plano: un único hilo escritor mantiene el orden
+        self.segundo_plano = segundo_plano
+        self._ejecutor = None
+        self._pendientes = []
+        self._error_segundo_plano = None
+        self._en_curso = None  # (cambios, tablas) del último guardado en segundo plano
     
     def crear_directorio(self):
         """Crea el directorio de datos si no existe"""
         if not os.path.exists(self.base_path):
             os.makedirs(self.base_path)
     
-    def cargar_estudiantes(self) -> List[Estudiante]:
-        """Carga estudiantes desde CSV"""
-        archivo = os.path.join(self.base_path, "estudiantes.csv")
-        estudiantes = []
-        
-        if not os.path.exists(archivo):
-            return estudiantes
+    def _cargar_lista(self, iterador, nombre: str) -> list:
+        """Materializa un iterador de carga; ante un error conserva lo leído hasta ese punto.
         
+        El recolector de basura se pausa mientras tanto: crear millones de objetos
+        que sobreviven dispara recolecciones que no liberan nada.
+        """
+        elementos = []
+        gc_activo = gc.isenabled()
+        gc.disable()
         try:
-            with open(archivo, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    estudiante = Estudiante(
-                        id=row['id'].strip(),
-                        documento=row['documento'].strip(),
-                        nombres=row['nombres'].strip(),
-                        apellidos=row['apellidos'].strip(),
-                        correo=row['correo'].strip(),
-                        fecha_nacimiento=row['fecha_nacimiento'].strip()
-                    )
-                    estudiantes.append(estudiante)
+            for elemento in iterador:
+                elementos.append(elemento)
         except Exception as e:
-            print(f"Error cargando estudiantes: {e}")
+            print(f"Error cargando {nombre}: {e}")
+        finally:
+            if gc_activo:
+                gc.enable()
+        return elementos
+    
+    def _archivo(self, tabla: str) -> str:
+        """Ruta del CSV de una tabla"""
+        return os.path.join(self.base_path, self.ARCHIVOS[tabla][0])
+    
+    def _archivo_instantanea(self, tabla: str) -> str:
+        """Ruta de la instantánea binaria de una tabla (junto a su CSV)"""
+        return os.path.splitext(self._archivo(tabla))[0] + '.bin'
+    
+    def _cargar_tabla(self, tabla: str, iterador, nombre: str) -> list:
+        """Carga una tabla desde su instantánea si corresponde al CSV actual; si no, desde el CSV"""
+        if self.instantaneas:
+            _, campos = self.ARCHIVOS[tabla]
+            gc_activo = gc.isenabled()
+            gc.disable()
+            try:
+                elementos = instantanea.leer(self._archivo_instantanea(tabla), instantanea.firma_de(self._archivo(tabla)),
+                                             self.MODELOS[tabla], campos)
+            finally:
+                if gc_activo:
+                    gc.enable()
+            if elementos is not None:
+                return elementos
+        return self._cargar_lista(iterador(), nombre)
+    
+    def _leer_filas(self, tabla: str) -> Iterator[tuple]:
+        """Lee las filas del CSV con csv.reader, con los valores en el orden de ARCHIVOS.
+        
+        El encabezado se traduce a posiciones una sola vez, así que las columnas
+        pueden venir en cualquier orden; las que falten se leen como cadena vacía.
+        Una fila más corta que el encabezado se completa con cadenas vacías y una
+        más larga se recorta, antes de tomar los valores por posición.
+        """
+        nombre_archivo, columnas = self.ARCHIVOS[tabla]
+        archivo = os.path.join(self.base_path, nombre_archivo)
+        
+        if not os.path.exists(archivo):
+            return
         
-        return estudiantes
+        with open(archivo, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            encabezado = next(reader, None)
+            if not encabezado:
+                return
+            
+            ancho = len(encabezado)
+            posiciones = {columna.strip(): i for i, columna in enumerate(encabezado)}
+            # Las columnas ausentes apuntan a un campo vacío agregado después del último del encabezado
+            relleno = [''] if any(columna not in posiciones for columna in columnas) else []
+            obtener = itemgetter(*(posiciones.get(columna, ancho) for columna in columnas))
+            
+            for row in reader:
+                if not row:
+                    continue
+                if relleno or len(row) != ancho:
+                    row = row[:ancho] + [''] * (ancho - len(row)) + relleno
+                valores = obtener(row)
+                if self.confiar:
+                    yield valores
+                else:
+                    yield tuple(valor.strip() for valor in valores)
+    
+    def _armar(self, tabla: str, filas: Iterable[tuple]) -> Iterator:
+        """Arma los objetos de la tabla a partir de filas con los valores en el orden de ARCHIVOS.
+        
+        En modo confiable se arman por bloques sin __init__ ni __post_init__
+        (instantanea.armar_objetos); si no, cada fila pasa por las validaciones del modelo.
+        """
+        clase = self.MODELOS[tabla]
+        if not self.confiar:
+            yield from starmap(clase, filas)
+            return
+        
+        _, campos = self.ARCHIVOS[tabla]
+        filas = iter(filas)
+        while True:
+            bloque = list(islice(filas, self.FILAS_POR_BLOQUE))
+            if not bloque:
+                return
+            columnas = [list(map(sys.intern, columna)) if campo in self.CAMPOS_COMPARTIDOS else list(columna)
+                        for campo, columna in zip(campos, zip(*bloque))]
+            yield from instantanea.armar_objetos(clase, campos, columnas, len(bloque))
+    
+    def cargar_estudiantes(self) -> List[Estudiante]:
+        """Carga estudiantes desde CSV"""
+        return self._cargar_tabla('estudiantes', self.iter_estudiantes, "estudiantes")
+    
+    def iter_estudiantes(self) -> Iterator[Estudiante]:
+        """Recorre los estudiantes del CSV uno a uno, sin cargarlos todos en memoria"""
+        return self._armar('estudiantes', self._leer_filas('estudiantes'))
     
     def guardar_estudiantes(self, estudiantes: List[Estudiante]):
         """Guarda estudiantes en CSV"""
-        archivo = os.path.join(self.base_path, "estudiantes.csv")
-        
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            if estudiantes:
-                fieldnames = ['id', 'documento', 'nombres', 'apellidos', 'correo', 'fecha_nacimiento']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for estudiante in estudiantes:
-                    writer.writerow({
-                        'id': estudiante.id,
-                        'documento': estudiante.documento,
-                        'nombres': estudiante.nombres,
-                        'apellidos': estudiante.apellidos,
-                        'correo': estudiante.correo,
-                        'fecha_nacimiento': estudiante.fecha_nacimiento
-                    })
+        self._guardar_tabla('estudiantes', estudiantes)
     
     def cargar_cursos(self) -> List[Curso]:
         """Carga cursos desde CSV"""
-        archivo = os.path.join(self.base_path, "cursos.csv")
-        cursos = []
-        
-        if not os.path.exists(archivo):
-            return cursos
-        
-        try:
-            with open(archivo, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    curso = Curso(
-                        codigo=row['codigo'].strip(),
-                        nombre=row['nombre'].strip(),
-                        creditos=int(row['creditos']),
-                        docente=row['docente'].strip()
-                    )
-                    cursos.append(curso)
-        except Exception as e:
-            print(f"Error cargando cursos: {e}")
-        
-        return cursos
+        return self._cargar_tabla('cursos', self.iter_cursos, "cursos")
+    
+    def iter_cursos(self) -> Iterator[Curso]:
+        """Recorre los cursos del CSV uno a uno, sin cargarlos todos en memoria"""
+        filas = ((codigo, nombre, int(creditos), docente)
+                 for codigo, nombre, creditos, docente in self._leer_filas('cursos'))
+        return self._armar('cursos', filas)
     
     def guardar_cursos(self, cursos: List[Curso]):
         """Guarda cursos en CSV"""
-        archivo = os.path.join(self.base_path, "cursos.csv")
-        
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            if cursos:
-                fieldnames = ['codigo', 'nombre', 'creditos', 'docente']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for curso in cursos:
-                    writer.writerow({
-                        'codigo': curso.codigo,
-                        'nombre': curso.nombre,
-                        'creditos': curso.creditos,
-                        'docente': curso.docente
-                    })
+        self._guardar_tabla('cursos', cursos)
     
     def cargar_inscripciones(self) -> List[Inscripcion]:
         """Carga inscripciones desde CSV"""
-        archivo = os.path.join(self.base_path, "inscripciones.csv")
-        inscripciones = []
-        
-        if not os.path.exists(archivo):
-            return inscripciones
-        
-        try:
-            with open(archivo, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    inscripcion = Inscripcion(
-                        id=row['id'].strip(),
-                        estudiante_id=row['estudiante_id'].strip(),
-                        curso_codigo=row['curso_codigo'].strip(),
-                        fecha_inscripcion=row['fecha_inscripcion'].strip()
-                    )
-                    inscripciones.append(inscripcion)
-        except Exception as e:
-            print(f"Error cargando inscripciones: {e}")
-        
-        return inscripciones
+        return self._cargar_tabla('inscripciones', self.iter_inscripciones, "inscripciones")
+    
+    def iter_inscripciones(self) -> Iterator[Inscripcion]:
+        """Recorre las inscripciones del CSV una a una, sin cargarlas todas en memoria"""
+        return self._armar('inscripciones', self._leer_filas('inscripciones'))
     
     def guardar_inscripciones(self, inscripciones: List[Inscripcion]):
         """Guarda inscripciones en CSV"""
-        archivo = os.path.join(self.base_path, "inscripciones.csv")
-        
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            if inscripciones:
-                fieldnames = ['id', 'estudiante_id', 'curso_codigo', 'fecha_inscripcion']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for inscripcion in inscripciones:
-                    writer.writerow({
-                        'id': inscripcion.id,
-                        'estudiante_id': inscripcion.estudiante_id,
-                        'curso_codigo': inscripcion.curso_codigo,
-                        'fecha_inscripcion': inscripcion.fecha_inscripcion
-                    })
+        self._guardar_tabla('inscripciones', inscripciones)
     
     def cargar_matriculas(self) -> List[Matricula]:
         """Carga matrículas desde CSV - ahora incluye inscripcion_id"""
-        archivo = os.path.join(self.base_path, "matriculas.csv")
-        matriculas = []
-        
-        if not os.path.exists(archivo):
+        if self.almacen is not None:
+            self.esperar_escrituras()
+            if self.almacen.existe():
+                return self.almacen.cargar()
+            # Primera carga con el almacén: se llena con lo que haya en el CSV
+            matriculas = self._cargar_tabla('matriculas', self.iter_matriculas, "matrículas")
+            self.guardar_matriculas(matriculas)
             return matriculas
+        self._migrar_desde_almacen()
+        return self._cargar_tabla('matriculas', self.iter_matriculas, "matrículas")
+    
+    def _migrar_desde_almacen(self):
+        """Sin matriculas_mmap, pasa a matriculas.csv un almacén que quedó de otra sesión.
         
-        try:
-            with open(archivo, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
+        Ese almacén es más nuevo que el CSV (que dejó de actualizarse al crearlo).
+        El CSV se escribe antes de borrar el almacén, así que una interrupción no
+        pierde datos: la próxima carga vuelve a migrar.
+        """
+        almacen = AlmacenMatriculas(self.base_path)
+        if not almacen.existe():
+            return
+        self.esperar_escrituras()
+        self._escribir_tabla('matriculas', self._filas('matriculas', almacen.cargar()))
+        almacen.eliminar()
+    
+    def iter_matriculas(self) -> Iterator[Matricula]:
+        """Recorre las matrículas del CSV (o del almacén) una a una, sin cargarlas todas en memoria"""
+        if self.almacen is not None and self.almacen.existe():
+            self.esperar_escrituras()
+            yield from self.almacen.iter_matriculas()
+            return
+        if self.almacen is None:
+            self._migrar_desde_almacen()
+        yield from self._armar('matriculas', self._filas_matriculas())
+    
+    def _filas_matriculas(self) -> Iterator[tuple]:
+        """Filas de matriculas.csv con la nota convertida y el inscripcion_id del formato anterior"""
+        for id, inscripcion_id, estudiante_id, curso_codigo, fecha_matricula, nota in self._leer_filas('matriculas'):
+            if nota:
+                try:
+                    nota = float(nota)
+                except ValueError:
                     nota = None
-                    if row.get('nota') and row['nota'].strip():
-                        try:
-                            nota = float(row['nota'])
-                        except ValueError:
-                            nota = None
-                    
-                    # Manejar compatibilidad con formato anterior
-                    inscripcion_id = row.get('inscripcion_id', '').strip()
-                    if not inscripcion_id:
-                        # Si no hay inscripcion_id, generar uno temporal
-                        inscripcion_id = f"temp_{row['id'].strip()}"
-                    
-                    matricula = Matricula(
-                        id=row['id'].strip(),
-                        inscripcion_id=inscripcion_id,
-                        estudiante_id=row['estudiante_id'].strip(),
-                        curso_codigo=row['curso_codigo'].strip(),
-                        fecha_matricula=row['fecha_matricula'].strip(),
-                        nota=nota
-                    )
-                    matriculas.append(matricula)
-        except Exception as e:
-            print(f"Error cargando matrículas: {e}")
-        
-        return matriculas
+            else:
+                nota = None
+            
+            # Manejar compatibilidad con formato anterior
+            if not inscripcion_id:
+                # Si no hay inscripcion_id, generar uno temporal
+                inscripcion_id = f"temp_{id}"
+            
+            yield id, inscripcion_id, estudiante_id, curso_codigo, fecha_matricula, nota
     
     def guardar_matriculas(self, matriculas: List[Matricula]):
         """Guarda matrículas en CSV - ahora incluye inscripcion_id"""
-        archivo = os.path.join(self.base_path, "matriculas.csv")
-        
-        with open(archivo, 'w', newline='', encoding='utf-8') as f:
-            if matriculas:
-                fieldnames = ['id', 'inscripcion_id', 'estudiante_id', 'curso_codigo', 'fecha_matricula', 'nota']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for matricula in matriculas:
-                    writer.writerow({
-                        'id': matricula.id,
-                        'inscripcion_id': matricula.inscripcion_id,
-                        'estudiante_id': matricula.estudiante_id,
-                        'curso_codigo': matricula.curso_codigo,
-                        'fecha_matricula': matricula.fecha_matricula,
-                        'nota': matricula.nota if matricula.nota is not None else ''
-                    })
+        if self.almacen is not None:
+            self._programar(self.almacen.escribir, self._filas('matriculas', matriculas))
+            return
+        self._guardar_tabla('matriculas', matriculas)
+    
+    @classmethod
+    def _filas(cls, tabla: str, elementos: list) -> List[tuple]:
+        """Convierte los elementos en filas CSV (copia, para poder escribirlas en otro hilo).
+        
+        csv.writer escribe None como campo vacío, que es como se guarda una nota sin asignar.
+        """
+        _, fieldnames = cls.ARCHIVOS[tabla]
+        return list(map(attrgetter(*fieldnames), elementos))
+    
+    def _programar(self, funcion, *args):
+        """Ejecuta la escritura ahora o, en modo segundo plano, la encola en el hilo escritor"""
+        if not self.segundo_plano:
+            funcion(*args)
+            return
+        
+        if self._ejecutor is None:
+            self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="escritor_csv")
+        self._pendientes.append(self._ejecutor.submit(self._ejecutar_en_segundo_plano, funcion, *args))
+    
+    def _ejecutar_en_segundo_plano(self, funcion, *args):
+        """Ejecuta una escritura encolada registrando el error si falla"""
+        try:
+            funcion(*args)
+        except Exception as e:
+            self._error_segundo_plano = e
+            print(f"❌ Error guardando datos en segundo plano: {e}")
+    
+    def esperar_escrituras(self):
+        """Espera a que terminen las escrituras en segundo plano"""
+        pendientes, self._pendientes = self._pendientes, []
+        for futuro in pendientes:
+            futuro.result()
+    
+    def _reponer_si_fallo(self):
+        """Si una escritura en segundo plano falló, vuelve a marcar las tablas de ese guardado.
+        
+        Se marcan para reescritura completa: un archivo pudo quedar a medio agregar.
+        """
+        if self._error_segundo_plano is not None and self._en_curso is not None:
+            cambios, tablas = self._en_curso
+            for tabla in tablas:
+                cambios.registrar_modificacion(tabla)
+        self._en_curso = None
+    
+    def confirmar_escrituras(self) -> Optional[Exception]:
+        """Espera las escrituras en segundo plano y retorna (una sola vez) el error, si alguna falló.
+        
+        Con un error, las tablas del último guardado quedan otra vez pendientes.
+        """
+        self.esperar_escrituras()
+        self._reponer_si_fallo()
+        error, self._error_segundo_plano = self._error_segundo_plano, None
+        return error
+    
+    def al_terminar_escrituras(self, funcion):
+        """Ejecuta funcion cuando terminen con éxito las escrituras encoladas hasta ahora"""
+        def ejecutar_si_no_hubo_error():
+            if self._error_segundo_plano is None:
+                funcion()
+        self._programar(ejecutar_si_no_hubo_error)
+    
+    def _escribir_atomico(self, archivo: str, fieldnames: List[str], filas: List[tuple]):
+        """Escribe el CSV en un temporal, lo sincroniza con disco y lo renombra sobre el original"""
+        descriptor, temporal = tempfile.mkstemp(
+            dir=self.base_path, prefix=f".{os.path.basename(archivo)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, 'w', newline='', encoding='utf-8') as f:
+                if filas:
+                    writer = csv.writer(f)
+                    writer.writerow(fieldnames)
+                    writer.writerows(filas)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, archivo)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+    
+    def _escribir_json_atomico(self, archivo: str, datos: dict):
+        """Escribe un JSON en un temporal, lo sincroniza con disco y lo renombra sobre el original"""
+        descriptor, temporal = tempfile.mkstemp(
+            dir=self.base_path, prefix=f".{os.path.basename(archivo)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, archivo)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+    
+    def cargar_contadores(self) -> Dict[str, int]:
+        """Carga las marcas de los contadores de IDs; {} si no hay archivo o está dañado"""
+        archivo = os.path.join(self.base_path, self.ARCHIVO_CONTADORES)
+        if not os.path.exists(archivo):
+            return {}
+        try:
+            with open(archivo, 'r', encoding='utf-8') as f:
+                return {tipo: int(ultimo) for tipo, ultimo in json.load(f).items()}
+        except (ValueError, AttributeError) as e:
+            print(f"Error cargando contadores: {e}")
+            return {}
+    
+    def guardar_contadores(self, marcas: Dict[str, int]):
+        """Guarda las marcas de los contadores de IDs"""
+        archivo = os.path.join(self.base_path, self.ARCHIVO_CONTADORES)
+        self._programar(self._escribir_json_atomico, archivo, dict(marcas))
+    
+    def _guardar_tabla(self, tabla: str, elementos: list):
+        """Reescribe por completo el CSV de una tabla (y su instantánea)"""
+        self._programar(self._escribir_tabla, tabla, self._filas(tabla, elementos))
+    
+    def _escribir_tabla(self, tabla: str, filas: List[tuple]):
+        """Escribe el CSV y después la instantánea, firmada con el CSV recién escrito"""
+        _, fieldnames = self.ARCHIVOS[tabla]
+        archivo = self._archivo(tabla)
+        self._escribir_atomico(archivo, fieldnames, filas)
+        if self.instantaneas:
+            instantanea.escribir(self._archivo_instantanea(tabla), filas, instantanea.firma_de(archivo))
+    
+    def _anexar(self, archivo: str, filas: List[tuple]):
+        """Agrega filas al final de un CSV existente"""
+        # Si la última línea no termina en salto de línea, agregarlo antes
+        with open(archivo, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            falta_salto = f.read(1) not in (b'\n', b'\r')
+        
+        with open(archivo, 'a', newline='', encoding='utf-8') as f:
+            if falta_salto:
+                f.write('\r\n')
+            csv.writer(f).writerows(filas)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _anexar_tabla(self, tabla: str, filas: List[tuple], todas: List[tuple] = None):
+        """Agrega filas al CSV y a su instantánea; sin instantánea vigente, la escribe con todas"""
+        archivo = self._archivo(tabla)
+        archivo_instantanea = self._archivo_instantanea(tabla)
+        vigente = self.instantaneas and instantanea.vigente(archivo_instantanea, instantanea.firma_de(archivo))
+        self._anexar(archivo, filas)
+        
+        if vigente:
+            instantanea.anexar(archivo_instantanea, filas, instantanea.firma_de(archivo))
+        elif todas is not None:
+            instantanea.escribir(archivo_instantanea, todas, instantanea.firma_de(archivo))
+    
+    def _encabezado_coincide(self, tabla: str) -> bool:
+        """Indica si el encabezado del CSV tiene exactamente las columnas de ARCHIVOS, en ese orden"""
+        _, columnas = self.ARCHIVOS[tabla]
+        with open(self._archivo(tabla), 'r', newline='', encoding='utf-8') as f:
+            encabezado = next(csv.reader(f), None)
+        return encabezado is not None and [columna.strip() for columna in encabezado] == columnas
+    
+    def _agregar_filas(self, tabla: str, elementos: list, todos: list = None) -> bool:
+        """Agrega filas al final del CSV sin reescribirlo; retorna False si el archivo no sirve para agregar.
+        
+        Solo se agrega a un CSV cuyo encabezado coincide con las columnas de ARCHIVOS:
+        un archivo con otro orden o del formato anterior (sin inscripcion_id) se
+        reescribe completo. Si la tabla no tiene instantánea vigente y se pasan
+        todos sus elementos, la instantánea se escribe completa después de agregar.
+        """
+        if tabla == 'matriculas' and self.almacen is not None:
+            if not self.almacen.existe():
+                return False
+            self._programar(self.almacen.anexar, self._filas(tabla, elementos))
+            return True
+        
+        archivo = self._archivo(tabla)
+        
+        if not os.path.exists(archivo) or os.path.getsize(archivo) == 0 or not self._encabezado_coincide(tabla):
+            return False
+        
+        todas = None
+        if (self.instantaneas and todos is not None and
+                not instantanea.vigente(self._archivo_instantanea(tabla), instantanea.firma_de(archivo))):
+            todas = self._filas(tabla, todos)
+        self._programar(self._anexar_tabla, tabla, self._filas(tabla, elementos), todas)
+        return True
+    
+    def _actualizar_notas(self, tabla: str, elementos: list) -> bool:
+        """Escribe en su lugar las notas cambiadas; retorna False si para guardarlas hay que reescribir la tabla"""
+        if not elementos:
+            return True
+        if tabla != 'matriculas' or self.almacen is None or not self.almacen.existe():
+            return False
+        self._programar(self.almacen.actualizar_notas, [(m.id, m.nota) for m in elementos])
+        return True
+    
+    def guardar_cambios(self, estudiantes: List[Estudiante], cursos: List[Curso],
+                        inscripciones: List[Inscripcion], matriculas: List[Matricula],
+                        cambios: RegistroCambios) -> List[str]:
+        """Guarda solo las tablas con cambios y retorna los nombres de las tablas escritas"""
+        # Decidir entre agregar o reescribir requiere ver los archivos ya escritos.
+        # El error de un guardado anterior se conserva hasta confirmar_escrituras.
+        self.esperar_escrituras()
+        self._reponer_si_fallo()
+        
+        colecciones = {
+            'estudiantes': (estudiantes, self.guardar_estudiantes),
+            'cursos': (cursos, self.guardar_cursos),
+            'inscripciones': (inscripciones, self.guardar_inscripciones),
+            'matriculas': (matriculas, self.guardar_matriculas),
+        }
+        
+        escritas = []
+        for tabla, (datos, guardar) in colecciones.items():
+            if not cambios.esta_modificada(tabla):
+                continue
+            
+            agregados = cambios.agregados_pendientes(tabla)
+            if (cambios.requiere_reescritura(tabla) or
+                    (agregados and not self._agregar_filas(tabla, agregados, datos)) or
+                    not self._actualizar_notas(tabla, cambios.notas_pendientes(tabla))):
+                guardar(datos)
+            
+            cambios.limpiar(tabla)
+            escritas.append(tabla)
+        
+        if self.segundo_plano:
+            self._en_curso = (cambios, escritas)
+        return escritas
     
     def exportar_json(self, estudiantes: List[Estudiante], cursos: List[Curso], 
                      inscripciones: List[Inscripcion], matriculas: List[Matricula]) -> str:
         """Exporta todos los datos a formato JSON"""
-        datos = {
-            'estudiantes': [
-                {
-                    'id': e.id,
-                    'documento': e.documento,
-                    'nombres': e.nombres,
-                    'apellidos': e.apellidos,
-                    'correo': e.correo,
-                    'fecha_nacimiento': e.fecha_nacimiento
-                } for e in estudiantes
-            ],
-            'cursos': [
-                {
-                    'codigo': c.codigo,
-                    'nombre': c.nombre,
-                    'creditos': c.creditos,
-                    'docente': c.docente
-                } for c in cursos
-            ],
-            'inscripciones': [
-                {
-                    'id': i.id,
-                    'estudiante_id': i.estudiante_id,
-                    'curso_codigo': i.curso_codigo,
-                    'fecha_inscripcion': i.fecha_inscripcion
-                } for i in inscripciones
-            ],
-            'matriculas': [
-                {
-                    'id': m.id,
-                    'inscripcion_id': m.inscripcion_id,
-                    'estudiante_id': m.estudiante_id,
-                    'curso_codigo': m.curso_codigo,
-                    'fecha_matricula': m.fecha_matricula,
-                    'nota': m.nota
-                } for m in matriculas
-            ]
+        return exportar_datos_json(self.base_path, estudiantes, cursos, inscripciones, matriculas)
+    
+    def cargar_repositorio(self, clase=RepositorioAcademico) -> RepositorioAcademico:
+        """Carga las cuatro tablas (al usarlas, si perezosa) y los contadores en un repositorio"""
+        return cargar_repositorio(self, clase, self.perezosa)
+    
+    def guardar_repositorio(self, repositorio: RepositorioAcademico) -> List[str]:
+        """Guarda los contadores y las tablas modificadas del repositorio"""
+        return guardar_repositorio(self, repositorio)
+    
+    def confirmar_guardado(self, repositorio: RepositorioAcademico) -> Optional[Exception]:
+        """Espera a que termine el último guardado; si falló, lo deja pendiente y retorna el error"""
+        return confirmar_guardado(self, repositorio)
+
+
+def cargar_repositorio(persistencia, clase=RepositorioAcademico, perezosa: bool = False) -> RepositorioAcademico:
+    """Arma un repositorio con los datos de cualquier motor de persistencia.
+    
+    Con perezosa=True las colecciones son ColeccionPerezosa y el repositorio
+    arma sus índices en la primera consulta. Los contadores guardados se
+    siembran de inmediato, para no reutilizar IDs de registros ya eliminados.
+    """
+    cargas = (persistencia.cargar_estudiantes, persistencia.cargar_cursos,
+              persistencia.cargar_inscripciones, persistencia.cargar_matriculas)
+    if perezosa:
+        repositorio = clase(*(ColeccionPerezosa(cargar) for cargar in cargas), indexar=False)
+    else:
+        repositorio = clase(*(cargar() for cargar in cargas))
+    repositorio.ids.sembrar(persistencia.cargar_contadores())
+    return repositorio
+
+
+def guardar_repositorio(persistencia, repositorio: RepositorioAcademico) -> List[str]:
+    """Guarda los contadores si cambiaron y las tablas modificadas; retorna las tablas escritas"""
+    ids = repositorio.ids
+    if ids.modificado:
+        persistencia.guardar_contadores(ids.marcas())
+        ids.modificado = False
+    return persistencia.guardar_cambios(
+        repositorio.estudiantes, repositorio.cursos, repositorio.inscripciones,
+        repositorio.matriculas, repositorio.cambios
+    )
+
+
+def confirmar_guardado(persistencia, repositorio: RepositorioAcademico) -> Optional[Exception]:
+    """Espera las escrituras del último guardado y retorna su error, si lo hubo.
+    
+    Ante un error, las tablas y los contadores de ese guardado quedan otra vez
+    pendientes, para que el siguiente guardado los escriba completos.
+    """
+    error = persistencia.confirmar_escrituras()
+    if error is not None:
+        repositorio.ids.modificado = True
+    return error
+
+
+def exportar_datos_json(base_path: str, estudiantes: Iterable[Estudiante], cursos: Iterable[Curso],
+                        inscripciones: Iterable[Inscripcion], matriculas: Iterable[Matricula]) -> str:
+    """Escribe export.json en base_path con todos los datos y retorna la ruta.
+    
+    Acepta listas o iteradores (p. ej. PersistenciaCSV.iter_matriculas()) y escribe
+    registro por registro, con el mismo formato que json.dump(indent=2).
+    """
+    colecciones = [
+        ('estudiantes', estudiantes),
+        ('cursos', cursos),
+        ('inscripciones', inscripciones),
+        ('matriculas', matriculas),
+    ]
+    
+    archivo = os.path.join(base_path, "export.json")
+    with open(archivo, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for posicion, (tabla, elementos) in enumerate(colecciones):
+            _, campos = PersistenciaCSV.ARCHIVOS[tabla]
+            f.write(',' if posicion else '')
+            f.write(f'\n  "{tabla}": [')
+            
+            vacia = True
+            for elemento in elementos:
+                registro = {campo: getattr(elemento, campo) for campo in campos}
+                texto = json.dumps(registro, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+                f.write(('\n    ' if vacia else ',\n    ') + texto)
+                vacia = False
+            
+            f.write(']' if vacia else '\n  ]')
+        f.write('\n}')
+    
+    return archivo
+
+
+class PersistenciaSQLite:
+    """Maneja la persistencia de datos en una base SQLite (modo WAL).
+    
+    Con perezosa=True, cargar_repositorio no consulta ninguna tabla: cada una
+    se lee la primera vez que se usa (ver ColeccionPerezosa), igual que en
+    PersistenciaCSV.
+    """
+    
+    # Definición de tablas: nombre -> (columnas, clave primaria)
+    TABLAS = {
+        'estudiantes': (['id', 'documento', 'nombres', 'apellidos', 'correo', 'fecha_nacimiento'], 'id'),
+        'cursos': (['codigo', 'nombre', 'creditos', 'docente'], 'codigo'),
+        'inscripciones': (['id', 'estudiante_id', 'curso_codigo', 'fecha_inscripcion'], 'id'),
+        'matriculas': (['id', 'inscripcion_id', 'estudiante_id', 'curso_codigo', 'fecha_matricula', 'nota'], 'id'),
+    }
+    
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS estudiantes (
+            id TEXT PRIMARY KEY,
+            documento TEXT NOT NULL,
+            nombres TEXT NOT NULL,
+            apellidos TEXT NOT NULL,
+            correo TEXT NOT NULL,
+            fecha_nacimiento TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_estudiantes_documento ON estudiantes(documento);
+        CREATE INDEX IF NOT EXISTS idx_estudiantes_correo ON estudiantes(correo COLLATE NOCASE);
+        
+        CREATE TABLE IF NOT EXISTS cursos (
+            codigo TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            creditos INTEGER NOT NULL,
+            docente TEXT NOT NULL
+        );
+        
+        CREATE TABLE IF NOT EXISTS inscripciones (
+            id TEXT PRIMARY KEY,
+            estudiante_id TEXT NOT NULL REFERENCES estudiantes(id),
+            curso_codigo TEXT NOT NULL REFERENCES cursos(codigo),
+            fecha_inscripcion TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_inscripciones_estudiante ON inscripciones(estudiante_id);
+        CREATE INDEX IF NOT EXISTS idx_inscripciones_curso ON inscripciones(curso_codigo);
+        
+        CREATE TABLE IF NOT EXISTS matriculas (
+            id TEXT PRIMARY KEY,
+            inscripcion_id TEXT NOT NULL REFERENCES inscripciones(id),
+            estudiante_id TEXT NOT NULL REFERENCES estudiantes(id),
+            curso_codigo TEXT NOT NULL REFERENCES cursos(codigo),
+            fecha_matricula TEXT NOT NULL,
+            nota REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_matriculas_inscripcion ON matriculas(inscripcion_id);
+        CREATE INDEX IF NOT EXISTS idx_matriculas_estudiante ON matriculas(estudiante_id);
+        CREATE INDEX IF NOT EXISTS idx_matriculas_curso ON matriculas(curso_codigo);
+        
+        CREATE TABLE IF NOT EXISTS contadores (
+            tipo TEXT PRIMARY KEY,
+            ultimo INTEGER NOT NULL
+        );
+    """
+    
+    def __init__(self, base_path: str = "datos", nombre_archivo: str = "minisiga.db", perezosa: bool = False):
+        self.base_path = base_path
+        self.perezosa = perezosa
+        self.segundo_plano = False  # las escrituras en SQLite son síncronas
+        self.crear_directorio()
+        self.archivo = os.path.join(base_path, nombre_archivo)
+        self.conexion = sqlite3.connect(self.archivo)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        # Las claves foráneas quedan declaradas pero sin forzar: los datos
+        # migrados del formato anterior pueden traer inscripciones "temp_"
+        self.conexion.executescript(self.ESQUEMA)
+    
+    def crear_directorio(self):
+        """Crea el directorio de datos si no existe"""
+        if not os.path.exists(self.base_path):
+            os.makedirs(self.base_path)
+    
+    def cerrar(self):
+        """Cierra la conexión con la base de datos"""
+        self.conexion.close()
+    
+    def esperar_escrituras(self):
+        """Las escrituras en SQLite son síncronas: no hay nada que esperar"""
+    
+    def al_terminar_escrituras(self, funcion):
+        """Ejecuta funcion de inmediato (las escrituras ya terminaron)"""
+        funcion()
+    
+    def confirmar_escrituras(self) -> Optional[Exception]:
+        """Las escrituras en SQLite son síncronas: sus errores ya se lanzaron al guardar"""
+        return None
+    
+    def esta_vacia(self) -> bool:
+        """Indica si la base no tiene ningún registro"""
+        for tabla in self.TABLAS:
+            if self.conexion.execute(f"SELECT 1 FROM {tabla} LIMIT 1").fetchone():
+                return False
+        return True
+    
+    def importar_desde(self, origen) -> None:
+        """Copia todos los datos desde otro motor de persistencia (por ejemplo PersistenciaCSV)"""
+        self.guardar_estudiantes(origen.cargar_estudiantes())
+        self.guardar_cursos(origen.cargar_cursos())
+        self.guardar_inscripciones(origen.cargar_inscripciones())
+        self.guardar_matriculas(origen.cargar_matriculas())
+        self.guardar_contadores(origen.cargar_contadores())
+    
+    def cargar_contadores(self) -> Dict[str, int]:
+        """Carga las marcas de los contadores de IDs"""
+        return dict(self.conexion.execute("SELECT tipo, ultimo FROM contadores"))
+    
+    def guardar_contadores(self, marcas: Dict[str, int]):
+        """Guarda las marcas de los contadores de IDs"""
+        with self.conexion:
+            self.conexion.executemany(
+                "INSERT INTO contadores (tipo, ultimo) VALUES (?, ?) "
+                "ON CONFLICT(tipo) DO UPDATE SET ultimo = excluded.ultimo",
+                list(marcas.items())
+            )
+    
+    def _recorrer_tabla(self, tabla: str):
+        """Recorre las filas de una tabla en orden de inserción, sin leerlas todas"""
+        columnas, _ = self.TABLAS[tabla]
+        return self.conexion.execute(f"SELECT {', '.join(columnas)} FROM {tabla} ORDER BY rowid")
+    
+    def _leer_tabla(self, tabla: str) -> List[Tuple]:
+        """Lee todas las filas de una tabla en orden de inserción"""
+        return self._recorrer_tabla(tabla).fetchall()
+    
+    def _sincronizar_tabla(self, tabla: str, filas: List[Tuple]):
+        """Escribe solo las filas nuevas o modificadas y borra las que ya no existen"""
+        columnas, clave = self.TABLAS[tabla]
+        posicion_clave = columnas.index(clave)
+        
+        actuales: Dict[str, Tuple] = {fila[posicion_clave]: fila for fila in self._leer_tabla(tabla)}
+        nuevas = {fila[posicion_clave]: fila for fila in filas}
+        
+        cambiadas = [fila for id_fila, fila in nuevas.items() if actuales.get(id_fila) != fila]
+        eliminadas = [(id_fila,) for id_fila in actuales if id_fila not in nuevas]
+        
+        marcadores = ', '.join('?' for _ in columnas)
+        asignaciones = ', '.join(f"{c} = excluded.{c}" for c in columnas if c != clave)
+        with self.conexion:
+            if cambiadas:
+                self.conexion.executemany(
+                    f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({marcadores}) "
+                    f"ON CONFLICT({clave}) DO UPDATE SET {asignaciones}",
+                    cambiadas
+                )
+            if eliminadas:
+                self.conexion.executemany(f"DELETE FROM {tabla} WHERE {clave} = ?", eliminadas)
+    
+    def cargar_estudiantes(self) -> List[Estudiante]:
+        """Carga estudiantes desde la base"""
+        return list(self.iter_estudiantes())
+    
+    def iter_estudiantes(self) -> Iterator[Estudiante]:
+        """Recorre los estudiantes de la base sin cargarlos en memoria"""
+        for fila in self._recorrer_tabla('estudiantes'):
+            yield Estudiante(*fila)
+    
+    def guardar_estudiantes(self, estudiantes: List[Estudiante]):
+        """Guarda estudiantes en la base"""
+        self._sincronizar_tabla('estudiantes', [
+            (e.id, e.documento, e.nombres, e.apellidos, e.correo, e.fecha_nacimiento)
+            for e in estudiantes
+        ])
+    
+    def cargar_cursos(self) -> List[Curso]:
+        """Carga cursos desde la base"""
+        return list(self.iter_cursos())
+    
+    def iter_cursos(self) -> Iterator[Curso]:
+        """Recorre los cursos de la base sin cargarlos en memoria"""
+        for fila in self._recorrer_tabla('cursos'):
+            yield Curso(*fila)
+    
+    def guardar_cursos(self, cursos: List[Curso]):
+        """Guarda cursos en la base"""
+        self._sincronizar_tabla('cursos', [
+            (c.codigo, c.nombre, c.creditos, c.docente) for c in cursos
+        ])
+    
+    def cargar_inscripciones(self) -> List[Inscripcion]:
+        """Carga inscripciones desde la base"""
+        return list(self.iter_inscripciones())
+    
+    def iter_inscripciones(self) -> Iterator[Inscripcion]:
+        """Recorre las inscripciones de la base sin cargarlas en memoria"""
+        for fila in self._recorrer_tabla('inscripciones'):
+            yield Inscripcion(*fila)
+    
+    def guardar_inscripciones(self, inscripciones: List[Inscripcion]):
+        """Guarda inscripciones en la base"""
+        self._sincronizar_tabla('inscripciones', [
+            (i.id, i.estudiante_id, i.curso_codigo, i.fecha_inscripcion) for i in inscripciones
+        ])
+    
+    def cargar_matriculas(self) -> List[Matricula]:
+        """Carga matrículas desde la base"""
+        return list(self.iter_matriculas())
+    
+    def iter_matriculas(self) -> Iterator[Matricula]:
+        """Recorre las matrículas de la base sin cargarlas en memoria"""
+        for fila in self._recorrer_tabla('matriculas'):
+            yield Matricula(*fila)
+    
+    def guardar_matriculas(self, matriculas: List[Matricula]):
+        """Guarda matrículas en la base"""
+        self._sincronizar_tabla('matriculas', [
+            (m.id, m.inscripcion_id, m.estudiante_id, m.curso_codigo, m.fecha_matricula, m.nota)
+            for m in matriculas
+        ])
+    
+    def guardar_cambios(self, estudiantes: List[Estudiante], cursos: List[Curso],
+                        inscripciones: List[Inscripcion], matriculas: List[Matricula],
+                        cambios: RegistroCambios) -> List[str]:
+        """Guarda solo las tablas con cambios y retorna los nombres de las tablas escritas"""
+        colecciones = {
+            'estudiantes': (estudiantes, self.guardar_estudiantes),
+            'cursos': (cursos, self.guardar_cursos),
+            'inscripciones': (inscripciones, self.guardar_inscripciones),
+            'matriculas': (matriculas, self.guardar_matriculas),
         }
         
-        archivo = os.path.join(self.base_path, "export.json")
-        with open(archivo, 'w', encoding='utf-8') as f:
-            json.dump(datos, f, indent=2, ensure_ascii=False)
+        escritas = []
+        for tabla, (datos, guardar) in colecciones.items():
+            if not cambios.esta_modificada(tabla):
+                continue
+            
+            if cambios.requiere_reescritura(tabla):
+                guardar(datos)
+            else:
+                columnas, clave = self.TABLAS[tabla]
+                filas = [tuple(getattr(e, c) for c in columnas) for e in cambios.agregados_pendientes(tabla)]
+                notas = [(e.nota, getattr(e, clave)) for e in cambios.notas_pendientes(tabla)]
+                with self.conexion:
+                    self.conexion.executemany(
+                        f"INSERT OR REPLACE INTO {tabla} ({', '.join(columnas)}) "
+                        f"VALUES ({', '.join('?' for _ in columnas)})",
+                        filas
+                    )
+                    if notas:
+                        self.conexion.executemany(f"UPDATE {tabla} SET nota = ? WHERE {clave} = ?", notas)
+            
+            cambios.limpiar(tabla)
+            escritas.append(tabla)
         
-        return archivo
\ No newline at end of file
+        return escritas
+    
+    def exportar_json(self, estudiantes: List[Estudiante], cursos: List[Curso], 
+                     inscripciones: List[Inscripcion], matriculas: List[Matricula]) -> str:
+        """Exporta todos los datos a formato JSON"""
+        return exportar_datos_json(self.base_path, estudiantes, cursos, inscripciones, matriculas)
+    
+    def cargar_repositorio(self, clase=RepositorioAcademico) -> RepositorioAcademico:
+        """Carga las cuatro tablas (al usarlas, si perezosa) y los contadores en un repositorio"""
+        return cargar_repositorio(self, clase, self.perezosa)
+    
+    def guardar_repositorio(self, repositorio: RepositorioAcademico) -> List[str]:
+        """Guarda los contadores y las tablas modificadas del repositorio"""
+        return guardar_repositorio(self, repositorio)
+    
+    def confirmar_guardado(self, repositorio: RepositorioAcademico) -> Optional[Exception]:
+        """Las escrituras en SQLite son síncronas: no hay nada pendiente que confirmar"""
+        return confirmar_guardado(self, repositorio)
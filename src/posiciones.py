@@ -0,0 +1,144 @@
+# src/posiciones.py - Mejores notas por curso: top-k con montículos y clasificación incremental
+import heapq
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.modelos import Matricula
+
+# Entrada de la clasificación: (-nota, orden de llegada, matrícula). Con el orden de llegada
+# como desempate, las notas iguales quedan en el orden de la lista de matrículas; como el
+# orden es único, las tuplas nunca llegan a comparar las matrículas.
+Entrada = Tuple[float, int, Matricula]
+
+
+def top_k_por_curso(matriculas: Iterable[Matricula], k: int,
+                    incluir: Optional[Callable[[Matricula], bool]] = None) -> Dict[str, List[Matricula]]:
+    """Las k matrículas con mejor nota de cada curso, en una sola pasada (O(n log k)).
+    
+    Mantiene un montículo de tamaño k por curso; incluir permite descartar filas
+    (p. ej. matrículas de estudiantes inexistentes).
+    """
+    monticulos: Dict[str, List[Entrada]] = {}
+    if k <= 0:
+        return {}
+    
+    for orden, matricula in enumerate(matriculas):
+        if matricula.nota is None or (incluir is not None and not incluir(matricula)):
+            continue
+        # Montículo de mínimos por (nota, -orden): en la raíz queda la peor del top actual
+        entrada = (matricula.nota, -orden, matricula)
+        monticulo = monticulos.get(matricula.curso_codigo)
+        if monticulo is None:
+            monticulos[matricula.curso_codigo] = [entrada]
+        elif len(monticulo) < k:
+            heapq.heappush(monticulo, entrada)
+        elif entrada > monticulo[0]:
+            heapq.heapreplace(monticulo, entrada)
+    
+    return {curso: [matricula for _, _, matricula in sorted(monticulo, reverse=True)]
+            for curso, monticulo in monticulos.items()}
+
+
+class TablaPosiciones:
+    """Clasificación de cada curso por nota, mantenida al agregar, quitar o calificar.
+    
+    La clasificación de un curso se arma la primera vez que se consulta, a partir
+    del índice de matrículas por curso, y desde entonces se mantiene como una lista
+    ordenada (bisect): el top de un curso se lee sin volver a ordenar.
+    """
+    
+    def __init__(self, matriculas_por_curso: Dict[str, List[Matricula]]):
+        self._matriculas_por_curso = matriculas_por_curso
+        self._por_curso: Dict[str, List[Entrada]] = {}
+        self._siguiente: Dict[str, int] = {}  # curso -> próximo orden de llegada
+        self._orden: Dict[int, int] = {}  # id(matricula) -> orden de llegada
+        self._entradas: Dict[int, Entrada] = {}  # id(matricula) -> entrada vigente
+    
+    def _clasificacion(self, curso_codigo: str) -> List[Entrada]:
+        """Retorna la clasificación del curso, armándola si todavía no existe"""
+        entradas = self._por_curso.get(curso_codigo)
+        if entradas is None:
+            entradas = self._por_curso[curso_codigo] = []
+            matriculas = self._matriculas_por_curso.get(curso_codigo, [])
+            for orden, matricula in enumerate(matriculas):
+                self._orden[id(matricula)] = orden
+                if matricula.nota is not None:
+                    entrada = (-matricula.nota, orden, matricula)
+                    self._entradas[id(matricula)] = entrada
+                    entradas.append(entrada)
+            entradas.sort()
+            self._siguiente[curso_codigo] = len(matriculas)
+        return entradas
+    
+    def _ubicar(self, matricula: Matricula, orden: int):
+        """Inserta la matrícula en la clasificación de su curso si tiene nota"""
+        if matricula.nota is not None:
+            entrada = (-matricula.nota, orden, matricula)
+            self._entradas[id(matricula)] = entrada
+            insort(self._por_curso[matricula.curso_codigo], entrada)
+    
+    def _sacar(self, matricula: Matricula):
+        """Saca la entrada vigente de la matrícula de la clasificación de su curso"""
+        entrada = self._entradas.pop(id(matricula), None)
+        if entrada is not None:
+            entradas = self._por_curso[matricula.curso_codigo]
+            del entradas[bisect_left(entradas, entrada)]
+    
+    def agregar(self, matricula: Matricula):
+        """Agrega una matrícula nueva (solo si su curso ya tiene clasificación armada)"""
+        curso = matricula.curso_codigo
+        if curso in self._por_curso:
+            orden = self._siguiente[curso]
+            self._siguiente[curso] = orden + 1
+            self._orden[id(matricula)] = orden
+            self._ubicar(matricula, orden)
+    
+    def quitar(self, matricula: Matricula):
+        """Quita una matrícula de la clasificación"""
+        self._sacar(matricula)
+        self._orden.pop(id(matricula), None)
+    
+    def actualizar_nota(self, matricula: Matricula):
+        """Reubica una matrícula cuya nota cambió, conservando su orden de llegada"""
+        orden = self._orden.get(id(matricula))
+        if orden is not None:
+            self._sacar(matricula)
+            self._ubicar(matricula, orden)
+    
+    def actualizar_notas(self, matriculas: List[Matricula]):
+        """Actualiza un lote de notas; si un curso recibe muchas, su clasificación se descarta.
+        
+        Reubicar una a una cuesta un corrimiento de la lista por nota; pasado un tercio
+        del curso sale más barato volver a ordenarlo en la próxima consulta.
+        """
+        por_curso: Dict[str, List[Matricula]] = {}
+        for matricula in matriculas:
+            if matricula.curso_codigo in self._por_curso:
+                por_curso.setdefault(matricula.curso_codigo, []).append(matricula)
+        
+        for curso, cambiadas in por_curso.items():
+            if len(cambiadas) * 3 > len(self._por_curso[curso]):
+                self.descartar(curso)
+            else:
+                for matricula in cambiadas:
+                    self.actualizar_nota(matricula)
+    
+    def descartar(self, curso_codigo: str):
+        """Descarta la clasificación del curso; se vuelve a armar al consultarla"""
+        entradas = self._por_curso.pop(curso_codigo, None)
+        if entradas is None:
+            return
+        for _, _, matricula in entradas:
+            self._entradas.pop(id(matricula), None)
+        for matricula in self._matriculas_por_curso.get(curso_codigo, []):
+            self._orden.pop(id(matricula), None)
+    
+    def top(self, curso_codigo: str, k: int,
+            incluir: Optional[Callable[[Matricula], bool]] = None) -> List[Matricula]:
+        """Las k matrículas con mejor nota del curso, ya ordenadas"""
+        resultado = []
+        for _, _, matricula in self._clasificacion(curso_codigo):
+            if len(resultado) >= k:
+                break
+            if incluir is None or incluir(matricula):
+                resultado.append(matricula)
+        return resultado
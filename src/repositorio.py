@@ -0,0 +1,605 @@
+# src/repositorio.py - Repositorio en memoria: colecciones, índices, IDs y control de cambios
+from typing import Dict, List, Tuple, Optional
+from src.modelos import Estudiante, Curso, Inscripcion, Matricula
+from src.cambios import RegistroCambios
+from src.tabla_matriculas import TablaMatriculas
+from src.posiciones import TablaPosiciones
+from src.indice_ordenado import IndiceOrdenado
+from src.busqueda import IndiceBusqueda
+from src.identificadores import GeneradorIds
+
+class RepositorioAcademico:
+    """Dueño de las cuatro colecciones del sistema y de todo lo que depende de ellas.
+    
+    Mantiene los índices primarios y secundarios, los contadores de IDs, el
+    registro de cambios y la bitácora. Toda alta, edición o baja debe pasar por
+    sus métodos (agregar_*, actualizar_*, eliminar_*, asignar_nota) para que
+    los índices y el control de cambios queden al día; las listas se modifican
+    siempre en su lugar, así que quien las comparta ve los mismos datos.
+    """
+    
+    def __init__(self, estudiantes: List[Estudiante] = None, cursos: List[Curso] = None,
+                 inscripciones: List[Inscripcion] = None, matriculas: List[Matricula] = None,
+                 indexar: bool = True):
+        self.estudiantes = estudiantes if estudiantes is not None else []
+        self.cursos = cursos if cursos is not None else []
+        self.inscripciones = inscripciones if inscripciones is not None else []
+        self.matriculas = matriculas if matriculas is not None else []
+        
+        # Índices hash para búsquedas O(1)
+        self._estudiantes_por_id: Dict[str, Estudiante] = {}
+        self._estudiantes_por_documento: Dict[str, Estudiante] = {}
+        self._estudiantes_por_correo: Dict[str, Estudiante] = {}
+        self._cursos_por_codigo: Dict[str, Curso] = {}
+        self._inscripciones_por_id: Dict[str, Inscripcion] = {}
+        self._matriculas_por_id: Dict[str, Matricula] = {}
+        
+        # Estudiantes ordenados por apellido (sin distinguir mayúsculas) para búsquedas binarias
+        self._estudiantes_por_apellido = IndiceOrdenado(self._clave_apellido)
+        # Índice de búsqueda por nombre, documento y correo; se arma en la primera búsqueda
+        self._busqueda: Optional[IndiceBusqueda] = None
+        
+        # Índices secundarios agrupados (clave -> filas relacionadas)
+        self._inscripciones_por_estudiante: Dict[str, List[Inscripcion]] = {}
+        self._inscripciones_por_curso: Dict[str, List[Inscripcion]] = {}
+        self._matriculas_por_estudiante: Dict[str, List[Matricula]] = {}
+        self._matriculas_por_curso: Dict[str, List[Matricula]] = {}
+        self._matriculas_por_inscripcion: Dict[str, List[Matricula]] = {}
+        # Largo de las cuatro listas tras la última operación de esta clase: si no
+        # coincide, alguien las modificó por fuera (un id repetido no lo altera)
+        self._longitudes: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        
+        # Matrículas en columnas (notas, estudiante y curso codificados) para reportes de notas
+        self._tabla_matriculas = TablaMatriculas()
+        # Clasificación por nota de cada curso (se arma por curso al consultarla)
+        self._posiciones = TablaPosiciones(self._matriculas_por_curso)
+        
+        # Total de créditos inscritos por estudiante, mantenido incrementalmente
+        self._creditos_por_estudiante: Dict[str, int] = {}
+        # Contadores de IDs por tipo de entidad (se siembran con los datos cargados);
+        # para pedir IDs usar siguiente_id/reservar_ids, que arman antes los índices
+        self.ids = GeneradorIds()
+        # Con indexar=False los índices se arman en la primera consulta u operación
+        # (para colecciones que se leen del disco la primera vez que se usan)
+        self._indices_listos = False
+        if indexar:
+            self.reconstruir_indices()
+        
+        # Tablas modificadas desde el último guardado
+        self.cambios = RegistroCambios()
+        # Bitácora de operaciones opcional (ver src/bitacora.py)
+        self.bitacora = None
+    
+    def reconstruir_indices(self):
+        """Reconstruye todos los índices a partir de las listas"""
+        self._estudiantes_por_id.clear()
+        self._estudiantes_por_documento.clear()
+        self._estudiantes_por_correo.clear()
+        self._cursos_por_codigo.clear()
+        self._inscripciones_por_id.clear()
+        self._matriculas_por_id.clear()
+        self._inscripciones_por_estudiante.clear()
+        self._inscripciones_por_curso.clear()
+        self._matriculas_por_estudiante.clear()
+        self._matriculas_por_curso.clear()
+        self._matriculas_por_inscripcion.clear()
+        self._tabla_matriculas = TablaMatriculas()
+        self._posiciones = TablaPosiciones(self._matriculas_por_curso)
+        self._creditos_por_estudiante.clear()
+        
+        for estudiante in self.estudiantes:
+            self._indexar_estudiante(estudiante)
+        self._estudiantes_por_apellido.reconstruir(self.estudiantes)
+        self._busqueda = None
+        for curso in self.cursos:
+            self._cursos_por_codigo.setdefault(curso.codigo, curso)
+        for inscripcion in self.inscripciones:
+            self._indexar_inscripcion(inscripcion)
+        for matricula in self.matriculas:
+            self._indexar_matricula(matricula)
+        
+        self.ids.observar_todos('estudiante', self._estudiantes_por_id)
+        self.ids.observar_todos('curso', self._cursos_por_codigo)
+        self.ids.observar_todos('inscripcion', self._inscripciones_por_id)
+        self.ids.observar_todos('matricula', (matricula.id for matricula in self.matriculas))
+        self._indices_listos = True
+        self._anotar_longitudes()
+    
+    def _medir_longitudes(self) -> Tuple[int, int, int, int]:
+        """Largo actual de las cuatro listas"""
+        return len(self.estudiantes), len(self.cursos), len(self.inscripciones), len(self.matriculas)
+    
+    def _anotar_longitudes(self):
+        """Anota el largo de las listas después de modificarlas a través de esta clase"""
+        self._longitudes = self._medir_longitudes()
+    
+    def _verificar_indices(self):
+        """Arma los índices la primera vez y los reconstruye si las listas se modificaron sin pasar por esta clase"""
+        if not self._indices_listos:
+            self.reconstruir_indices()
+            return
+        if self._medir_longitudes() != self._longitudes:
+            self.reconstruir_indices()
+            # No se sabe qué cambió: guardar todo
+            self.cambios.marcar_todo()
+    
+    @staticmethod
+    def _clave_apellido(estudiante: Estudiante) -> str:
+        """Clave del índice por apellido"""
+        return estudiante.apellidos.lower()
+    
+    def _indexar_estudiante(self, estudiante: Estudiante):
+        """Agrega un estudiante a los índices (gana la primera aparición)"""
+        self._estudiantes_por_id.setdefault(estudiante.id, estudiante)
+        self._estudiantes_por_documento.setdefault(estudiante.documento, estudiante)
+        self._estudiantes_por_correo.setdefault(estudiante.correo.lower(), estudiante)
+    
+    def _desindexar_estudiante(self, estudiante: Estudiante):
+        """Quita un estudiante de los índices"""
+        if self._estudiantes_por_id.get(estudiante.id) is estudiante:
+            del self._estudiantes_por_id[estudiante.id]
+        if self._estudiantes_por_documento.get(estudiante.documento) is estudiante:
+            del self._estudiantes_por_documento[estudiante.documento]
+        if self._estudiantes_por_correo.get(estudiante.correo.lower()) is estudiante:
+            del self._estudiantes_por_correo[estudiante.correo.lower()]
+    
+    def _registrar(self, operacion: str, tabla: str, elemento):
+        """Registra una operación en el control de cambios y en la bitácora"""
+        if operacion == 'alta':
+            self.cambios.registrar_alta(tabla, elemento)
+        elif operacion == 'nota':
+            self.cambios.registrar_nota(tabla, elemento)
+        else:
+            self.cambios.registrar_modificacion(tabla)
+        if self.bitacora is not None:
+            self.bitacora.registrar(operacion, tabla, elemento)
+    
+    def _registrar_altas(self, tabla: str, elementos: list):
+        """Registra un lote de altas; en la bitácora queda como una sola operación atómica"""
+        for elemento in elementos:
+            self.cambios.registrar_alta(tabla, elemento)
+        if self.bitacora is not None and elementos:
+            self.bitacora.registrar_altas(tabla, elementos)
+    
+    @staticmethod
+    def _agregar_a_grupo(indice: dict, clave: str, elemento):
+        """Agrega un elemento a la lista agrupada bajo la clave"""
+        indice.setdefault(clave, []).append(elemento)
+    
+    @staticmethod
+    def _quitar_de_grupo(indice: dict, clave: str, elemento):
+        """Quita un elemento de la lista agrupada bajo la clave"""
+        grupo = indice.get(clave)
+        if grupo is None:
+            return
+        for i, actual in enumerate(grupo):
+            if actual is elemento:
+                del grupo[i]
+                break
+        if not grupo:
+            del indice[clave]
+    
+    def _sumar_creditos(self, estudiante_id: str, creditos: int):
+        """Ajusta el total de créditos cacheado de un estudiante"""
+        total = self._creditos_por_estudiante.get(estudiante_id, 0) + creditos
+        if total:
+            self._creditos_por_estudiante[estudiante_id] = total
+        else:
+            self._creditos_por_estudiante.pop(estudiante_id, None)
+    
+    def _ajustar_creditos_curso(self, curso_codigo: str, delta: int):
+        """Suma delta créditos a cada estudiante inscrito en el curso"""
+        if delta:
+            for inscripcion in self._inscripciones_por_curso.get(curso_codigo, []):
+                self._sumar_creditos(inscripcion.estudiante_id, delta)
+    
+    def _indexar_inscripcion(self, inscripcion: Inscripcion):
+        """Agrega una inscripción a los índices"""
+        self._inscripciones_por_id.setdefault(inscripcion.id, inscripcion)
+        self._agregar_a_grupo(self._inscripciones_por_estudiante, inscripcion.estudiante_id, inscripcion)
+        self._agregar_a_grupo(self._inscripciones_por_curso, inscripcion.curso_codigo, inscripcion)
+        curso = self._cursos_por_codigo.get(inscripcion.curso_codigo)
+        if curso:
+            self._sumar_creditos(inscripcion.estudiante_id, curso.creditos)
+    
+    def _desindexar_inscripcion(self, inscripcion: Inscripcion):
+        """Quita una inscripción de los índices"""
+        if self._inscripciones_por_id.get(inscripcion.id) is inscripcion:
+            del self._inscripciones_por_id[inscripcion.id]
+        self._quitar_de_grupo(self._inscripciones_por_estudiante, inscripcion.estudiante_id, inscripcion)
+        self._quitar_de_grupo(self._inscripciones_por_curso, inscripcion.curso_codigo, inscripcion)
+        curso = self._cursos_por_codigo.get(inscripcion.curso_codigo)
+        if curso:
+            self._sumar_creditos(inscripcion.estudiante_id, -curso.creditos)
+    
+    def _indexar_matricula(self, matricula: Matricula):
+        """Agrega una matrícula a los índices"""
+        self._matriculas_por_id.setdefault(matricula.id, matricula)
+        self._agregar_a_grupo(self._matriculas_por_estudiante, matricula.estudiante_id, matricula)
+        self._agregar_a_grupo(self._matriculas_por_curso, matricula.curso_codigo, matricula)
+        self._agregar_a_grupo(self._matriculas_por_inscripcion, matricula.inscripcion_id, matricula)
+        self._tabla_matriculas.agregar(matricula)
+        self._posiciones.agregar(matricula)
+    
+    def _desindexar_matricula(self, matricula: Matricula):
+        """Quita una matrícula de los índices"""
+        if self._matriculas_por_id.get(matricula.id) is matricula:
+            del self._matriculas_por_id[matricula.id]
+        self._quitar_de_grupo(self._matriculas_por_estudiante, matricula.estudiante_id, matricula)
+        self._quitar_de_grupo(self._matriculas_por_curso, matricula.curso_codigo, matricula)
+        self._quitar_de_grupo(self._matriculas_por_inscripcion, matricula.inscripcion_id, matricula)
+        self._tabla_matriculas.quitar(matricula)
+        self._posiciones.quitar(matricula)
+    
+    def agregar_estudiante(self, estudiante: Estudiante):
+        """Agrega un estudiante a la lista y a los índices"""
+        self._verificar_indices()
+        self.estudiantes.append(estudiante)
+        self._anotar_longitudes()
+        self.ids.observar('estudiante', estudiante.id)
+        self._indexar_estudiante(estudiante)
+        self._estudiantes_por_apellido.agregar(estudiante)
+        if self._busqueda is not None:
+            self._busqueda.agregar(estudiante)
+        self._registrar('alta', 'estudiantes', estudiante)
+    
+    def agregar_estudiantes(self, estudiantes: List[Estudiante]):
+        """Agrega un lote de estudiantes; el índice por apellido se intercala una sola vez"""
+        self._verificar_indices()
+        self.estudiantes.extend(estudiantes)
+        self._anotar_longitudes()
+        for estudiante in estudiantes:
+            self.ids.observar('estudiante', estudiante.id)
+            self._indexar_estudiante(estudiante)
+        self._estudiantes_por_apellido.agregar_varios(estudiantes)
+        # El índice de búsqueda se vuelve a armar en la próxima búsqueda
+        self._busqueda = None
+        self._registrar_altas('estudiantes', estudiantes)
+    
+    def actualizar_estudiante(self, estudiante: Estudiante, **cambios):
+        """Modifica los campos de un estudiante manteniendo los índices"""
+        self._verificar_indices()
+        self._desindexar_estudiante(estudiante)
+        for campo, valor in cambios.items():
+            setattr(estudiante, campo, valor)
+        self._indexar_estudiante(estudiante)
+        if 'apellidos' in cambios:
+            self._estudiantes_por_apellido.actualizar(estudiante)
+        if self._busqueda is not None:
+            self._busqueda.actualizar(estudiante)
+        self._registrar('edicion', 'estudiantes', estudiante)
+    
+    def eliminar_estudiante(self, estudiante: Estudiante):
+        """Elimina un estudiante de la lista y de los índices"""
+        self._verificar_indices()
+        self.estudiantes.remove(estudiante)
+        self._anotar_longitudes()
+        self._desindexar_estudiante(estudiante)
+        self._estudiantes_por_apellido.quitar(estudiante)
+        if self._busqueda is not None:
+            self._busqueda.quitar(estudiante)
+        self._registrar('baja', 'estudiantes', estudiante)
+    
+    @staticmethod
+    def _filtrar_lista(lista: list, elementos: list):
+        """Quita de la lista (en su lugar, sin cambiar el objeto) los elementos dados, en una pasada"""
+        if elementos:
+            quitar = set(map(id, elementos))
+            lista[:] = [elemento for elemento in lista if id(elemento) not in quitar]
+    
+    @classmethod
+    def _quitar_de_grupos(cls, indice: dict, elementos: list, campo: str):
+        """Quita varios elementos de un índice agrupado filtrando una vez cada grupo afectado"""
+        por_clave: Dict[str, list] = {}
+        for elemento in elementos:
+            por_clave.setdefault(getattr(elemento, campo), []).append(elemento)
+        for clave, quitar in por_clave.items():
+            grupo = indice.get(clave)
+            if grupo is None:
+                continue
+            cls._filtrar_lista(grupo, quitar)
+            if not grupo:
+                del indice[clave]
+    
+    def eliminar_estudiantes_en_cascada(self, estudiantes: List[Estudiante]) -> Tuple[List[Inscripcion], List[Matricula]]:
+        """Elimina estudiantes junto con sus inscripciones y matrículas; retorna las filas borradas.
+        
+        Las filas relacionadas salen de los índices por estudiante (O(k) para k filas)
+        y cada lista se filtra una sola vez en su lugar, sin importar cuántos estudiantes
+        se borren: quien tenga una referencia a las listas (main, InterfazUsuario,
+        la persistencia) ve los mismos datos. En la bitácora queda una sola operación.
+        """
+        self._verificar_indices()
+        estudiantes = list(estudiantes)
+        inscripciones: List[Inscripcion] = []
+        matriculas: List[Matricula] = []
+        for estudiante in estudiantes:
+            inscripciones.extend(self._inscripciones_por_estudiante.pop(estudiante.id, []))
+            matriculas.extend(self._matriculas_por_estudiante.pop(estudiante.id, []))
+        
+        for inscripcion in inscripciones:
+            if self._inscripciones_por_id.get(inscripcion.id) is inscripcion:
+                del self._inscripciones_por_id[inscripcion.id]
+        self._quitar_de_grupos(self._inscripciones_por_curso, inscripciones, 'curso_codigo')
+        
+        for matricula in matriculas:
+            if self._matriculas_por_id.get(matricula.id) is matricula:
+                del self._matriculas_por_id[matricula.id]
+            self._tabla_matriculas.quitar(matricula)
+            self._posiciones.quitar(matricula)
+        self._quitar_de_grupos(self._matriculas_por_curso, matriculas, 'curso_codigo')
+        self._quitar_de_grupos(self._matriculas_por_inscripcion, matriculas, 'inscripcion_id')
+        
+        for estudiante in estudiantes:
+            # Sin inscripciones, el estudiante ya no suma créditos
+            self._creditos_por_estudiante.pop(estudiante.id, None)
+            self._desindexar_estudiante(estudiante)
+            self._estudiantes_por_apellido.quitar(estudiante)
+            if self._busqueda is not None:
+                self._busqueda.quitar(estudiante)
+        
+        self._filtrar_lista(self.inscripciones, inscripciones)
+        self._filtrar_lista(self.matriculas, matriculas)
+        self._filtrar_lista(self.estudiantes, estudiantes)
+        self._anotar_longitudes()
+        
+        if estudiantes:
+            self.cambios.registrar_modificacion('estudiantes')
+            if inscripciones:
+                self.cambios.registrar_modificacion('inscripciones')
+            if matriculas:
+                self.cambios.registrar_modificacion('matriculas')
+            if self.bitacora is not None:
+                self.bitacora.registrar_bajas_en_cascada(estudiantes)
+        return inscripciones, matriculas
+    
+    def agregar_curso(self, curso: Curso):
+        """Agrega un curso a la lista y al índice"""
+        self._verificar_indices()
+        self.cursos.append(curso)
+        self._anotar_longitudes()
+        self.ids.observar('curso', curso.codigo)
+        if curso.codigo not in self._cursos_por_codigo:
+            self._cursos_por_codigo[curso.codigo] = curso
+            self._ajustar_creditos_curso(curso.codigo, curso.creditos)
+        self._registrar('alta', 'cursos', curso)
+    
+    def actualizar_curso(self, curso: Curso, **cambios):
+        """Modifica los campos de un curso, ajustando los créditos de sus inscritos"""
+        self._verificar_indices()
+        creditos_anteriores = curso.creditos
+        for campo, valor in cambios.items():
+            setattr(curso, campo, valor)
+        if self._cursos_por_codigo.get(curso.codigo) is curso:
+            self._ajustar_creditos_curso(curso.codigo, curso.creditos - creditos_anteriores)
+        self._registrar('edicion', 'cursos', curso)
+    
+    def eliminar_curso(self, curso: Curso):
+        """Elimina un curso de la lista y del índice"""
+        self._verificar_indices()
+        self.cursos.remove(curso)
+        self._anotar_longitudes()
+        if self._cursos_por_codigo.get(curso.codigo) is curso:
+            del self._cursos_por_codigo[curso.codigo]
+            self._ajustar_creditos_curso(curso.codigo, -curso.creditos)
+        self._registrar('baja', 'cursos', curso)
+    
+    def agregar_inscripcion(self, inscripcion: Inscripcion):
+        """Agrega una inscripción a la lista y al índice"""
+        self._verificar_indices()
+        self.inscripciones.append(inscripcion)
+        self._anotar_longitudes()
+        self.ids.observar('inscripcion', inscripcion.id)
+        self._indexar_inscripcion(inscripcion)
+        self._registrar('alta', 'inscripciones', inscripcion)
+    
+    def agregar_inscripciones(self, inscripciones: List[Inscripcion]):
+        """Agrega un lote de inscripciones a la lista y a los índices"""
+        self._verificar_indices()
+        self.inscripciones.extend(inscripciones)
+        self._anotar_longitudes()
+        for inscripcion in inscripciones:
+            self.ids.observar('inscripcion', inscripcion.id)
+            self._indexar_inscripcion(inscripcion)
+        self._registrar_altas('inscripciones', inscripciones)
+    
+    def actualizar_inscripcion(self, inscripcion: Inscripcion, **cambios):
+        """Modifica los campos de una inscripción manteniendo los índices"""
+        self._verificar_indices()
+        self._desindexar_inscripcion(inscripcion)
+        for campo, valor in cambios.items():
+            setattr(inscripcion, campo, valor)
+        self._indexar_inscripcion(inscripcion)
+        self._registrar('edicion', 'inscripciones', inscripcion)
+    
+    def eliminar_inscripcion(self, inscripcion: Inscripcion):
+        """Elimina una inscripción de la lista y del índice"""
+        self._verificar_indices()
+        self.inscripciones.remove(inscripcion)
+        self._anotar_longitudes()
+        self._desindexar_inscripcion(inscripcion)
+        self._registrar('baja', 'inscripciones', inscripcion)
+    
+    def agregar_matricula(self, matricula: Matricula):
+        """Agrega una matrícula a la lista y a los índices"""
+        self._verificar_indices()
+        self.matriculas.append(matricula)
+        self._anotar_longitudes()
+        self.ids.observar('matricula', matricula.id)
+        self._indexar_matricula(matricula)
+        self._registrar('alta', 'matriculas', matricula)
+    
+    def agregar_matriculas(self, matriculas: List[Matricula]):
+        """Agrega un lote de matrículas a la lista y a los índices"""
+        self._verificar_indices()
+        self.matriculas.extend(matriculas)
+        self._anotar_longitudes()
+        for matricula in matriculas:
+            self.ids.observar('matricula', matricula.id)
+            self._indexar_matricula(matricula)
+        self._registrar_altas('matriculas', matriculas)
+    
+    def asignar_nota(self, matricula: Matricula, nota: Optional[float]):
+        """Asigna la nota de una matrícula"""
+        self._verificar_indices()
+        matricula.nota = nota
+        self._tabla_matriculas.actualizar_nota(matricula)
+        self._posiciones.actualizar_nota(matricula)
+        self._registrar('nota', 'matriculas', matricula)
+    
+    def asignar_notas(self, notas: List[Tuple[Matricula, Optional[float]]]):
+        """Asigna un lote de notas en una pasada; en la bitácora queda como una sola operación"""
+        self._verificar_indices()
+        for matricula, nota in notas:
+            matricula.nota = nota
+            self._tabla_matriculas.actualizar_nota(matricula)
+        matriculas = [matricula for matricula, _ in notas]
+        self._posiciones.actualizar_notas(matriculas)
+        for matricula in matriculas:
+            self.cambios.registrar_nota('matriculas', matricula)
+        if matriculas and self.bitacora is not None:
+            self.bitacora.registrar_notas(matriculas)
+    
+    def eliminar_matricula(self, matricula: Matricula):
+        """Elimina una matrícula de la lista y de los índices"""
+        self._verificar_indices()
+        self.matriculas.remove(matricula)
+        self._anotar_longitudes()
+        self._desindexar_matricula(matricula)
+        self._registrar('baja', 'matriculas', matricula)
+    
+    def siguiente_id(self, tipo: str) -> str:
+        """Genera el siguiente ID de un tipo, contando los datos ya cargados"""
+        self._verificar_indices()
+        return self.ids.siguiente(tipo)
+    
+    def reservar_ids(self, tipo: str, cantidad: int) -> List[str]:
+        """Reserva cantidad IDs consecutivos de un tipo, para cargas por lotes"""
+        self._verificar_indices()
+        return self.ids.reservar(tipo, cantidad)
+    
+    def obtener_inscripciones_de_estudiante(self, estudiante_id: str) -> List[Inscripcion]:
+        """Retorna las inscripciones de un estudiante"""
+        self._verificar_indices()
+        return list(self._inscripciones_por_estudiante.get(estudiante_id, []))
+    
+    def obtener_matriculas_de_estudiante(self, estudiante_id: str) -> List[Matricula]:
+        """Retorna las matrículas de un estudiante"""
+        self._verificar_indices()
+        return list(self._matriculas_por_estudiante.get(estudiante_id, []))
+    
+    def obtener_matriculas_de_inscripcion(self, inscripcion_id: str) -> List[Matricula]:
+        """Retorna las matrículas generadas a partir de una inscripción"""
+        self._verificar_indices()
+        return list(self._matriculas_por_inscripcion.get(inscripcion_id, []))
+    
+    def tiene_matricula(self, inscripcion_id: str) -> bool:
+        """Verifica si una inscripción ya se convirtió en matrícula"""
+        self._verificar_indices()
+        return inscripcion_id in self._matriculas_por_inscripcion
+    
+    def buscar_estudiante_por_documento(self, documento: str) -> Optional[Estudiante]:
+        """Busca estudiante por número de documento"""
+        self._verificar_indices()
+        return self._estudiantes_por_documento.get(documento)
+    
+    def buscar_estudiante_por_correo(self, correo: str) -> Optional[Estudiante]:
+        """Busca estudiante por correo electrónico"""
+        self._verificar_indices()
+        return self._estudiantes_por_correo.get(correo.lower())
+    
+    def obtener_creditos_inscritos_por_estudiante(self, estudiante_id: str) -> int:
+        """Calcula total de créditos inscritos por un estudiante (basado en inscripciones)"""
+        self._verificar_indices()
+        return self._creditos_por_estudiante.get(estudiante_id, 0)
+    
+    def verificar_creditos(self, corregir: bool = False) -> Dict[str, Tuple[int, int]]:
+        """Recalcula los créditos desde cero y retorna las diferencias {estudiante_id: (cacheado, real)}"""
+        self._verificar_indices()
+        reales: Dict[str, int] = {}
+        for inscripcion in self.inscripciones:
+            curso = self._cursos_por_codigo.get(inscripcion.curso_codigo)
+            if curso:
+                reales[inscripcion.estudiante_id] = reales.get(inscripcion.estudiante_id, 0) + curso.creditos
+        
+        diferencias = {}
+        for estudiante_id in set(reales) | set(self._creditos_por_estudiante):
+            cacheado = self._creditos_por_estudiante.get(estudiante_id, 0)
+            real = reales.get(estudiante_id, 0)
+            if cacheado != real:
+                diferencias[estudiante_id] = (cacheado, real)
+        
+        if corregir and diferencias:
+            self._creditos_por_estudiante = {k: v for k, v in reales.items() if v}
+        
+        return diferencias
+    
+    def buscar_estudiante_por_id(self, estudiante_id: str) -> Optional[Estudiante]:
+        """Busca estudiante por ID"""
+        self._verificar_indices()
+        return self._estudiantes_por_id.get(estudiante_id)
+    
+    def buscar_curso_por_codigo(self, codigo: str) -> Optional[Curso]:
+        """Busca curso por código"""
+        self._verificar_indices()
+        return self._cursos_por_codigo.get(codigo)
+    
+    def buscar_matricula_por_id(self, matricula_id: str) -> Optional[Matricula]:
+        """Busca matrícula por ID"""
+        self._verificar_indices()
+        return self._matriculas_por_id.get(matricula_id)
+    
+    def buscar_inscripcion_por_id(self, inscripcion_id: str) -> Optional[Inscripcion]:
+        """Busca inscripción por ID"""
+        self._verificar_indices()
+        return self._inscripciones_por_id.get(inscripcion_id)
+    
+    # Índices para las consultas (ver ConsultasAcademicas): se arman si hace falta
+    # y son de solo lectura; toda modificación pasa por los métodos de arriba
+    
+    def indice_apellidos(self) -> IndiceOrdenado:
+        """Estudiantes ordenados por apellido, sin distinguir mayúsculas"""
+        self._verificar_indices()
+        return self._estudiantes_por_apellido
+    
+    def indice_busqueda(self) -> IndiceBusqueda:
+        """Índice de búsqueda por nombres, apellidos, documento y correo; se arma en la primera búsqueda"""
+        self._verificar_indices()
+        if self._busqueda is None:
+            self._busqueda = IndiceBusqueda(self.estudiantes)
+        return self._busqueda
+    
+    def posiciones(self) -> TablaPosiciones:
+        """Clasificación por nota de cada curso"""
+        self._verificar_indices()
+        return self._posiciones
+    
+    def tabla_matriculas(self) -> TablaMatriculas:
+        """Matrículas en columnas, para los reportes de notas"""
+        self._verificar_indices()
+        return self._tabla_matriculas
+    
+    def estudiantes_por_id(self) -> Dict[str, Estudiante]:
+        """Índice de estudiantes por ID"""
+        self._verificar_indices()
+        return self._estudiantes_por_id
+    
+    def cursos_por_codigo(self) -> Dict[str, Curso]:
+        """Índice de cursos por código"""
+        self._verificar_indices()
+        return self._cursos_por_codigo
+    
+    def inscripciones_por_curso(self) -> Dict[str, List[Inscripcion]]:
+        """Inscripciones agrupadas por código de curso"""
+        self._verificar_indices()
+        return self._inscripciones_por_curso
+    
+    def matriculas_por_curso(self) -> Dict[str, List[Matricula]]:
+        """Matrículas agrupadas por código de curso"""
+        self._verificar_indices()
+        return self._matriculas_por_curso
+    
+    def matriculas_por_inscripcion(self) -> Dict[str, List[Matricula]]:
+        """Matrículas agrupadas por ID de inscripción"""
+        self._verificar_indices()
+        return self._matriculas_por_inscripcion
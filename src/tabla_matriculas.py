@@ -0,0 +1,222 @@
+# src/tabla_matriculas.py - Almacenamiento en columnas de las matrículas para análisis de notas
+import math
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.modelos import Matricula
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se recorren los arreglos en Python
+    np = None
+
+# Valor centinela para "sin nota" y código de una fila eliminada
+SIN_NOTA = math.nan
+FILA_ELIMINADA = -1
+
+# Percentiles que incluye el reporte de estadísticas (el 50 es la mediana)
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _percentil(ordenados, percentil: float) -> float:
+    """Percentil con interpolación lineal sobre valores ya ordenados (mismo criterio que NumPy)"""
+    posicion = (len(ordenados) - 1) * percentil / 100
+    inferior = math.floor(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    fraccion = posicion - inferior
+    return float(ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * fraccion)
+
+
+def _resumen(ordenados, promedio: float, desviacion: float, nota_aprobatoria: float) -> Dict:
+    """Estadísticas de las notas (ordenadas) de un curso"""
+    cantidad = len(ordenados)
+    # Las notas están ordenadas: las aprobadas son las que quedan desde la primera >= nota_aprobatoria
+    aprobadas = cantidad - int(bisect_left(ordenados, nota_aprobatoria))
+    percentiles = {p: _percentil(ordenados, p) for p in PERCENTILES}
+    return {
+        'cantidad': cantidad,
+        'promedio': float(promedio),
+        'mediana': percentiles[50],
+        'desviacion': float(desviacion),
+        'tasa_aprobacion': aprobadas / cantidad,
+        'minima': float(ordenados[0]),
+        'maxima': float(ordenados[-1]),
+        'percentiles': percentiles,
+    }
+
+
+class TablaMatriculas:
+    """Guarda las matrículas en columnas para filtrar y agregar notas en bloque.
+    
+    - notas: array('d') con NaN para las matrículas sin nota
+    - estudiantes / cursos: array('q') con el código entero de estudiante_id y curso_codigo
+    
+    Con NumPy las columnas se leen sin copiarlas (np.frombuffer) y los filtros y
+    agregados por curso son operaciones vectorizadas; sin NumPy se recorren con
+    un ciclo sobre los arreglos.
+    
+    Las filas eliminadas quedan como huecos (nota NaN, códigos -1) para que las
+    posiciones no cambien; la tabla se compacta cuando los huecos son mayoría.
+    """
+    
+    def __init__(self, matriculas: Iterable[Matricula] = ()):
+        self._vaciar()
+        for matricula in matriculas:
+            self.agregar(matricula)
+    
+    def _vaciar(self):
+        """Deja la tabla sin filas"""
+        self.notas = array('d')
+        self.estudiantes = array('q')
+        self.cursos = array('q')
+        self._filas: List[Optional[Matricula]] = []
+        self._posiciones: Dict[int, int] = {}  # id(matricula) -> fila
+        self._huecos = 0
+        
+        # Diccionarios de códigos enteros <-> claves de texto
+        self.codigos_estudiante: List[str] = []
+        self.codigos_curso: List[str] = []
+        self._codigo_estudiante: Dict[str, int] = {}
+        self._codigo_curso: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        """Número de matrículas vigentes en la tabla"""
+        return len(self._filas) - self._huecos
+    
+    @staticmethod
+    def _codificar(clave: str, codigos: List[str], por_clave: Dict[str, int]) -> int:
+        """Retorna el código entero de la clave, asignando uno nuevo si no existe"""
+        codigo = por_clave.get(clave)
+        if codigo is None:
+            codigo = por_clave[clave] = len(codigos)
+            codigos.append(clave)
+        return codigo
+    
+    def codigo_curso(self, curso_codigo: str) -> Optional[int]:
+        """Código entero de un curso, o None si no tiene matrículas registradas"""
+        return self._codigo_curso.get(curso_codigo)
+    
+    def agregar(self, matricula: Matricula):
+        """Agrega una matrícula al final de la tabla"""
+        self._posiciones[id(matricula)] = len(self._filas)
+        self._filas.append(matricula)
+        self.notas.append(SIN_NOTA if matricula.nota is None else matricula.nota)
+        self.estudiantes.append(self._codificar(matricula.estudiante_id, self.codigos_estudiante,
+                                                self._codigo_estudiante))
+        self.cursos.append(self._codificar(matricula.curso_codigo, self.codigos_curso, self._codigo_curso))
+    
+    def actualizar_nota(self, matricula: Matricula):
+        """Copia a la columna la nota actual de la matrícula"""
+        fila = self._posiciones.get(id(matricula))
+        if fila is not None:
+            self.notas[fila] = SIN_NOTA if matricula.nota is None else matricula.nota
+    
+    def quitar(self, matricula: Matricula):
+        """Quita una matrícula dejando un hueco en su fila"""
+        fila = self._posiciones.pop(id(matricula), None)
+        if fila is None:
+            return
+        self._filas[fila] = None
+        self.notas[fila] = SIN_NOTA
+        self.estudiantes[fila] = FILA_ELIMINADA
+        self.cursos[fila] = FILA_ELIMINADA
+        self._huecos += 1
+        
+        if self._huecos * 2 > len(self._filas):
+            self.compactar()
+    
+    def compactar(self):
+        """Reconstruye las columnas sin huecos, conservando el orden de las filas"""
+        vigentes = [matricula for matricula in self._filas if matricula is not None]
+        self._vaciar()
+        for matricula in vigentes:
+            self.agregar(matricula)
+    
+    def matricula(self, fila: int) -> Matricula:
+        """Retorna la matrícula guardada en una fila"""
+        return self._filas[fila]
+    
+    def filas_con_nota_menor(self, nota_minima: float) -> List[int]:
+        """Filas cuya nota es menor que nota_minima (las matrículas sin nota no cuentan)"""
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.notas) < nota_minima).tolist()
+        return [fila for fila, nota in enumerate(self.notas) if nota < nota_minima]
+    
+    def filas_con_nota_de_curso(self, curso_codigo: str) -> List[int]:
+        """Filas de un curso que tienen nota asignada"""
+        codigo = self._codigo_curso.get(curso_codigo)
+        if codigo is None:
+            return []
+        if np is not None:
+            notas = np.frombuffer(self.notas)
+            cursos = np.frombuffer(self.cursos, dtype=np.int64)
+            return np.flatnonzero((cursos == codigo) & ~np.isnan(notas)).tolist()
+        return [fila for fila, (curso, nota) in enumerate(zip(self.cursos, self.notas))
+                if curso == codigo and nota == nota]  # NaN != NaN
+    
+    def conteo_y_suma_por_curso(self) -> Dict[str, Tuple[int, float]]:
+        """Cantidad de notas y suma de notas de cada curso, en una sola pasada"""
+        n_cursos = len(self.codigos_curso)
+        if np is not None:
+            notas = np.frombuffer(self.notas)
+            cursos = np.frombuffer(self.cursos, dtype=np.int64)
+            con_nota = ~np.isnan(notas)
+            conteos = np.bincount(cursos[con_nota], minlength=n_cursos).tolist()
+            sumas = np.bincount(cursos[con_nota], weights=notas[con_nota], minlength=n_cursos).tolist()
+        else:
+            conteos = [0] * n_cursos
+            sumas = [0.0] * n_cursos
+            for curso, nota in zip(self.cursos, self.notas):
+                if nota == nota:  # NaN != NaN: se omiten las filas sin nota
+                    conteos[curso] += 1
+                    sumas[curso] += nota
+        
+        return {self.codigos_curso[codigo]: (conteos[codigo], sumas[codigo])
+                for codigo in range(n_cursos) if conteos[codigo]}
+    
+    def promedios_por_curso(self) -> Dict[str, float]:
+        """Promedio de notas de cada curso con al menos una nota"""
+        return {curso: suma / cantidad for curso, (cantidad, suma) in self.conteo_y_suma_por_curso().items()}
+    
+    def estadisticas_por_curso(self, nota_aprobatoria: float = 3.0) -> Dict[str, Dict]:
+        """Estadísticas de notas de todos los cursos con una sola agrupación de la columna.
+        
+        Por curso: cantidad, promedio, mediana, desviación estándar (poblacional),
+        tasa de aprobación (nota >= nota_aprobatoria), mínima, máxima y percentiles.
+        """
+        estadisticas = {}
+        
+        if np is not None:
+            notas = np.frombuffer(self.notas)
+            cursos = np.frombuffer(self.cursos, dtype=np.int64)
+            con_nota = ~np.isnan(notas)
+            notas, cursos = notas[con_nota], cursos[con_nota]
+            if not len(notas):
+                return estadisticas
+            
+            # Ordenar por curso y, dentro de cada curso, por nota: cada curso queda en un tramo contiguo
+            orden = np.lexsort((notas, cursos))
+            notas, cursos = notas[orden], cursos[orden]
+            inicios = np.flatnonzero(np.r_[True, cursos[1:] != cursos[:-1]])
+            fines = np.r_[inicios[1:], len(notas)]
+            
+            for inicio, fin in zip(inicios.tolist(), fines.tolist()):
+                tramo = notas[inicio:fin]
+                estadisticas[self.codigos_curso[cursos[inicio]]] = _resumen(
+                    tramo, tramo.mean(), tramo.std(), nota_aprobatoria)
+            return estadisticas
+        
+        grupos: Dict[int, List[float]] = {}
+        for curso, nota in zip(self.cursos, self.notas):
+            if nota == nota:  # NaN != NaN: se omiten las filas sin nota
+                grupo = grupos.get(curso)
+                if grupo is None:
+                    grupo = grupos[curso] = []
+                grupo.append(nota)
+        
+        for curso, grupo in grupos.items():
+            grupo.sort()
+            promedio = math.fsum(grupo) / len(grupo)
+            desviacion = math.sqrt(math.fsum((nota - promedio) ** 2 for nota in grupo) / len(grupo))
+            estadisticas[self.codigos_curso[curso]] = _resumen(grupo, promedio, desviacion, nota_aprobatoria)
+        return estadisticas
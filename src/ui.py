@@ -1,57 +1,32 @@
 # src/ui.py - Versión completa con editar y eliminar
+import os
 from typing import List 
 from datetime import datetime
 from src.modelos import Estudiante, Curso, Inscripcion, Matricula
 from src.validaciones import validar_estudiante_completo, validar_fecha, validar_creditos, validar_nota, validar_correo
 from src.consultas import ConsultasAcademicas
+from src.importacion import importar_estudiantes_csv, cargar_notas_csv
+from src.operaciones_lote import matricular_pendientes
 
 class InterfazUsuario:
     """Interfaz de usuario para el sistema MiniSIGA"""
     
-    def __init__(self, estudiantes: List[Estudiante], cursos: List[Curso], 
-                 inscripciones: List[Inscripcion], matriculas: List[Matricula]):
-        self.estudiantes = estudiantes
-        self.cursos = cursos
-        self.inscripciones = inscripciones
-        self.matriculas = matriculas
-        self.consultas = ConsultasAcademicas(estudiantes, cursos, inscripciones, matriculas)
+    def __init__(self, consultas: ConsultasAcademicas):
+        # Las listas son las del repositorio: solo se leen aquí, los cambios pasan por consultas
+        self.consultas = consultas
+        self.estudiantes = consultas.estudiantes
+        self.cursos = consultas.cursos
+        self.inscripciones = consultas.inscripciones
+        self.matriculas = consultas.matriculas
         self.limite_creditos = 20
     
     def generar_siguiente_id(self, tipo: str) -> str:
-        """Genera el siguiente ID autoincremental para cada tipo de entidad"""
-        if tipo == "estudiante":
-            max_num = 0
-            for est in self.estudiantes:
-                if est.id.startswith("E") and est.id[1:].isdigit():
-                    num = int(est.id[1:])
-                    max_num = max(max_num, num)
-            return f"E{max_num + 1}"
-        
-        elif tipo == "curso":
-            max_num = 0
-            for curso in self.cursos:
-                if curso.codigo.startswith("C") and curso.codigo[1:].isdigit():
-                    num = int(curso.codigo[1:])
-                    max_num = max(max_num, num)
-            return f"C{max_num + 1}"
-        
-        elif tipo == "inscripcion":
-            max_num = 0
-            for insc in self.inscripciones:
-                if insc.id.startswith("I") and insc.id[1:].isdigit():
-                    num = int(insc.id[1:])
-                    max_num = max(max_num, num)
-            return f"I{max_num + 1}"
-        
-        elif tipo == "matricula":
-            max_num = 0
-            for mat in self.matriculas:
-                if mat.id.startswith("M") and mat.id[1:].isdigit():
-                    num = int(mat.id[1:])
-                    max_num = max(max_num, num)
-            return f"M{max_num + 1}"
-        
-        return "ID1"
+        """Genera el siguiente ID autoincremental para cada tipo de entidad (ver GeneradorIds)"""
+        return self.consultas.siguiente_id(tipo)
+    
+    def reservar_ids(self, tipo: str, cantidad: int) -> List[str]:
+        """Reserva cantidad IDs consecutivos de un tipo, para cargas por lotes"""
+        return self.consultas.reservar_ids(tipo, cantidad)
     
     def mostrar_menu_principal(self):
         """Muestra el menú principal del sistema"""
@@ -74,6 +49,7 @@ class InterfazUsuario:
         print("2. Editar estudiante")
         print("3. Eliminar estudiante")
         print("4. Listar estudiantes")
+        print("5. Importar estudiantes desde CSV")
         print("0. Volver al menú principal")
     
     def mostrar_menu_cursos(self):
@@ -102,6 +78,8 @@ class InterfazUsuario:
         print("2. Asignar nota")
         print("3. Eliminar matrícula")
         print("4. Listar matrículas")
+        print("5. Matricular todas las inscripciones pendientes")
+        print("6. Cargar notas desde CSV")
         print("0. Volver al menú principal")
     
     def mostrar_menu_consultas(self):
@@ -115,6 +93,9 @@ class InterfazUsuario:
         print("6. Créditos inscritos por estudiante")
         print("7. Dominios de correo únicos")
         print("8. Búsqueda binaria por apellido")
+        print("9. Estadísticas de notas por curso")
+        print("10. Top 3 de todos los cursos")
+        print("11. Buscar estudiantes (nombre, documento o correo)")
         print("0. Volver al menú principal")
     
     def crear_estudiante(self):
@@ -134,8 +115,7 @@ class InterfazUsuario:
                 continue
             
             # Verificar duplicado
-            documento_existe = any(est.documento == documento for est in self.estudiantes)
-            if documento_existe:
+            if self.consultas.buscar_estudiante_por_documento(documento) is not None:
                 print(f"❌ Error: Ya existe un estudiante con documento {documento}")
                 continue
             
@@ -171,8 +151,7 @@ class InterfazUsuario:
                 continue
             
             # Verificar duplicado
-            correo_existe = any(est.correo.lower() == correo.lower() for est in self.estudiantes)
-            if correo_existe:
+            if self.consultas.buscar_estudiante_por_correo(correo) is not None:
                 print(f"❌ Error: Ya existe un estudiante con correo {correo}")
                 continue
             
@@ -209,7 +188,7 @@ class InterfazUsuario:
             fecha_nacimiento=datos['fecha_nacimiento']
         )
         
-        self.estudiantes.append(nuevo_estudiante)
+        self.consultas.agregar_estudiante(nuevo_estudiante)
         print(f"✅ Estudiante creado exitosamente con ID: {nuevo_id}")
         return True
     
@@ -251,9 +230,8 @@ class InterfazUsuario:
                     continue
                 
                 # Verificar duplicado (excluyendo el estudiante actual)
-                documento_existe = any(est.documento == nuevo_documento and est.id != estudiante_a_editar.id 
-                                     for est in self.estudiantes)
-                if documento_existe:
+                existente = self.consultas.buscar_estudiante_por_documento(nuevo_documento)
+                if existente is not None and existente.id != estudiante_a_editar.id:
                     print(f"❌ Error: Ya existe otro estudiante con documento {nuevo_documento}")
                     continue
                 
@@ -294,9 +272,8 @@ class InterfazUsuario:
                     continue
                 
                 # Verificar duplicado (excluyendo el estudiante actual)
-                correo_existe = any(est.correo.lower() == nuevo_correo.lower() and est.id != estudiante_a_editar.id 
-                                  for est in self.estudiantes)
-                if correo_existe:
+                existente = self.consultas.buscar_estudiante_por_correo(nuevo_correo)
+                if existente is not None and existente.id != estudiante_a_editar.id:
                     print(f"❌ Error: Ya existe otro estudiante con correo {nuevo_correo}")
                     continue
                 
@@ -323,11 +300,14 @@ class InterfazUsuario:
                 break
             
             # Actualizar estudiante
-            estudiante_a_editar.documento = nuevo_documento
-            estudiante_a_editar.nombres = nuevos_nombres
-            estudiante_a_editar.apellidos = nuevos_apellidos
-            estudiante_a_editar.correo = nuevo_correo
-            estudiante_a_editar.fecha_nacimiento = nueva_fecha
+            self.consultas.actualizar_estudiante(
+                estudiante_a_editar,
+                documento=nuevo_documento,
+                nombres=nuevos_nombres,
+                apellidos=nuevos_apellidos,
+                correo=nuevo_correo,
+                fecha_nacimiento=nueva_fecha
+            )
             
             print("✅ Estudiante actualizado exitosamente")
             return True
@@ -358,33 +338,25 @@ class InterfazUsuario:
             estudiante_a_eliminar = self.estudiantes[indice]
             
             # Verificar si tiene inscripciones o matrículas
-            tiene_inscripciones = any(i.estudiante_id == estudiante_a_eliminar.id for i in self.inscripciones)
-            tiene_matriculas = any(m.estudiante_id == estudiante_a_eliminar.id for m in self.matriculas)
+            inscripciones_asociadas = self.consultas.obtener_inscripciones_de_estudiante(estudiante_a_eliminar.id)
+            matriculas_asociadas = self.consultas.obtener_matriculas_de_estudiante(estudiante_a_eliminar.id)
             
-            if tiene_inscripciones or tiene_matriculas:
+            if inscripciones_asociadas or matriculas_asociadas:
                 print(f"⚠️  ADVERTENCIA: El estudiante {estudiante_a_eliminar.nombre_completo()} tiene registros asociados:")
-                if tiene_inscripciones:
-                    inscripciones_count = len([i for i in self.inscripciones if i.estudiante_id == estudiante_a_eliminar.id])
-                    print(f"  • {inscripciones_count} inscripciones activas")
-                if tiene_matriculas:
-                    matriculas_count = len([m for m in self.matriculas if m.estudiante_id == estudiante_a_eliminar.id])
-                    print(f"  • {matriculas_count} matrículas registradas")
+                if inscripciones_asociadas:
+                    print(f"  • {len(inscripciones_asociadas)} inscripciones activas")
+                if matriculas_asociadas:
+                    print(f"  • {len(matriculas_asociadas)} matrículas registradas")
                 
                 confirmar = input("Se eliminarán automáticamente todos sus registros. ¿Continuar? (s/N): ").strip().lower()
                 if confirmar != 's':
                     print("Eliminación cancelada")
                     return False
             
-            # Eliminar inscripciones asociadas
-            inscripciones_eliminadas = len([i for i in self.inscripciones if i.estudiante_id == estudiante_a_eliminar.id])
-            self.inscripciones = [i for i in self.inscripciones if i.estudiante_id != estudiante_a_eliminar.id]
-            
-            # Eliminar matrículas asociadas
-            matriculas_eliminadas = len([m for m in self.matriculas if m.estudiante_id == estudiante_a_eliminar.id])
-            self.matriculas = [m for m in self.matriculas if m.estudiante_id != estudiante_a_eliminar.id]
-            
-            # Eliminar estudiante
-            self.estudiantes.remove(estudiante_a_eliminar)
+            # Eliminar estudiante con sus inscripciones y matrículas
+            inscripciones, matriculas = self.consultas.eliminar_estudiantes_en_cascada([estudiante_a_eliminar])
+            inscripciones_eliminadas = len(inscripciones)
+            matriculas_eliminadas = len(matriculas)
             print(f"✅ Estudiante {estudiante_a_eliminar.nombre_completo()} eliminado exitosamente")
             if inscripciones_eliminadas > 0:
                 print(f"  • {inscripciones_eliminadas} inscripciones eliminadas")
@@ -410,6 +382,38 @@ class InterfazUsuario:
                 creditos = self.consultas.obtener_creditos_inscritos_por_estudiante(estudiante.id)
                 print(f"{estudiante.id:<10} {estudiante.documento:<12} {estudiante.nombres:<20} {estudiante.apellidos:<20} {estudiante.correo:<25} {creditos:<10}")
     
+    def importar_estudiantes(self):
+        """Interfaz para importar estudiantes nuevos desde un archivo CSV"""
+        print("\n--- IMPORTAR ESTUDIANTES DESDE CSV ---")
+        print("Columnas: documento, nombres, apellidos, correo, fecha_nacimiento")
+        
+        archivo = input("Ruta del archivo CSV: ").strip()
+        if not os.path.isfile(archivo):
+            print(f"❌ Error: No existe el archivo {archivo}")
+            return False
+        
+        procesos_str = input("Procesos para validar (Enter = 1): ").strip()
+        try:
+            procesos = int(procesos_str) if procesos_str else 1
+        except ValueError:
+            print("❌ Error: Debe ingresar un número válido")
+            return False
+        
+        try:
+            resultado = importar_estudiantes_csv(self.consultas, archivo, procesos)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ Error leyendo el archivo: {e}")
+            return False
+        
+        print(f"✅ Filas leídas: {resultado.total}")
+        print(f"   Aceptadas: {len(resultado.aceptados)} -> {resultado.archivo_aceptados}")
+        print(f"   Con errores: {len(resultado.errores)} -> {resultado.archivo_errores}")
+        for numero, datos, mensajes in resultado.errores[:10]:
+            print(f"   • Fila {numero} ({datos['documento'] or 'sin documento'}): {'; '.join(mensajes)}")
+        if len(resultado.errores) > 10:
+            print(f"   ... y {len(resultado.errores) - 10} filas más en el reporte")
+        return True
+    
     def crear_curso(self):
         """Interfaz para crear un nuevo curso"""
         print("\n--- CREAR NUEVO CURSO ---")
@@ -458,7 +462,7 @@ class InterfazUsuario:
             docente=docente
         )
         
-        self.cursos.append(nuevo_curso)
+        self.consultas.agregar_curso(nuevo_curso)
         print(f"✅ Curso creado exitosamente con código: {codigo}")
         return True
     
@@ -518,9 +522,12 @@ class InterfazUsuario:
                 nuevo_docente = curso_a_editar.docente
             
             # Actualizar curso
-            curso_a_editar.nombre = nuevo_nombre
-            curso_a_editar.creditos = nuevos_creditos
-            curso_a_editar.docente = nuevo_docente
+            self.consultas.actualizar_curso(
+                curso_a_editar,
+                nombre=nuevo_nombre,
+                creditos=nuevos_creditos,
+                docente=nuevo_docente
+            )
             
             print("✅ Curso actualizado exitosamente")
             return True
@@ -558,7 +565,7 @@ class InterfazUsuario:
                 return False
             
             # Eliminar curso
-            self.cursos.remove(curso_a_eliminar)
+            self.consultas.eliminar_curso(curso_a_eliminar)
             print(f"✅ Curso {curso_a_eliminar.nombre} eliminado exitosamente")
             return True
             
@@ -609,10 +616,10 @@ class InterfazUsuario:
                 return False
             
             # Obtener cursos en los que ya está inscrito el estudiante
-            cursos_inscritos = set()
-            for inscripcion in self.inscripciones:
-                if inscripcion.estudiante_id == estudiante_seleccionado.id:
-                    cursos_inscritos.add(inscripcion.curso_codigo)
+            cursos_inscritos = {
+                inscripcion.curso_codigo
+                for inscripcion in self.consultas.obtener_inscripciones_de_estudiante(estudiante_seleccionado.id)
+            }
             
             # Filtrar cursos disponibles (excluir los ya inscritos)
             cursos_disponibles = [curso for curso in self.cursos if curso.codigo not in cursos_inscritos]
@@ -655,7 +662,7 @@ class InterfazUsuario:
                 fecha_inscripcion=datetime.now().strftime('%Y-%m-%d')
             )
             
-            self.inscripciones.append(nueva_inscripcion)
+            self.consultas.agregar_inscripcion(nueva_inscripcion)
             
             # Mostrar información de créditos actualizada
             creditos_actualizados = self.consultas.obtener_creditos_inscritos_por_estudiante(estudiante_seleccionado.id)
@@ -696,8 +703,7 @@ class InterfazUsuario:
             inscripcion_a_editar = self.inscripciones[indice]
             
             # Verificar si ya tiene matrícula asociada
-            tiene_matricula = any(m.inscripcion_id == inscripcion_a_editar.id for m in self.matriculas)
-            if tiene_matricula:
+            if self.consultas.tiene_matricula(inscripcion_a_editar.id):
                 print("⚠️  Esta inscripción ya tiene una matrícula asociada.")
                 print("⚠️  NOTA: El ID de la inscripción no se puede modificar")
                 print("Solo se puede modificar la fecha de inscripción.")
@@ -717,7 +723,7 @@ class InterfazUsuario:
                     
                     break
                 
-                inscripcion_a_editar.fecha_inscripcion = nueva_fecha
+                self.consultas.actualizar_inscripcion(inscripcion_a_editar, fecha_inscripcion=nueva_fecha)
                 print("✅ Fecha de inscripción actualizada")
                 return True
             
@@ -770,9 +776,8 @@ class InterfazUsuario:
             if (nuevo_estudiante_id != inscripcion_a_editar.estudiante_id or 
                 nuevo_curso_codigo != inscripcion_a_editar.curso_codigo):
                 
-                for inscripcion in self.inscripciones:
+                for inscripcion in self.consultas.obtener_inscripciones_de_estudiante(nuevo_estudiante_id):
                     if (inscripcion.id != inscripcion_a_editar.id and
-                        inscripcion.estudiante_id == nuevo_estudiante_id and 
                         inscripcion.curso_codigo == nuevo_curso_codigo):
                         print("❌ Error: Ya existe una inscripción con esta combinación")
                         return False
@@ -801,9 +806,12 @@ class InterfazUsuario:
                 break
             
             # Aplicar cambios
-            inscripcion_a_editar.estudiante_id = nuevo_estudiante_id
-            inscripcion_a_editar.curso_codigo = nuevo_curso_codigo
-            inscripcion_a_editar.fecha_inscripcion = nueva_fecha
+            self.consultas.actualizar_inscripcion(
+                inscripcion_a_editar,
+                estudiante_id=nuevo_estudiante_id,
+                curso_codigo=nuevo_curso_codigo,
+                fecha_inscripcion=nueva_fecha
+            )
             
             print("✅ Inscripción actualizada exitosamente")
             return True
@@ -830,8 +838,7 @@ class InterfazUsuario:
             nombre_curso = curso.nombre if curso else "N/A"
             
             # Verificar si tiene matrícula
-            tiene_matricula = any(m.inscripcion_id == inscripcion.id for m in self.matriculas)
-            estado = " [CON MATRÍCULA]" if tiene_matricula else ""
+            estado = " [CON MATRÍCULA]" if self.consultas.tiene_matricula(inscripcion.id) else ""
             
             print(f"{i}. {inscripcion.id} - {nombre_estudiante} en {nombre_curso}{estado}")
         
@@ -844,7 +851,7 @@ class InterfazUsuario:
             inscripcion_a_eliminar = self.inscripciones[indice]
             
             # Verificar si tiene matrícula asociada
-            matriculas_asociadas = [m for m in self.matriculas if m.inscripcion_id == inscripcion_a_eliminar.id]
+            matriculas_asociadas = self.consultas.obtener_matriculas_de_inscripcion(inscripcion_a_eliminar.id)
             
             if matriculas_asociadas:
                 print(f"⚠️  ADVERTENCIA: Esta inscripción tiene {len(matriculas_asociadas)} matrícula(s) asociada(s)")
@@ -854,11 +861,12 @@ class InterfazUsuario:
                     return False
                 
                 # Eliminar matrículas asociadas
-                self.matriculas = [m for m in self.matriculas if m.inscripcion_id != inscripcion_a_eliminar.id]
+                for matricula in matriculas_asociadas:
+                    self.consultas.eliminar_matricula(matricula)
                 print(f"  • {len(matriculas_asociadas)} matrícula(s) eliminada(s)")
             
             # Eliminar inscripción
-            self.inscripciones.remove(inscripcion_a_eliminar)
+            self.consultas.eliminar_inscripcion(inscripcion_a_eliminar)
             
             estudiante = self.consultas.buscar_estudiante_por_id(inscripcion_a_eliminar.estudiante_id)
             curso = self.consultas.buscar_curso_por_codigo(inscripcion_a_eliminar.curso_codigo)
@@ -892,8 +900,7 @@ class InterfazUsuario:
             codigo_curso = curso.codigo if curso else "N/A"
             
             # Verificar si ya tiene matrícula
-            tiene_matricula = any(m.inscripcion_id == inscripcion.id for m in self.matriculas)
-            estado = "Matriculado" if tiene_matricula else "Pendiente"
+            estado = "Matriculado" if self.consultas.tiene_matricula(inscripcion.id) else "Pendiente"
             
             print(f"{inscripcion.id:<10} {nombre_estudiante:<25} {codigo_curso:<15} {inscripcion.fecha_inscripcion:<12} {estado:<12}")
     
@@ -942,7 +949,7 @@ class InterfazUsuario:
                 nuevo_id
             )
             
-            self.matriculas.append(nueva_matricula)
+            self.consultas.agregar_matricula(nueva_matricula)
             print(f"✅ Matrícula creada exitosamente. ID: {nuevo_id}")
             print(f"   Estudiante: {estudiante.nombre_completo()}")
             print(f"   Curso: {curso.nombre}")
@@ -953,6 +960,31 @@ class InterfazUsuario:
             print("❌ Error: Debe ingresar un número válido")
             return False
     
+    def matricular_todas_pendientes(self):
+        """Interfaz para matricular de una vez las inscripciones pendientes"""
+        print("\n--- MATRICULAR INSCRIPCIONES PENDIENTES ---")
+        
+        curso_codigo = input("Código del curso (Enter = todos): ").strip() or None
+        if curso_codigo and self.consultas.buscar_curso_por_codigo(curso_codigo) is None:
+            print(f"❌ Error: No existe el curso {curso_codigo}")
+            return False
+        
+        fechas = []
+        for etiqueta in ("desde", "hasta"):
+            fecha = input(f"Fecha de inscripción {etiqueta} (YYYY-MM-DD, Enter = sin límite): ").strip() or None
+            if fecha and not validar_fecha(fecha):
+                print("❌ Error: La fecha debe estar en formato YYYY-MM-DD")
+                return False
+            fechas.append(fecha)
+        
+        matriculas = matricular_pendientes(self.consultas, curso_codigo, *fechas)
+        if not matriculas:
+            print("❌ No hay inscripciones pendientes de matrícula con esos filtros.")
+            return False
+        
+        print(f"✅ Matrículas creadas: {len(matriculas)} ({matriculas[0].id} a {matriculas[-1].id})")
+        return True
+    
     def asignar_nota(self):
         """Interfaz para asignar nota a una matrícula"""
         print("\n--- ASIGNAR NOTA ---")
@@ -999,7 +1031,7 @@ class InterfazUsuario:
                 
                 break
             
-            matricula_seleccionada.nota = nota
+            self.consultas.asignar_nota(matricula_seleccionada, nota)
             print(f"✅ Nota asignada exitosamente: {nota}")
             return True
             
@@ -1007,6 +1039,30 @@ class InterfazUsuario:
             print("❌ Error: Debe ingresar un número válido")
             return False
     
+    def cargar_notas(self):
+        """Interfaz para cargar una planilla de notas desde CSV"""
+        print("\n--- CARGAR NOTAS DESDE CSV ---")
+        print("Columnas: matricula_id, nota  (o bien documento, curso_codigo, nota)")
+        
+        archivo = input("Ruta del archivo CSV: ").strip()
+        if not os.path.isfile(archivo):
+            print(f"❌ Error: No existe el archivo {archivo}")
+            return False
+        
+        try:
+            resultado = cargar_notas_csv(self.consultas, archivo)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ Error leyendo el archivo: {e}")
+            return False
+        
+        print(f"✅ Notas asignadas: {len(resultado.asignadas)}")
+        print(f"   Filas no aplicadas: {len(resultado.errores)} -> {resultado.archivo_errores}")
+        for numero, _, mensajes in resultado.errores[:10]:
+            print(f"   • Fila {numero}: {'; '.join(mensajes)}")
+        if len(resultado.errores) > 10:
+            print(f"   ... y {len(resultado.errores) - 10} filas más en el reporte")
+        return True
+    
     def eliminar_matricula(self):
         """Interfaz para eliminar una matrícula"""
         print("\n--- ELIMINAR MATRÍCULA ---")
@@ -1056,7 +1112,7 @@ class InterfazUsuario:
                 return False
             
             # Eliminar matrícula
-            self.matriculas.remove(matricula_a_eliminar)
+            self.consultas.eliminar_matricula(matricula_a_eliminar)
             print(f"✅ Matrícula {matricula_a_eliminar.id} eliminada exitosamente")
             return True
             
@@ -1115,6 +1171,21 @@ class InterfazUsuario:
         else:
             print(f"❌ No se encontró estudiante con correo {correo}")
     
+    def ejecutar_busqueda_estudiantes(self):
+        """Ejecuta la búsqueda de estudiantes por nombre, documento o correo"""
+        texto = input("Ingrese nombre, apellido, documento o correo (o parte): ").strip()
+        encontrados = self.consultas.buscar_estudiantes(texto)
+        
+        if not encontrados:
+            print(f"❌ No se encontraron estudiantes para '{texto}'")
+            return
+        
+        print(f"\n--- COINCIDENCIAS ({len(encontrados)}) ---")
+        print(f"{'ID':<10} {'Documento':<12} {'Nombre completo':<30} {'Correo':<30}")
+        print("-" * 85)
+        for estudiante in encontrados:
+            print(f"{estudiante.id:<10} {estudiante.documento:<12} {estudiante.nombre_completo():<30} {estudiante.correo:<30}")
+    
     def ejecutar_consulta_ordenados_apellido(self):
         """Ejecuta consulta de estudiantes ordenados por apellido"""
         estudiantes_ordenados = self.consultas.listar_estudiantes_ordenados_por_apellido()
@@ -1163,6 +1234,25 @@ class InterfazUsuario:
         except ValueError:
             print("❌ Error: Debe ingresar un número válido")
     
+    def ejecutar_consulta_top_todos_los_cursos(self):
+        """Ejecuta consulta de top 3 promedios de todos los cursos"""
+        mejores = self.consultas.top_k_por_todos_los_cursos(3)
+        
+        if not mejores:
+            print("No hay notas registradas.")
+            return
+        
+        for curso in self.cursos:
+            top_estudiantes = mejores.get(curso.codigo)
+            if not top_estudiantes:
+                continue
+            
+            print(f"\n--- TOP 3 PROMEDIOS - {curso.nombre} ---")
+            print(f"{'Posición':<10} {'Estudiante':<25} {'Nota':<6}")
+            print("-" * 41)
+            for i, (estudiante, nota) in enumerate(top_estudiantes, 1):
+                print(f"{i}°{'':<8} {estudiante.nombre_completo():<25} {nota:.1f}")
+    
     def ejecutar_consulta_reprobados(self):
         """Ejecuta consulta de estudiantes reprobados"""
         reprobados = self.consultas.obtener_reprobados()
@@ -1178,6 +1268,24 @@ class InterfazUsuario:
         for estudiante, curso, nota in reprobados:
             print(f"{estudiante.nombre_completo():<25} {curso.codigo:<15} {nota:.1f}")
     
+    def ejecutar_consulta_estadisticas_cursos(self):
+        """Ejecuta el reporte de estadísticas de notas de todos los cursos"""
+        estadisticas = self.consultas.obtener_estadisticas_por_curso()
+        
+        if not estadisticas:
+            print("No hay notas registradas.")
+            return
+        
+        print(f"\n--- ESTADÍSTICAS DE NOTAS POR CURSO ({len(estadisticas)}) ---")
+        print(f"{'Curso':<10} {'Notas':>6} {'Prom.':>6} {'Med.':>6} {'Desv.':>6} {'Aprob.':>7} {'P25':>5} {'P75':>5} {'P90':>5}")
+        print("-" * 66)
+        
+        for curso, datos in estadisticas:
+            percentiles = datos['percentiles']
+            print(f"{curso.codigo:<10} {datos['cantidad']:>6} {datos['promedio']:>6.2f} {datos['mediana']:>6.2f} "
+                  f"{datos['desviacion']:>6.2f} {datos['tasa_aprobacion']:>7.0%} "
+                  f"{percentiles[25]:>5.1f} {percentiles[75]:>5.1f} {percentiles[90]:>5.1f}")
+    
     def ejecutar_consulta_creditos_estudiante(self):
         """Ejecuta consulta de créditos inscritos por estudiante"""
         if not self.estudiantes:
@@ -1205,7 +1313,7 @@ class InterfazUsuario:
             print(f"Créditos disponibles: {creditos_disponibles}")
             
             # Mostrar detalle de inscripciones
-            inscripciones_estudiante = [i for i in self.inscripciones if i.estudiante_id == estudiante_seleccionado.id]
+            inscripciones_estudiante = self.consultas.obtener_inscripciones_de_estudiante(estudiante_seleccionado.id)
             if inscripciones_estudiante:
                 print(f"\nDetalle de inscripciones:")
                 for inscripcion in inscripciones_estudiante:
@@ -1231,14 +1339,22 @@ class InterfazUsuario:
     def ejecutar_busqueda_binaria_apellido(self):
         """Ejecuta búsqueda binaria por apellido"""
         apellido = input("Ingrese apellido a buscar: ").strip()
-        estudiante = self.consultas.buscar_binario_estudiante(apellido)
+        encontrados = self.consultas.buscar_estudiantes_por_apellido(apellido)
+        
+        if encontrados:
+            print(f"\n✅ Estudiantes encontrados (búsqueda binaria): {len(encontrados)}")
+            for estudiante in encontrados:
+                print(f"   ID: {estudiante.id}")
+                print(f"   Documento: {estudiante.documento}")
+                print(f"   Nombre: {estudiante.nombre_completo()}")
+                print(f"   Correo: {estudiante.correo}")
+                print(f"   Fecha nacimiento: {estudiante.fecha_nacimiento}")
+                print()
+            return
         
-        if estudiante:
-            print(f"\n✅ Estudiante encontrado (búsqueda binaria):")
-            print(f"   ID: {estudiante.id}")
-            print(f"   Documento: {estudiante.documento}")
-            print(f"   Nombre: {estudiante.nombre_completo()}")
-            print(f"   Correo: {estudiante.correo}")
-            print(f"   Fecha nacimiento: {estudiante.fecha_nacimiento}")
-        else:
-            print(f"❌ No se encontró estudiante con apellido {apellido}")
\ No newline at end of file
+        print(f"❌ No se encontró estudiante con apellido {apellido}")
+        similares = self.consultas.buscar_estudiantes_por_prefijo_apellido(apellido)
+        if similares:
+            print("Apellidos que empiezan igual:")
+            for estudiante in similares[:10]:
+                print(f"   • {estudiante.nombre_completo()} ({estudiante.documento})")
\ No newline at end of file
@@ -11,8 +11,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.modelos import Estudiante, Curso, Inscripcion, Matricula
 from src.validaciones import validar_correo, validar_documento, validar_fecha, validar_creditos, validar_nota
-from src.persistencia import PersistenciaCSV
+from src.persistencia import PersistenciaCSV, PersistenciaSQLite
 from src.consultas import ConsultasAcademicas
+from src.repositorio import RepositorioAcademico
+from src import instantanea
+from src.cambios import RegistroCambios
+from src.bitacora import BitacoraOperaciones
+from src.tabla_matriculas import TablaMatriculas
+from src.identificadores import GeneradorIds
+from src.importacion import importar_estudiantes_csv, cargar_notas_csv
+from src.operaciones_lote import inscribir_en_lote, matricular_pendientes
 
 class TestModelos(unittest.TestCase):
     """Pruebas para los modelos de datos"""
@@ -160,6 +168,623 @@ class TestPersistencia(unittest.TestCase):
         self.assertEqual(matriculas_cargadas[0].estudiante_id, "E1")
         self.assertEqual(matriculas_cargadas[1].nota, 3.8)
 
+    def test_guardar_cambios_solo_tablas_modificadas(self):
+        """Prueba que solo se escriben las tablas con cambios y las altas se agregan al final"""
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        self.persistencia.guardar_cursos(self.cursos_prueba)
+        
+        cambios = RegistroCambios()
+        nuevo = Estudiante("E3", "11111111", "Ana", "López", "ana@test.com", "1997-03-03")
+        self.estudiantes_prueba.append(nuevo)
+        cambios.registrar_alta('estudiantes', nuevo)
+        
+        escritas = self.persistencia.guardar_cambios(
+            self.estudiantes_prueba, self.cursos_prueba, [], [], cambios
+        )
+        
+        self.assertEqual(escritas, ['estudiantes'])
+        self.assertFalse(cambios.hay_cambios())
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "inscripciones.csv")))
+        estudiantes_cargados = self.persistencia.cargar_estudiantes()
+        self.assertEqual([e.id for e in estudiantes_cargados], ["E1", "E2", "E3"])
+    
+    def test_guardar_cambios_con_encabezado_distinto_reescribe(self):
+        """Prueba que las altas no se agregan a un CSV con otro orden de columnas o del formato anterior"""
+        with open(os.path.join(self.temp_dir, "estudiantes.csv"), 'w', encoding='utf-8') as f:
+            f.write("documento,id,nombres,apellidos,correo,fecha_nacimiento\n")
+            f.write("12345678,E1,Juan,Pérez,juan@test.com,1995-01-01\n")
+        with open(os.path.join(self.temp_dir, "matriculas.csv"), 'w', encoding='utf-8') as f:
+            f.write("id,estudiante_id,curso_codigo,fecha_matricula,nota\n")
+            f.write("M1,E1,C1,2024-02-01,4.5\n")
+        
+        estudiantes = self.persistencia.cargar_estudiantes()
+        matriculas = self.persistencia.cargar_matriculas()
+        cambios = RegistroCambios()
+        estudiantes.append(Estudiante("E2", "654321", "Ana", "López", "ana@test.com", "1997-03-03"))
+        matriculas.append(Matricula("M2", "I2", "E1", "C2", "2024-02-01"))
+        cambios.registrar_alta('estudiantes', estudiantes[-1])
+        cambios.registrar_alta('matriculas', matriculas[-1])
+        self.persistencia.guardar_cambios(estudiantes, [], [], matriculas, cambios)
+        
+        # Se lee el CSV, no la instantánea (que se escribe con las filas correctas igual)
+        solo_csv = PersistenciaCSV(self.temp_dir, instantaneas=False)
+        self.assertEqual([(e.id, e.documento) for e in solo_csv.cargar_estudiantes()],
+                         [("E1", "12345678"), ("E2", "654321")])
+        self.assertEqual([(m.inscripcion_id, m.estudiante_id, m.curso_codigo) for m in solo_csv.cargar_matriculas()],
+                         [("temp_M1", "E1", "C1"), ("I2", "E1", "C2")])
+    
+    def test_guardar_cambios_reescribe_tabla_editada(self):
+        """Prueba que una edición reescribe la tabla completa"""
+        self.persistencia.guardar_matriculas(self.matriculas_prueba)
+        
+        cambios = RegistroCambios()
+        self.matriculas_prueba[0].nota = 2.0
+        cambios.registrar_modificacion('matriculas')
+        self.persistencia.guardar_cambios([], [], [], self.matriculas_prueba, cambios)
+        
+        self.assertEqual(self.persistencia.cargar_matriculas()[0].nota, 2.0)
+
+    def test_guardado_atomico_conserva_archivo_si_falla(self):
+        """Prueba que una escritura interrumpida no daña el archivo existente"""
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        
+        class ValorQueFalla:
+            def __str__(self):
+                raise IOError("disco lleno")
+        
+        self.estudiantes_prueba[1].nombres = ValorQueFalla()
+        with self.assertRaises(IOError):
+            self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        
+        self.assertEqual(len(self.persistencia.cargar_estudiantes()), 2)
+        self.assertEqual([f for f in os.listdir(self.temp_dir) if f.endswith('.tmp')], [])
+    
+    def test_guardado_en_segundo_plano(self):
+        """Prueba que el guardado en segundo plano escribe los mismos datos"""
+        persistencia = PersistenciaCSV(self.temp_dir, segundo_plano=True)
+        persistencia.guardar_matriculas(self.matriculas_prueba)
+        terminado = []
+        persistencia.al_terminar_escrituras(lambda: terminado.append(True))
+        persistencia.esperar_escrituras()
+        
+        self.assertEqual(terminado, [True])
+        self.assertEqual(persistencia.cargar_matriculas()[1].nota, 3.8)
+
+    def test_fallo_en_segundo_plano_deja_cambios_pendientes(self):
+        """Prueba que un guardado en segundo plano fallido se informa, conserva la bitácora y se reintenta"""
+        from types import SimpleNamespace
+        from src.main import guardar_datos
+        
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        persistencia = PersistenciaCSV(self.temp_dir, segundo_plano=True)
+        repositorio = persistencia.cargar_repositorio(ConsultasAcademicas)
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        repositorio.bitacora = bitacora
+        
+        def escribir_con_disco_lleno(*args):
+            raise IOError("disco lleno")
+        
+        repositorio.actualizar_estudiante(repositorio.estudiantes[0], nombres="CAMBIADO")
+        persistencia._escribir_atomico = escribir_con_disco_lleno
+        guardar_datos(persistencia, SimpleNamespace(consultas=repositorio))
+        self.assertTrue(persistencia._pendientes)  # el menú no espera la escritura
+        persistencia.esperar_escrituras()
+        
+        # El segmento apartado de la bitácora se conserva tras el fallo
+        self.assertTrue(os.path.exists(bitacora.archivo_anterior))
+        
+        # El siguiente guardado recoge el error y vuelve a escribir la tabla
+        del persistencia._escribir_atomico
+        guardar_datos(persistencia, SimpleNamespace(consultas=repositorio), esperar=True)
+        bitacora.cerrar()
+        
+        self.assertFalse(repositorio.cambios.hay_cambios())
+        self.assertFalse(os.path.exists(bitacora.archivo_anterior))
+        self.assertEqual(PersistenciaCSV(self.temp_dir).cargar_estudiantes()[0].nombres, "CAMBIADO")
+    
+    def test_iterar_en_streaming(self):
+        """Prueba que los iteradores entregan lo mismo que la carga completa"""
+        self.persistencia.guardar_matriculas(self.matriculas_prueba)
+        iterador = self.persistencia.iter_matriculas()
+        
+        self.assertEqual(next(iterador).id, "M1")
+        self.assertEqual([m.nota for m in iterador], [3.8])
+        self.assertEqual(list(self.persistencia.iter_estudiantes()), [])
+    
+    def test_cargar_por_encabezado_y_formato_anterior(self):
+        """Prueba que la carga usa el encabezado, limpia espacios y admite el formato sin inscripcion_id"""
+        with open(os.path.join(self.temp_dir, "matriculas.csv"), 'w', encoding='utf-8') as f:
+            f.write("nota,id,estudiante_id,curso_codigo,fecha_matricula\n 4.5,M1, E1 ,C1,2024-02-01\n,M2,E2,C1,2024-02-01\n"
+                    "3.0,M3,E1,C1,2024-02-01,I9\n2.0,M4,E2,C1\n")
+        
+        matriculas = self.persistencia.cargar_matriculas()
+        self.assertEqual(matriculas[0], Matricula("M1", "temp_M1", "E1", "C1", "2024-02-01", 4.5))
+        self.assertIsNone(matriculas[1].nota)
+        # Un campo de más no ocupa el lugar de la columna ausente; uno de menos se lee vacío
+        self.assertEqual(matriculas[2].inscripcion_id, "temp_M3")
+        self.assertEqual((matriculas[3].fecha_matricula, matriculas[3].nota), ("", 2.0))
+    
+    def test_cargar_en_modo_confiable(self):
+        """Prueba que el modo confiable carga los mismos datos que escribió la aplicación"""
+        self.persistencia.guardar_matriculas(self.matriculas_prueba)
+        self.persistencia.guardar_cursos(self.cursos_prueba)
+        
+        confiable = PersistenciaCSV(self.temp_dir, confiar=True, instantaneas=False)
+        matriculas = confiable.cargar_matriculas()
+        self.assertEqual(matriculas, self.matriculas_prueba)
+        self.assertIs(matriculas[0].curso_codigo, matriculas[1].curso_codigo)
+        self.assertEqual(confiable.cargar_cursos(), self.cursos_prueba)
+        
+        # Sin validaciones: una fila que __post_init__ rechazaría se carga igual
+        with open(os.path.join(self.temp_dir, "cursos.csv"), 'a', encoding='utf-8') as f:
+            f.write("C9,Sin créditos,0,Dr. Ruiz\n")
+        self.assertEqual(confiable.cargar_cursos()[-1].creditos, 0)
+        self.assertEqual(len(PersistenciaCSV(self.temp_dir, instantaneas=False).cargar_cursos()), 2)
+
+    def test_cargar_y_guardar_repositorio(self):
+        """Prueba que el repositorio se carga con sus contadores y guarda solo lo modificado"""
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        self.persistencia.guardar_cursos(self.cursos_prueba)
+        self.persistencia.guardar_contadores({'estudiante': 7})
+        
+        repositorio = self.persistencia.cargar_repositorio()
+        self.assertIsInstance(repositorio, RepositorioAcademico)
+        self.assertEqual(repositorio.matriculas, [])
+        self.assertEqual(repositorio.ids.siguiente('estudiante'), "E8")
+        
+        repositorio.agregar_inscripcion(Inscripcion("I1", "E1", "C1", "2024-02-01"))
+        self.assertEqual(self.persistencia.guardar_repositorio(repositorio), ['inscripciones'])
+        self.assertEqual(self.persistencia.cargar_contadores(), {'estudiante': 8, 'curso': 2, 'inscripcion': 1, 'matricula': 0})
+        
+        consultas = self.persistencia.cargar_repositorio(ConsultasAcademicas)
+        self.assertEqual(consultas.obtener_creditos_inscritos_por_estudiante("E1"), 3)
+
+    def test_instantanea_binaria(self):
+        """Prueba que la instantánea se prefiere mientras corresponda al CSV y sigue a las filas agregadas"""
+        self.persistencia.guardar_matriculas(self.matriculas_prueba)
+        binario = os.path.join(self.temp_dir, "matriculas.bin")
+        self.assertTrue(os.path.exists(binario))
+        self.assertEqual(self.persistencia.cargar_matriculas(), self.matriculas_prueba)
+        
+        cambios = RegistroCambios()
+        nueva = Matricula("M3", "I3", "E1", "C2", "2024-02-01")
+        cambios.registrar_alta('matriculas', nueva)
+        self.persistencia.guardar_cambios([], [], [], self.matriculas_prueba + [nueva], cambios)
+        archivo = os.path.join(self.temp_dir, "matriculas.csv")
+        self.assertTrue(instantanea.vigente(binario, instantanea.firma_de(archivo)))
+        cargadas = self.persistencia.cargar_matriculas()
+        self.assertEqual([m.id for m in cargadas], ["M1", "M2", "M3"])
+        self.assertIsNone(cargadas[2].nota)
+        
+        # Un CSV editado por fuera invalida la instantánea
+        with open(archivo, 'a', encoding='utf-8') as f:
+            f.write("M4,I4,E2,C2,2024-02-01,3.0\n")
+        self.assertEqual([m.id for m in self.persistencia.cargar_matriculas()], ["M1", "M2", "M3", "M4"])
+    
+    def test_carga_perezosa(self):
+        """Prueba que cada tabla se lee al usarla y los índices en la primera consulta"""
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        self.persistencia.guardar_cursos(self.cursos_prueba)
+        self.persistencia.guardar_inscripciones(self.inscripciones_prueba)
+        self.persistencia.guardar_matriculas(self.matriculas_prueba)
+        
+        perezosa = PersistenciaCSV(self.temp_dir, perezosa=True)
+        consultas = perezosa.cargar_repositorio(ConsultasAcademicas)
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        self.assertEqual(bitacora.reproducir(consultas), 0)
+        bitacora.cerrar()
+        colecciones = [consultas.estudiantes, consultas.cursos, consultas.inscripciones, consultas.matriculas]
+        self.assertFalse(any(c.cargada for c in colecciones))
+        
+        self.assertEqual([c.codigo for c in consultas.cursos], ["C1", "C2"])
+        self.assertEqual([c.cargada for c in colecciones], [False, True, False, False])
+        
+        self.assertEqual(consultas.siguiente_id('matricula'), "M3")
+        self.assertTrue(all(c.cargada for c in colecciones))
+        self.assertEqual(consultas.obtener_top_promedios_por_curso("C1")[0][1], 4.5)
+        consultas.agregar_curso(Curso("C3", "Química", 2, "Dr. Ruiz"))
+        self.assertEqual(perezosa.guardar_repositorio(consultas), ['cursos'])
+        self.assertEqual(len(self.persistencia.cargar_cursos()), 3)
+    
+    def test_reprobados_desde_iterador_sin_cargar_matriculas(self):
+        """Prueba que iterar_reprobados sobre iter_matriculas() no carga las matrículas de un repositorio perezoso"""
+        self.persistencia.guardar_estudiantes(self.estudiantes_prueba)
+        self.persistencia.guardar_cursos(self.cursos_prueba)
+        self.persistencia.guardar_inscripciones(self.inscripciones_prueba)
+        self.persistencia.guardar_matriculas(self.matriculas_prueba)
+        
+        perezosa = PersistenciaCSV(self.temp_dir, perezosa=True)
+        consultas = perezosa.cargar_repositorio(ConsultasAcademicas)
+        reprobados = list(consultas.iterar_reprobados(perezosa.iter_matriculas(), 5.0))
+        
+        self.assertEqual([(e.id, c.codigo, nota) for e, c, nota in reprobados],
+                         [(m.estudiante_id, m.curso_codigo, m.nota) for m in self.matriculas_prueba])
+        self.assertFalse(consultas.matriculas.cargada)
+        self.assertFalse(consultas.inscripciones.cargada)
+    
+    def test_almacen_de_matriculas(self):
+        """Prueba que con el almacén mapeado una nota se guarda en su registro, sin reescribir la tabla"""
+        self.persistencia.guardar_matriculas(self.matriculas_prueba)
+        mapeada = PersistenciaCSV(self.temp_dir, matriculas_mmap=True)
+        consultas = mapeada.cargar_repositorio(ConsultasAcademicas)
+        registros = os.path.join(self.temp_dir, "matriculas.dat")
+        self.assertEqual(consultas.matriculas, self.matriculas_prueba)
+        inodo, tamano = os.stat(registros).st_ino, os.path.getsize(registros)
+        
+        consultas.asignar_nota(consultas.buscar_matricula_por_id("M1"), 2.5)
+        self.assertEqual(mapeada.guardar_repositorio(consultas), ['matriculas'])
+        self.assertEqual((os.stat(registros).st_ino, os.path.getsize(registros)), (inodo, tamano))
+        
+        consultas.agregar_matricula(Matricula("M3", "I3", "E1", "C2", "2024-02-01"))
+        consultas.asignar_notas([(consultas.matriculas[2], 4.0), (consultas.matriculas[1], None)])
+        mapeada.guardar_repositorio(consultas)
+        self.assertEqual(os.stat(registros).st_ino, inodo)
+        
+        almacen = PersistenciaCSV(self.temp_dir, matriculas_mmap=True).almacen
+        self.assertEqual([(m.id, m.nota) for m in almacen.cargar()], [("M1", 2.5), ("M2", None), ("M3", 4.0)])
+        almacen.cerrar()
+        mapeada.almacen.cerrar()
+    
+    def test_almacen_actualiza_notas_en_varias_paginas(self):
+        """Prueba que las notas escritas en páginas separadas del almacén quedan en disco"""
+        almacen = PersistenciaCSV(self.temp_dir, matriculas_mmap=True).almacen
+        matriculas = [Matricula(f"M{i}", f"I{i}", "E1", "C1", "2024-01-15") for i in range(1, 1001)]
+        almacen.escribir(PersistenciaCSV._filas('matriculas', matriculas))
+        almacen.actualizar_notas([("M1", 1.0), ("M2", 2.0), ("M500", 3.0), ("M1000", 4.0)])
+        almacen.cerrar()
+        
+        almacen = PersistenciaCSV(self.temp_dir, matriculas_mmap=True).almacen
+        notas = {m.id: m.nota for m in almacen.cargar()}
+        almacen.cerrar()
+        self.assertEqual([notas["M1"], notas["M2"], notas["M500"], notas["M1000"]], [1.0, 2.0, 3.0, 4.0])
+        self.assertIsNone(notas["M3"])
+    
+    def test_sin_almacen_las_matriculas_vuelven_al_csv(self):
+        """Prueba que sin matriculas_mmap (CSV o SQLite) se usan las notas del almacén, no el CSV viejo"""
+        self.persistencia.guardar_matriculas(self.matriculas_prueba)
+        mapeada = PersistenciaCSV(self.temp_dir, matriculas_mmap=True)
+        consultas = mapeada.cargar_repositorio(ConsultasAcademicas)
+        consultas.asignar_nota(consultas.buscar_matricula_por_id("M1"), 2.5)
+        mapeada.guardar_repositorio(consultas)
+        mapeada.almacen.cerrar()
+        
+        sqlite = PersistenciaSQLite(self.temp_dir)
+        sqlite.importar_desde(PersistenciaCSV(self.temp_dir))
+        self.assertEqual([m.nota for m in sqlite.cargar_matriculas()], [2.5, 3.8])
+        sqlite.cerrar()
+        
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "matriculas.dat")))
+        csv_solo = PersistenciaCSV(self.temp_dir, instantaneas=False)
+        self.assertEqual([m.nota for m in csv_solo.cargar_matriculas()], [2.5, 3.8])
+        mapeada.almacen.cerrar()
+        
+class TestPersistenciaSQLite(unittest.TestCase):
+    """Pruebas para la persistencia en SQLite"""
+    
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.persistencia = PersistenciaSQLite(self.temp_dir)
+    
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        self.persistencia.cerrar()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_guardar_y_cargar_todo(self):
+        """Prueba guardar y cargar las cuatro tablas"""
+        self.persistencia.guardar_estudiantes([
+            Estudiante("E1", "12345678", "Juan", "Pérez", "juan@test.com", "1995-01-01")
+        ])
+        self.persistencia.guardar_cursos([Curso("C1", "Matemáticas", 3, "Dr. López")])
+        self.persistencia.guardar_inscripciones([Inscripcion("I1", "E1", "C1", "2024-02-01")])
+        self.persistencia.guardar_matriculas([
+            Matricula("M1", "I1", "E1", "C1", "2024-02-01", 4.5),
+            Matricula("M2", "I1", "E1", "C1", "2024-02-01")
+        ])
+        
+        self.assertEqual(self.persistencia.cargar_estudiantes()[0].correo, "juan@test.com")
+        self.assertEqual(self.persistencia.cargar_cursos()[0].creditos, 3)
+        self.assertEqual(self.persistencia.cargar_inscripciones()[0].curso_codigo, "C1")
+        matriculas = self.persistencia.cargar_matriculas()
+        self.assertEqual(matriculas[0].nota, 4.5)
+        self.assertIsNone(matriculas[1].nota)
+        
+        self.persistencia.guardar_contadores({'matricula': 2})
+        self.persistencia.guardar_contadores({'matricula': 5, 'curso': 1})
+        self.assertEqual(self.persistencia.cargar_contadores(), {'matricula': 5, 'curso': 1})
+    
+    def test_guardar_actualiza_y_elimina_filas(self):
+        """Prueba que guardar sincroniza cambios y eliminaciones por fila"""
+        cursos = [Curso("C1", "Matemáticas", 3, "Dr. López"), Curso("C2", "Física", 4, "Dr. García")]
+        self.persistencia.guardar_cursos(cursos)
+        
+        cursos[0].creditos = 5
+        del cursos[1]
+        self.persistencia.guardar_cursos(cursos)
+        
+        cargados = self.persistencia.cargar_cursos()
+        self.assertEqual(len(cargados), 1)
+        self.assertEqual(cargados[0].creditos, 5)
+    
+    def test_iterar_filas(self):
+        """Prueba que los iteradores recorren la base en orden de inserción"""
+        self.persistencia.guardar_cursos([Curso("C2", "Física", 4, "Dr. García"), Curso("C1", "Matemáticas", 3, "Dr. López")])
+        self.assertEqual([c.codigo for c in self.persistencia.iter_cursos()], ["C2", "C1"])
+    
+    def test_carga_perezosa(self):
+        """Prueba que con perezosa=True cada tabla se consulta la primera vez que se usa"""
+        self.persistencia.guardar_cursos([Curso("C1", "Matemáticas", 3, "Dr. López")])
+        self.persistencia.guardar_contadores({'curso': 4})
+        perezosa = PersistenciaSQLite(self.temp_dir, perezosa=True)
+        consultas = perezosa.cargar_repositorio(ConsultasAcademicas)
+        colecciones = [consultas.estudiantes, consultas.cursos, consultas.inscripciones, consultas.matriculas]
+        self.assertFalse(any(c.cargada for c in colecciones))
+        
+        self.assertEqual([c.codigo for c in consultas.cursos], ["C1"])
+        self.assertEqual([c.cargada for c in colecciones], [False, True, False, False])
+        
+        consultas.agregar_curso(Curso(consultas.siguiente_id('curso'), "Física", 4, "Dr. García"))
+        self.assertEqual(perezosa.guardar_repositorio(consultas), ['cursos'])
+        perezosa.cerrar()
+        self.assertEqual([c.codigo for c in self.persistencia.cargar_cursos()], ["C1", "C5"])
+
+class TestBitacora(unittest.TestCase):
+    """Pruebas para la bitácora de operaciones"""
+    
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _datos_base(self):
+        """Retorna una instancia de ConsultasAcademicas con datos mínimos"""
+        return ConsultasAcademicas(
+            [Estudiante("E1", "12345678", "Juan", "Pérez", "juan@test.com", "1995-01-01")],
+            [Curso("C1", "Matemáticas", 3, "Dr. López")],
+            [Inscripcion("I1", "E1", "C1", "2024-02-01")],
+            [Matricula("M1", "I1", "E1", "C1", "2024-02-01")]
+        )
+    
+    def test_reproducir_recupera_operaciones(self):
+        """Prueba que las operaciones registradas se reaplican en una nueva sesión"""
+        consultas = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        consultas.bitacora = bitacora
+        
+        consultas.agregar_curso(Curso("C2", "Física", 4, "Dr. García"))
+        consultas.actualizar_estudiante(consultas.estudiantes[0], nombres="Juan Carlos")
+        consultas.asignar_nota(consultas.matriculas[0], 4.2)
+        consultas.eliminar_curso(consultas.cursos[0])
+        bitacora.cerrar()  # Simula el fin abrupto de la sesión
+        
+        recuperada = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        self.assertEqual(bitacora.reproducir(recuperada), 4)
+        bitacora.cerrar()
+        
+        self.assertEqual([c.codigo for c in recuperada.cursos], ["C2"])
+        self.assertEqual(recuperada.estudiantes[0].nombres, "Juan Carlos")
+        self.assertEqual(recuperada.matriculas[0].nota, 4.2)
+        self.assertTrue(recuperada.cambios.esta_modificada('cursos'))
+    
+    def test_lote_de_altas_se_recupera_completo(self):
+        """Prueba que un lote de altas queda en una línea y se reaplica entero"""
+        consultas = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        consultas.bitacora = bitacora
+        consultas.agregar_inscripciones([
+            Inscripcion("I2", "E1", "C1", "2024-02-01"),
+            Inscripcion("I3", "E1", "C1", "2024-02-01")
+        ])
+        bitacora.cerrar()
+        with open(bitacora.archivo, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+        
+        recuperada = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        self.assertEqual(bitacora.reproducir(recuperada), 1)
+        self.assertEqual(bitacora.reproducir(recuperada), 0)
+        bitacora.cerrar()
+        self.assertEqual([i.id for i in recuperada.inscripciones], ["I1", "I2", "I3"])
+    
+    def test_lote_de_notas_se_recupera(self):
+        """Prueba que un lote de notas se reaplica desde una sola línea"""
+        consultas = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        consultas.bitacora = bitacora
+        consultas.asignar_notas([(consultas.matriculas[0], 3.7)])
+        bitacora.cerrar()
+        
+        recuperada = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        self.assertEqual(bitacora.reproducir(recuperada), 1)
+        bitacora.cerrar()
+        self.assertEqual(recuperada.matriculas[0].nota, 3.7)
+    
+    def test_bajas_en_cascada_se_recuperan(self):
+        """Prueba que una eliminación en cascada queda en una línea y se reaplica con sus filas"""
+        consultas = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        consultas.bitacora = bitacora
+        consultas.eliminar_estudiantes_en_cascada(list(consultas.estudiantes))
+        bitacora.cerrar()
+        
+        recuperada = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        self.assertEqual(bitacora.reproducir(recuperada), 1)
+        self.assertEqual(bitacora.reproducir(recuperada), 0)
+        bitacora.cerrar()
+        self.assertEqual((recuperada.estudiantes, recuperada.inscripciones, recuperada.matriculas), ([], [], []))
+    
+    def test_reproducir_es_idempotente_y_compactar(self):
+        """Prueba que reaplicar sobre datos ya guardados no duplica registros"""
+        consultas = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir)
+        consultas.bitacora = bitacora
+        consultas.agregar_curso(Curso("C2", "Física", 4, "Dr. García"))
+        
+        consultas.bitacora = None
+        self.assertEqual(bitacora.reproducir(consultas), 0)
+        self.assertEqual(len(consultas.cursos), 2)
+        
+        bitacora.iniciar_compactacion()
+        bitacora.finalizar_compactacion()
+        self.assertEqual(bitacora.operaciones, 0)
+        bitacora.cerrar()
+    
+    def test_operaciones_pendientes_se_sincronizan_al_pedir_opcion(self):
+        """Prueba que al pedir una opción del menú se sincronizan las operaciones del último lote"""
+        from src.main import leer_opcion
+        consultas = self._datos_base()
+        bitacora = BitacoraOperaciones(self.temp_dir, lote_fsync=20, intervalo_fsync=3600)
+        consultas.bitacora = bitacora
+        consultas.agregar_curso(Curso("C2", "Física", 4, "Dr. García"))
+        
+        self.assertEqual(bitacora._pendientes_fsync, 1)
+        
+        import builtins
+        input_original = builtins.input
+        builtins.input = lambda mensaje: " 3 "
+        try:
+            self.assertEqual(leer_opcion(bitacora), "3")
+        finally:
+            builtins.input = input_original
+        self.assertEqual(bitacora._pendientes_fsync, 0)
+        bitacora.cerrar()
+
+class TestTablaMatriculas(unittest.TestCase):
+    """Pruebas para la tabla de matrículas en columnas"""
+    
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.matriculas = [
+            Matricula("M1", "I1", "E1", "C1", "2024-02-01", 4.5),
+            Matricula("M2", "I2", "E2", "C1", "2024-02-01", 2.5),
+            Matricula("M3", "I3", "E1", "C2", "2024-02-01", None),
+            Matricula("M4", "I4", "E2", "C2", "2024-02-01", 1.0)
+        ]
+        self.tabla = TablaMatriculas(self.matriculas)
+    
+    def test_filtrar_y_promediar_notas(self):
+        """Prueba el filtro por nota y los promedios por curso, omitiendo las filas sin nota"""
+        self.assertEqual(self.tabla.filas_con_nota_menor(3.0), [1, 3])
+        self.assertEqual(self.tabla.filas_con_nota_de_curso("C2"), [3])
+        self.assertEqual(self.tabla.promedios_por_curso(), {"C1": 3.5, "C2": 1.0})
+    
+    def test_quitar_y_compactar_conserva_orden(self):
+        """Prueba que quitar filas deja huecos y la compactación conserva el orden"""
+        self.tabla.quitar(self.matriculas[1])
+        self.assertEqual(self.tabla.filas_con_nota_menor(3.0), [3])
+        
+        self.tabla.quitar(self.matriculas[0])
+        self.tabla.quitar(self.matriculas[2])  # Tres huecos de cuatro: se compacta
+        self.assertEqual(len(self.tabla), 1)
+        self.assertIs(self.tabla.matricula(0), self.matriculas[3])
+
+class TestGeneradorIds(unittest.TestCase):
+    """Pruebas para los contadores de IDs"""
+    
+    def test_siguiente_y_reservar(self):
+        """Prueba que los IDs siguen a la marca y que las reservas son consecutivas"""
+        ids = GeneradorIds()
+        ids.observar_todos('estudiante', ["E1", "E7", "X99", "E3"])
+        self.assertFalse(ids.modificado)
+        
+        self.assertEqual(ids.siguiente('estudiante'), "E8")
+        self.assertEqual(ids.reservar('estudiante', 3), ["E9", "E10", "E11"])
+        self.assertEqual(ids.siguiente('curso'), "C1")
+        self.assertTrue(ids.modificado)
+        with self.assertRaises(ValueError):
+            ids.siguiente('profesor')
+    
+    def test_marcas_no_bajan(self):
+        """Prueba que sembrar u observar IDs menores no reutiliza números"""
+        ids = GeneradorIds({'matricula': 10})
+        ids.sembrar({'matricula': 4})
+        ids.observar('matricula', "M2")
+        self.assertEqual(ids.siguiente('matricula'), "M11")
+    
+    def test_contadores_persisten_en_csv(self):
+        """Prueba guardar y cargar las marcas junto a los CSV"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            persistencia = PersistenciaCSV(temp_dir)
+            self.assertEqual(persistencia.cargar_contadores(), {})
+            persistencia.guardar_contadores({'estudiante': 5, 'curso': 2})
+            self.assertEqual(persistencia.cargar_contadores(), {'estudiante': 5, 'curso': 2})
+        finally:
+            shutil.rmtree(temp_dir)
+
+class TestImportacion(unittest.TestCase):
+    """Pruebas para la importación masiva de estudiantes"""
+    
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.estudiantes = [Estudiante("E1", "12345678", "Juan", "Pérez", "juan@test.com", "1995-01-01")]
+        self.consultas = ConsultasAcademicas(self.estudiantes, [], [], [])
+    
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_importar_acepta_validos_y_reporta_errores(self):
+        """Prueba que se rechazan filas inválidas y duplicadas (en el sistema o en el archivo)"""
+        archivo = os.path.join(self.temp_dir, "admisiones.csv")
+        with open(archivo, 'w', encoding='utf-8') as f:
+            f.write("nombres,apellidos,documento,correo,fecha_nacimiento\n")
+            f.write("Ana,López,11111111,ana@test.com,2000-03-03\n")
+            f.write("Otro,Juan,12345678,otro@test.com,2000-03-03\n")   # documento existente
+            f.write("Luis,Díaz,22222222,ANA@test.com,2000-03-03\n")    # correo repetido en el archivo
+            f.write("Sin,Fecha,33333333,sin@test.com,03/03/2000\n")
+            f.write("\n")
+            f.write(" Eva , Ruiz ,44444444,eva@test.com,2001-01-01\n")
+        
+        resultado = importar_estudiantes_csv(self.consultas, archivo)
+        
+        self.assertEqual([(e.id, e.nombres) for e in resultado.aceptados], [("E2", "Ana"), ("E3", "Eva")])
+        self.assertEqual([numero for numero, _, _ in resultado.errores], [3, 4, 5])
+        self.assertIn("documento 12345678", resultado.errores[0][2][0])
+        self.assertIs(self.consultas.buscar_estudiante_por_documento("44444444"), resultado.aceptados[1])
+        self.assertEqual(len(self.estudiantes), 3)
+        self.assertEqual([e.id for e in self.consultas.listar_estudiantes_ordenados_por_apellido()], ["E2", "E1", "E3"])
+        
+        with open(resultado.archivo_errores, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 4)
+        with open(resultado.archivo_aceptados, encoding='utf-8') as f:
+            self.assertTrue(f.readlines()[1].startswith("E2,11111111,Ana"))
+
+    def test_cargar_notas_por_id_y_por_documento(self):
+        """Prueba la carga de notas con claves mixtas, errores y repetidos"""
+        self.consultas.agregar_curso(Curso("C1", "Matemáticas", 3, "Dr. López"))
+        self.consultas.agregar_inscripcion(Inscripcion("I1", "E1", "C1", "2024-02-01"))
+        self.consultas.agregar_matricula(Matricula("M1", "I1", "E1", "C1", "2024-02-01"))
+        self.consultas.agregar_matricula(Matricula("M2", "I1", "E1", "C1", "2024-02-01", 1.0))
+        self.assertEqual(self.consultas.obtener_top_promedios_por_curso("C1")[0][1], 1.0)
+        
+        archivo = os.path.join(self.temp_dir, "planilla.csv")
+        with open(archivo, 'w', encoding='utf-8') as f:
+            f.write("matricula_id,documento,curso_codigo,nota\n")
+            f.write("M2,,,4.5\n")
+            f.write(",12345678,C1,3.9\n")      # resuelve a M1
+            f.write("M1,,,2.0\n")              # M1 repetida
+            f.write("M7,,,3.0\n")              # no existe
+            f.write(",12345678,C2,3.0\n")      # no matriculado en C2
+            f.write("M2,,,5.5\n")              # fuera de rango
+        
+        resultado = cargar_notas_csv(self.consultas, archivo)
+        
+        self.assertEqual([(m.id, nota) for m, nota in resultado.asignadas], [("M2", 4.5), ("M1", 3.9)])
+        self.assertEqual([numero for numero, _, _ in resultado.errores], [4, 5, 6, 7])
+        self.assertIn("fila 3", resultado.errores[0][2][0])
+        self.assertEqual([nota for _, nota in self.consultas.obtener_top_promedios_por_curso("C1")], [4.5, 3.9])
+        self.assertEqual([m.id for m in self.consultas.cambios.notas_pendientes('matriculas')], ["M2", "M1"])
+        self.assertFalse(self.consultas.cambios.requiere_reescritura('matriculas'))
+
 class TestConsultas(unittest.TestCase):
     """Pruebas para las consultas académicas"""
     
@@ -235,6 +860,24 @@ class TestConsultas(unittest.TestCase):
         self.assertEqual(top[1][1], 3.8)  # María
         self.assertEqual(top[2][1], 2.1)  # Ana - nota más baja
     
+    def test_top_k_por_todos_los_cursos(self):
+        """Prueba que el top de todos los cursos coincide con el top de cada curso"""
+        mejores = self.consultas.top_k_por_todos_los_cursos(2)
+        
+        self.assertEqual(list(mejores), ["C1"])
+        self.assertEqual(mejores["C1"], self.consultas.obtener_top_promedios_por_curso("C1", 2))
+        self.assertEqual([nota for _, nota in mejores["C1"]], [4.5, 3.8])
+    
+    def test_top_promedios_se_actualiza_al_asignar_nota(self):
+        """Prueba que la clasificación por curso sigue los cambios de nota y las altas"""
+        self.consultas.obtener_top_promedios_por_curso("C1")  # Arma la clasificación
+        self.consultas.asignar_nota(self.matriculas[2], 5.0)
+        self.consultas.asignar_nota(self.matriculas[0], None)
+        self.consultas.agregar_matricula(Matricula("M5", "I5", "E2", "C1", "2024-02-01", 5.0))
+        
+        top = self.consultas.obtener_top_promedios_por_curso("C1")
+        self.assertEqual([(e.id, nota) for e, nota in top], [("E3", 5.0), ("E2", 5.0), ("E2", 3.8)])
+    
     def test_obtener_reprobados(self):
         """Prueba obtención de reprobados"""
         reprobados = self.consultas.obtener_reprobados(3.0)
@@ -242,6 +885,30 @@ class TestConsultas(unittest.TestCase):
         self.assertEqual(len(reprobados), 1)
         self.assertEqual(reprobados[0][2], 2.1)  # Ana con nota 2.1
     
+    def test_iterar_reprobados_desde_iterador(self):
+        """Prueba el reporte de reprobados consumiendo un iterador de matrículas"""
+        reprobados = self.consultas.iterar_reprobados(iter(self.matriculas), 4.0)
+        self.assertEqual([nota for _, _, nota in reprobados], [3.8, 2.1])
+    
+    def test_obtener_estadisticas_por_curso(self):
+        """Prueba las estadísticas de notas de todos los cursos en un solo reporte"""
+        estadisticas = self.consultas.obtener_estadisticas_por_curso()
+        
+        self.assertEqual([curso.codigo for curso, _ in estadisticas], ["C1"])  # C2 no tiene notas
+        datos = estadisticas[0][1]
+        self.assertEqual(datos['cantidad'], 3)
+        self.assertAlmostEqual(datos['promedio'], 3.4667, places=4)
+        self.assertEqual(datos['mediana'], 3.8)
+        self.assertAlmostEqual(datos['tasa_aprobacion'], 2 / 3)
+        self.assertAlmostEqual(datos['percentiles'][25], 2.95)
+    
+    def test_reprobados_siguen_asignar_nota(self):
+        """Prueba que los reprobados reflejan las notas asignadas después de cargar"""
+        self.consultas.asignar_nota(self.matriculas[0], 1.5)
+        self.consultas.asignar_nota(self.matriculas[2], 3.5)
+        reprobados = self.consultas.obtener_reprobados(3.0)
+        self.assertEqual([(e.id, nota) for e, _, nota in reprobados], [("E1", 1.5)])
+    
     def test_obtener_creditos_inscritos_por_estudiante(self):
         """Prueba cálculo de créditos inscritos"""
         creditos = self.consultas.obtener_creditos_inscritos_por_estudiante("E1")
@@ -266,6 +933,113 @@ class TestConsultas(unittest.TestCase):
         estudiante_inexistente = self.consultas.buscar_binario_estudiante("Inexistente")
         self.assertIsNone(estudiante_inexistente)
     
+    def test_indice_por_apellido_duplicados_prefijo_y_rango(self):
+        """Prueba el índice por apellido con duplicados, prefijos, rangos y ediciones"""
+        self.consultas.agregar_estudiante(Estudiante("E4", "22222222", "Luis", "lópez", "luis@test.com", "1998-04-04"))
+        
+        self.assertEqual([e.id for e in self.consultas.buscar_estudiantes_por_apellido("LÓPEZ")], ["E3", "E4"])
+        self.assertEqual([e.id for e in self.consultas.buscar_estudiantes_por_prefijo_apellido("l")], ["E3", "E4"])
+        self.assertEqual([e.id for e in self.consultas.buscar_estudiantes_por_rango_apellido("g", "p")], ["E2", "E3", "E4"])
+        
+        self.consultas.actualizar_estudiante(self.estudiantes[0], apellidos="Acosta")
+        self.consultas.eliminar_estudiante(self.estudiantes[2])
+        self.assertEqual([e.id for e in self.consultas.listar_estudiantes_ordenados_por_apellido()], ["E1", "E2", "E4"])
+    
+    def test_buscar_estudiantes_por_prefijo_y_subcadena(self):
+        """Prueba la búsqueda por nombre, documento y correo con sus actualizaciones"""
+        self.assertEqual([e.id for e in self.consultas.buscar_estudiantes("ana")], ["E3"])
+        self.assertEqual([e.id for e in self.consultas.buscar_estudiantes("1234")], ["E1"])
+        
+        nuevo = Estudiante("E4", "22222222", "Luis", "Núñez", "luis@test.com", "1998-04-04")
+        self.consultas.agregar_estudiante(nuevo)
+        self.assertEqual([e.id for e in self.consultas.buscar_estudiantes("nunez")], ["E4"])
+        self.assertEqual([e.id for e in self.consultas.buscar_estudiantes("ÑEZ luis")], ["E4"])
+        
+        self.consultas.actualizar_estudiante(nuevo, apellidos="Díaz")
+        self.assertEqual(self.consultas.buscar_estudiantes("nunez"), [])
+        self.assertEqual([e.id for e in self.consultas.buscar_estudiantes("dia")], ["E4"])
+        
+        self.consultas.eliminar_estudiante(nuevo)
+        self.assertEqual(self.consultas.buscar_estudiantes("luis"), [])
+    
+    def test_ids_no_reutilizan_eliminados(self):
+        """Prueba que el contador de IDs sigue a las altas y no baja con las eliminaciones"""
+        self.assertEqual(self.consultas.ids.siguiente('inscripcion'), "I5")
+        self.consultas.agregar_matricula(Matricula("M9", "I1", "E1", "C1", "2024-02-01"))
+        self.consultas.eliminar_matricula(self.matriculas[-1])
+        self.assertEqual(self.consultas.ids.siguiente('matricula'), "M10")
+    
+    def test_inscribir_en_lote(self):
+        """Prueba las reglas de duplicado y límite de créditos dentro y fuera del lote"""
+        self.consultas.agregar_curso(Curso("C3", "Química", 10, "Dr. Ruiz"))
+        solicitudes = [
+            ("E2", "C2"),   # aceptada: 3 + 4 créditos
+            ("E2", "C2"),   # repetida en el lote
+            ("E1", "C1"),   # ya inscrito
+            ("E2", "C3"),   # aceptada: 7 + 10 = 17
+            ("E3", "C9"),   # curso inexistente
+            ("E9", "C1"),   # estudiante inexistente
+            ("E2", "C3"),   # repetida
+            ("E3", "C2"),   # aceptada
+        ]
+        resultado = inscribir_en_lote(self.consultas, solicitudes, limite_creditos=18, fecha="2024-03-01")
+        
+        self.assertEqual([(i.id, i.estudiante_id, i.curso_codigo) for i in resultado.aceptadas],
+                         [("I5", "E2", "C2"), ("I6", "E2", "C3"), ("I7", "E3", "C2")])
+        self.assertEqual(len(resultado.rechazos), 5)
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("E2"), 17)
+        self.assertEqual(len(self.inscripciones), 7)
+        
+        resultado = inscribir_en_lote(self.consultas, [("E1", "C3")], limite_creditos=15)
+        self.assertIn("Excede el límite", resultado.rechazos[0][2])
+    
+    def test_matricular_pendientes_con_filtros(self):
+        """Prueba la conversión masiva de inscripciones pendientes por curso y fecha"""
+        self.consultas.agregar_inscripcion(Inscripcion("I5", "E2", "C2", "2024-03-15"))
+        self.consultas.agregar_inscripcion(Inscripcion("I6", "E3", "C2", "2024-01-10"))
+        self.consultas.agregar_inscripcion(Inscripcion("I7", "E9", "C2", "2024-03-15"))  # estudiante inexistente
+        
+        self.assertEqual(matricular_pendientes(self.consultas, "C1"), [])
+        creadas = matricular_pendientes(self.consultas, "C2", desde="2024-02-01")
+        self.assertEqual([(m.id, m.inscripcion_id) for m in creadas], [("M5", "I5")])
+        
+        creadas = matricular_pendientes(self.consultas)
+        self.assertEqual([(m.id, m.inscripcion_id) for m in creadas], [("M6", "I6")])
+        self.assertTrue(self.consultas.tiene_matricula("I6"))
+        self.assertEqual(len(self.matriculas), 6)
+
+    def test_filtro_de_fechas_sin_ceros_a_la_izquierda(self):
+        """Prueba que el filtro por fecha compara fechas y no texto"""
+        self.consultas.agregar_inscripcion(Inscripcion("I5", "E2", "C2", "2025-9-2"))
+        self.consultas.agregar_inscripcion(Inscripcion("I6", "E3", "C2", "2025-10-01"))
+
+        pendientes = self.consultas.obtener_inscripciones_sin_matricular(desde="2025-09-01", hasta="2025-9-30")
+        self.assertEqual([i.id for i, _, _ in pendientes], ["I5"])
+        pendientes = self.consultas.obtener_inscripciones_sin_matricular(desde="2025-9-15")
+        self.assertEqual([i.id for i, _, _ in pendientes], ["I6"])
+        with self.assertRaises(ValueError):
+            self.consultas.obtener_inscripciones_sin_matricular(hasta="2025-13-01")
+
+    def test_eliminar_estudiantes_en_cascada(self):
+        """Prueba que la eliminación en cascada borra en su lugar y mantiene los índices"""
+        listas = (self.estudiantes, self.inscripciones, self.matriculas)
+        inscripciones, matriculas = self.consultas.eliminar_estudiantes_en_cascada(
+            [self.estudiantes[0], self.estudiantes[2]])
+        
+        self.assertEqual(sorted(i.id for i in inscripciones), ["I1", "I3", "I4"])
+        self.assertEqual(sorted(m.id for m in matriculas), ["M1", "M3", "M4"])
+        self.assertEqual((self.consultas.estudiantes, self.consultas.inscripciones, self.consultas.matriculas), listas)
+        self.assertEqual([e.id for e in self.estudiantes], ["E2"])
+        self.assertEqual([i.id for i in self.inscripciones], ["I2"])
+        self.assertEqual([m.id for m in self.matriculas], ["M2"])
+        
+        self.assertIsNone(self.consultas.buscar_matricula_por_id("M1"))
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("E1"), 0)
+        self.assertEqual([e.id for e, _ in self.consultas.obtener_top_promedios_por_curso("C1")], ["E2"])
+        self.assertEqual(self.consultas.obtener_inscripciones_sin_matricular(), [])
+        self.assertEqual(self.consultas.listar_estudiantes_ordenados_por_apellido(), [self.estudiantes[0]])
+        self.assertTrue(self.consultas.cambios.esta_modificada('matriculas'))
+    
     def test_puede_inscribirse_curso(self):
         """Prueba verificación de inscripción a curso"""
         # Estudiante E1 ya está inscrito en C1 y C2
@@ -277,6 +1051,90 @@ class TestConsultas(unittest.TestCase):
         puede, mensaje = self.consultas.puede_inscribirse_curso("E2", "C2", 20)
         self.assertTrue(puede)
         self.assertEqual(mensaje, "Puede inscribirse")
+    
+    def test_indices_se_mantienen_al_modificar(self):
+        """Prueba que los índices reflejan altas, ediciones y bajas"""
+        nuevo = Estudiante("E4", "22222222", "Luis", "Díaz", "luis@test.com", "1998-04-04")
+        self.consultas.agregar_estudiante(nuevo)
+        self.assertIs(self.consultas.buscar_estudiante_por_id("E4"), nuevo)
+        
+        self.consultas.actualizar_estudiante(nuevo, documento="33333333", correo="Luis.Diaz@test.com")
+        self.assertIsNone(self.consultas.buscar_estudiante_por_documento("22222222"))
+        self.assertIsNone(self.consultas.buscar_estudiante_por_correo("luis@test.com"))
+        self.assertIs(self.consultas.buscar_estudiante_por_documento("33333333"), nuevo)
+        self.assertIs(self.consultas.buscar_estudiante_por_correo("luis.diaz@test.com"), nuevo)
+        
+        self.consultas.eliminar_estudiante(nuevo)
+        self.assertIsNone(self.consultas.buscar_estudiante_por_id("E4"))
+        self.assertNotIn(nuevo, self.estudiantes)
+    
+    def test_indices_agrupados_por_estudiante_y_curso(self):
+        """Prueba los índices secundarios de inscripciones y matrículas"""
+        inscripciones_e1 = self.consultas.obtener_inscripciones_de_estudiante("E1")
+        self.assertEqual({i.id for i in inscripciones_e1}, {"I1", "I4"})
+        self.assertTrue(self.consultas.tiene_matricula("I4"))
+        
+        matricula = self.matriculas[3]
+        self.consultas.eliminar_matricula(matricula)
+        self.assertFalse(self.consultas.tiene_matricula("I4"))
+        self.assertEqual(len(self.consultas.obtener_matriculas_de_estudiante("E1")), 1)
+        
+        inscripcion = self.inscripciones[3]
+        self.consultas.eliminar_inscripcion(inscripcion)
+        self.assertFalse(self.consultas.tiene_estudiantes_inscritos("C2"))
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("E1"), 3)
+    
+    def test_actualizar_inscripcion_reindexa(self):
+        """Prueba que cambiar el estudiante de una inscripción mueve sus créditos"""
+        inscripcion = self.inscripciones[3]
+        self.consultas.actualizar_inscripcion(inscripcion, estudiante_id="E2")
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("E1"), 3)
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("E2"), 7)
+    
+    def test_creditos_cacheados_siguen_cambios_de_curso(self):
+        """Prueba que editar los créditos de un curso actualiza a sus inscritos"""
+        self.consultas.actualizar_curso(self.cursos[0], creditos=5)
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("E1"), 9)
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("E3"), 5)
+        self.assertEqual(self.consultas.verificar_creditos(), {})
+    
+    def test_verificar_creditos_reporta_diferencias(self):
+        """Prueba que la verificación detecta y corrige créditos desactualizados"""
+        self.cursos[1].creditos = 6  # Cambio directo, sin pasar por ConsultasAcademicas
+        diferencias = self.consultas.verificar_creditos(corregir=True)
+        self.assertEqual(diferencias, {"E1": (7, 9)})
+        self.assertEqual(self.consultas.obtener_creditos_inscritos_por_estudiante("E1"), 9)
+        self.assertEqual(self.consultas.verificar_creditos(), {})
+    
+    def test_consultas_sobre_un_repositorio_existente(self):
+        """Prueba que las consultas leen el repositorio que reciben y le delegan las operaciones"""
+        repositorio = RepositorioAcademico(self.estudiantes, self.cursos, self.inscripciones, self.matriculas)
+        consultas = ConsultasAcademicas(repositorio=repositorio)
+        self.assertNotIsInstance(consultas, RepositorioAcademico)
+
+        consultas.agregar_curso(Curso("C3", "Química", 2, "Dr. Ruiz"))
+        consultas.bitacora = "bitácora"
+        self.assertIs(repositorio.buscar_curso_por_codigo("C3"), self.cursos[-1])
+        self.assertEqual(repositorio.bitacora, "bitácora")
+        self.assertTrue(repositorio.cambios.esta_modificada('cursos'))
+        self.assertFalse(consultas.tiene_estudiantes_inscritos("C3"))
+
+    def test_indices_detectan_cambios_directos_en_listas(self):
+        """Prueba que los índices se reconstruyen si la lista se modificó directamente"""
+        self.cursos.append(Curso("C3", "Química", 2, "Dr. Ruiz"))
+        self.assertIsNotNone(self.consultas.buscar_curso_por_codigo("C3"))
+    
+    def test_id_repetido_no_reconstruye_indices_en_cada_consulta(self):
+        """Prueba que un código repetido en los datos no se toma como un cambio por fuera"""
+        self.cursos.append(Curso("C1", "Matemáticas (repetido)", 2, "Dr. Ruiz"))
+        consultas = ConsultasAcademicas(self.estudiantes, self.cursos, self.inscripciones, self.matriculas)
+        reconstrucciones = []
+        consultas.repositorio.reconstruir_indices = lambda: reconstrucciones.append(True)
+        
+        self.assertEqual(consultas.buscar_curso_por_codigo("C1").nombre, "Matemáticas")
+        self.assertEqual(consultas.buscar_curso_por_codigo("C2").creditos, 4)
+        self.assertEqual(reconstrucciones, [])
+        self.assertFalse(consultas.cambios.hay_cambios())
 
 if __name__ == '__main__':
     print("Ejecutando pruebas básicas de MiniSIGA...")